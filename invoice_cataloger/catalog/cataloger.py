@@ -5,6 +5,7 @@ This module handles invoice cataloging WITHOUT tax calculations.
 Follows Single Responsibility Principle (SRP).
 """
 from pathlib import Path
+from functools import cached_property
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from tqdm import tqdm
@@ -16,7 +17,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from config import Config
 from utils import get_logger, CacheManager, FailedFilesManager
 from extractors import PDFExtractor, ImageExtractor, DocumentExtractor, EmailExtractor
-from processors import LLMProcessor, ExpenseCategorizer
+from processors import create_llm_client, ExpenseCategorizer
 
 
 class InvoiceCataloger:
@@ -45,38 +46,19 @@ class InvoiceCataloger:
         self.config = config
         self.logger = get_logger()
         
-        # Initialize extractors
-        self.pdf_extractor = PDFExtractor(
-            tesseract_path=config.tesseract_path,
-            ocr_languages=config.ocr_languages
-        )
-        self.image_extractor = ImageExtractor(
-            tesseract_path=config.tesseract_path,
-            ocr_languages=config.ocr_languages
-        )
-        self.document_extractor = DocumentExtractor()
-        self.email_extractor = EmailExtractor()
+        # Per-file progress/debug logging is only worth its I/O in verbose runs
+        self._verbose = config.log_level.upper() == 'DEBUG'
+        
+        # Config values read for every file, bound once
+        self._move_files = config.move_processed_files
+        self._output_folder = config.output_folder
+        self._max_retries = config.max_retry_attempts
+        
+        # Extractors are created lazily (see properties below) so a run only
+        # pays for the file types it actually encounters
         
         # Initialize LLM processor
-        self.llm_processor = LLMProcessor(
-            api_provider=config.api_provider,
-            endpoint=config.lm_studio_endpoint,
-            model=config.lm_studio_model,
-            openai_api_key=config.openai_api_key,
-            openai_model=config.openai_model,
-            openai_api_base=config.openai_api_base,
-            openrouter_api_key=config.openrouter_api_key,
-            openrouter_model=config.openrouter_model,
-            openrouter_api_base=config.openrouter_api_base,
-            openrouter_app_name=config.openrouter_app_name,
-            use_custom_prompt=config.use_custom_prompt,
-            custom_extraction_prompt=config.custom_extraction_prompt,
-            temperature=config.temperature,
-            max_tokens=config.max_tokens,
-            timeout=config.timeout_seconds,
-            retry_attempts=config.retry_attempts,
-            retry_delay=config.retry_delay_seconds
-        )
+        self.llm_processor = create_llm_client(config)
         
         # Initialize categorizer
         vendor_overrides_data = config.load_vendor_overrides()
@@ -88,6 +70,44 @@ class InvoiceCataloger:
         self.cache_manager = CacheManager(config.cache_path)
         self.failed_files_manager = FailedFilesManager(config.failed_files_path)
     
+    @cached_property
+    def pdf_extractor(self) -> PDFExtractor:
+        """PDF extractor, created on first use"""
+        return PDFExtractor(
+            tesseract_path=self.config.ocr.tesseract_path,
+            ocr_languages=self.config.ocr.languages,
+            ocr_device=self.config.ocr.device,
+            ocr_dpi=self.config.ocr.dpi
+        )
+    
+    @cached_property
+    def image_extractor(self) -> ImageExtractor:
+        """Image (OCR) extractor, created on first use"""
+        return ImageExtractor(
+            tesseract_path=self.config.ocr.tesseract_path,
+            ocr_languages=self.config.ocr.languages,
+            ocr_device=self.config.ocr.device
+        )
+    
+    @cached_property
+    def document_extractor(self) -> DocumentExtractor:
+        """Word/Excel extractor, created on first use"""
+        return DocumentExtractor()
+    
+    @cached_property
+    def email_extractor(self) -> EmailExtractor:
+        """Email extractor, created on first use"""
+        return EmailExtractor()
+    
+    def _scan_folder(self, folder: Path) -> List[Path]:
+        """Walk a folder once, keeping files with a supported extension"""
+        extensions = self.config.file_extensions
+        return sorted(
+            path for path in folder.rglob('*')
+            if path.suffix.lower() in extensions and path.is_file()
+            and not path.name.startswith(ImageExtractor.LEGACY_TEMP_PREFIX)
+        )
+    
     def get_invoice_files(self, retry_failed: bool = False) -> List[Path]:
         """
         Get list of invoice files to process
@@ -100,9 +120,7 @@ class InvoiceCataloger:
         """
         self.logger.info(f"Scanning for invoice files in: {self.config.invoice_folder}")
         
-        files = []
-        for ext in self.config.file_extensions:
-            files.extend(self.config.invoice_folder.rglob(f"*{ext}"))
+        files = self._scan_folder(self.config.invoice_folder)
         
         # Filter by retry mode
         if retry_failed:
@@ -110,7 +128,7 @@ class InvoiceCataloger:
             retry_candidates = self.failed_files_manager.get_retry_candidates(
                 self.config.max_retry_attempts
             )
-            retry_paths = [Path(entry['FilePath']) for entry in retry_candidates]
+            retry_paths = {Path(entry['FilePath']) for entry in retry_candidates}
             files = [f for f in files if f in retry_paths]
             self.logger.info(f"Found {len(files)} failed files to retry")
         
@@ -202,7 +220,7 @@ class InvoiceCataloger:
         Returns:
             New file path after moving
         """
-        if not self.config.move_processed_files:
+        if not self._move_files:
             return file_path
         
         try:
@@ -212,7 +230,7 @@ class InvoiceCataloger:
                 year_month = invoice_date[:7]  # YYYY-MM
             
             # Create destination folder
-            dest_folder = self.config.output_folder / category / year_month
+            dest_folder = self._output_folder / category / year_month
             dest_folder.mkdir(parents=True, exist_ok=True)
             
             # Move file
@@ -242,7 +260,7 @@ class InvoiceCataloger:
             New file path after moving
         """
         try:
-            non_invoice_folder = self.config.output_folder / "Non-Invoice"
+            non_invoice_folder = self._output_folder / "Non-Invoice"
             non_invoice_folder.mkdir(parents=True, exist_ok=True)
             
             dest_path = non_invoice_folder / file_path.name
@@ -275,7 +293,8 @@ class InvoiceCataloger:
         Returns:
             Dictionary with catalog entry (NO tax calculations)
         """
-        self.logger.progress(file_index, total_files, f"Processing: {file_path.name}")
+        if self._verbose:
+            self.logger.progress(file_index, total_files, f"Processing: {file_path.name}")
         
         # Calculate file hash
         file_hash = CacheManager.calculate_file_hash(file_path)
@@ -286,8 +305,9 @@ class InvoiceCataloger:
         # Check cache (skip if reprocess mode)
         cached_entry = None if reprocess else self.cache_manager.find_by_hash(file_hash)
         if cached_entry:
-            self.logger.warning("DUPLICATE FOUND: File already processed (cached)")
-            self.logger.info(f"Original: {cached_entry['FileName']} | Processed: {cached_entry['ProcessedDate']}")
+            self.logger.warning(f"DUPLICATE FOUND: {file_path.name} already processed (cached)")
+            if self._verbose:
+                self.logger.info(f"Original: {cached_entry['FileName']} | Processed: {cached_entry['ProcessedDate']}")
             
             return {
                 'FileName': file_path.name,
@@ -313,8 +333,9 @@ class InvoiceCataloger:
             }
         
         # Check if file has failed too many times
-        failed_entry = self.failed_files_manager.find_by_path(str(file_path))
-        if failed_entry and failed_entry['AttemptCount'] >= self.config.max_retry_attempts:
+        failed_entry = (None if self.failed_files_manager.is_empty
+                        else self.failed_files_manager.find_by_path(str(file_path)))
+        if failed_entry and failed_entry['AttemptCount'] >= self._max_retries:
             self.logger.warning(f"SKIPPED: File has failed {failed_entry['AttemptCount']} times")
             
             return self._create_failed_entry(file_path, file_hash, 
@@ -339,7 +360,8 @@ class InvoiceCataloger:
                                                 "No text content extracted",
                                                 "Failed (No text)")
             
-            self.logger.debug(f"Text extracted using {method} ({len(text)} chars)")
+            if self._verbose:
+                self.logger.debug(f"Text extracted using {method} ({len(text)} chars)")
             
             # Check if file is a non-invoice
             is_non_invoice, non_invoice_reason = self.is_non_invoice(text)
@@ -418,7 +440,8 @@ class InvoiceCataloger:
                 self.failed_files_manager.remove_failure(str(file_path))
                 self.logger.info("Removed from failed files list (successful retry)")
             
-            self.logger.success(f"Cataloged: {extracted_data.get('vendor_name', 'Unknown')} - {category} - ${extracted_data.get('total', 0)}")
+            if self._verbose:
+                self.logger.success(f"Cataloged: {extracted_data.get('vendor_name', 'Unknown')} - {category} - ${extracted_data.get('total', 0)}")
             
             # Return catalog entry WITHOUT tax calculations
             return {
@@ -528,7 +551,8 @@ class InvoiceCataloger:
         if reprocess:
             self.logger.info("REPROCESS MODE: Ignoring cache for all files")
         
-        for i, file_path in enumerate(files, 1):
+        # Single progress bar; per-file log lines are reserved for verbose runs
+        for i, file_path in enumerate(tqdm(files, desc="Cataloging", unit="file"), 1):
             result = self.process_file(file_path, i, len(files), reprocess=reprocess)
             
             if result:
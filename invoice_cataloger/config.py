@@ -1,74 +1,155 @@
 """
 Configuration Management for Invoice Cataloger
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from enum import Enum
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, FrozenSet, Optional, Set, Tuple
 import json
 import os
+import re
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
+# Load environment variables from .env file. The flag is inherited by child
+# processes and survives re-importing this module under another name
+# (config vs invoice_cataloger.config), so .env is parsed once.
+_DOTENV_FLAG = "_INVOICE_CFG_ENV_LOADED"
+if not os.environ.get(_DOTENV_FLAG):
+    load_dotenv()
+    os.environ[_DOTENV_FLAG] = "1"
 
-@dataclass
+# Financial year in YYYY-YYYY form
+_FY_RE = re.compile(r'([0-9]{4})-([0-9]{4})')
+
+# Directory holding this module (and vendor_overrides.json)
+_MODULE_DIR: Path = Path(__file__).parent
+_VENDOR_OVERRIDES_PATH: Path = _MODULE_DIR / "vendor_overrides.json"
+
+# Snapshot the environment once; field defaults below are resolved at import
+_ENV = os.environ.copy()
+
+# Parsed vendor overrides keyed by file path -> (st_mtime_ns, result)
+_vendor_overrides_cache: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
+# Log folders already created in this process by ensure_directories
+_ensured_directories: Set[Path] = set()
+
+
+def _read_json(filepath: Path) -> Any:
+    """Parse a JSON file, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+
+def _write_json(filepath: Path, data: Any) -> None:
+    """Write data as indented JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(filepath, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+class Provider(str, Enum):
+    """Supported LLM API providers"""
+    LMSTUDIO = "lmstudio"
+    OPENAI = "openai"
+    OPENROUTER = "openrouter"
+
+
+def _parse_provider(value: Any) -> Optional[Provider]:
+    """Normalise an api_provider string; None if it is not a known provider"""
+    try:
+        return Provider(str(value).lower())
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class OCRConfig:
+    """OCR engine settings, grouped so extractors receive a single object"""
+    use_easyocr: bool = True
+    use_tesseract: bool = True
+    tesseract_path: str = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+    languages: Tuple[str, ...] = ('en',)
+    device: str = _ENV.get("OCR_DEVICE", "auto")  # EasyOCR: "auto", "cpu", "cuda" or "mps"
+    dpi: int = int(_ENV.get("OCR_DPI", "200"))  # Resolution scanned PDF pages are rendered at
+    
+    def __post_init__(self) -> None:
+        # Normalise once here rather than in every extractor
+        object.__setattr__(self, 'tesseract_path', os.path.normpath(self.tesseract_path))
+        object.__setattr__(self, 'languages', tuple(self.languages))
+        object.__setattr__(self, 'device', str(self.device).lower())
+        object.__setattr__(self, 'dpi', int(self.dpi))
+
+
+@dataclass(frozen=True, slots=True, repr=False, eq=False)
 class Config:
     """Main configuration class for Invoice Cataloger"""
     
     # API Provider Configuration
-    api_provider: str = field(default_factory=lambda: os.getenv("API_PROVIDER", "lmstudio"))
+    api_provider: str = _ENV.get("API_PROVIDER", "lmstudio")
     
     # LM Studio Configuration
-    lm_studio_endpoint: str = field(default_factory=lambda: os.getenv("LM_STUDIO_ENDPOINT", "http://192.168.0.100:1234/v1/chat/completions"))
-    lm_studio_models_endpoint: str = field(default_factory=lambda: os.getenv("LM_STUDIO_MODELS_ENDPOINT", "http://192.168.0.100:1234/v1/models"))
-    lm_studio_model: str = field(default_factory=lambda: os.getenv("LM_STUDIO_MODEL", "local-model"))
+    lm_studio_endpoint: str = _ENV.get("LM_STUDIO_ENDPOINT", "http://192.168.0.100:1234/v1/chat/completions")
+    lm_studio_models_endpoint: str = _ENV.get("LM_STUDIO_MODELS_ENDPOINT", "http://192.168.0.100:1234/v1/models")
+    lm_studio_model: str = _ENV.get("LM_STUDIO_MODEL", "local-model")
     
     # OpenAI Configuration
-    openai_api_key: Optional[str] = field(default_factory=lambda: os.getenv("OPENAI_API_KEY"))
-    openai_model: str = field(default_factory=lambda: os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"))
-    openai_api_base: str = field(default_factory=lambda: os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1"))
+    openai_api_key: Optional[str] = _ENV.get("OPENAI_API_KEY")
+    openai_model: str = _ENV.get("OPENAI_MODEL", "gpt-4-turbo-preview")
+    openai_api_base: str = _ENV.get("OPENAI_API_BASE", "https://api.openai.com/v1")
     
     # OpenRouter Configuration
-    openrouter_api_key: Optional[str] = field(default_factory=lambda: os.getenv("OPENROUTER_API_KEY"))
-    openrouter_model: str = field(default_factory=lambda: os.getenv("OPENROUTER_MODEL", "anthropic/claude-3.5-sonnet"))
-    openrouter_api_base: str = field(default_factory=lambda: os.getenv("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1"))
-    openrouter_app_name: str = field(default_factory=lambda: os.getenv("OPENROUTER_APP_NAME", "Invoice-Cataloger"))
+    openrouter_api_key: Optional[str] = _ENV.get("OPENROUTER_API_KEY")
+    openrouter_model: str = _ENV.get("OPENROUTER_MODEL", "anthropic/claude-3.5-sonnet")
+    openrouter_api_base: str = _ENV.get("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1")
+    openrouter_app_name: str = _ENV.get("OPENROUTER_APP_NAME", "Invoice-Cataloger")
     
     # Custom Prompt Configuration
-    use_custom_prompt: bool = field(default_factory=lambda: os.getenv("USE_CUSTOM_PROMPT", "false").lower() == "true")
-    custom_extraction_prompt: Optional[str] = field(default_factory=lambda: os.getenv("CUSTOM_EXTRACTION_PROMPT"))
+    use_custom_prompt: bool = _ENV.get("USE_CUSTOM_PROMPT", "false").lower() == "true"
+    custom_extraction_prompt: Optional[str] = _ENV.get("CUSTOM_EXTRACTION_PROMPT")
     
     # Paths (dynamic based on financial year)
     base_path: Path = Path("G:/My Drive/Tax Invoices")
-    financial_year: str = field(default_factory=lambda: os.getenv("FINANCIAL_YEAR", "2024-2025"))
+    financial_year: str = _ENV.get("FINANCIAL_YEAR", "2024-2025")
     
     # File Types to Process
-    file_extensions: List[str] = field(default_factory=lambda: [
+    file_extensions: FrozenSet[str] = frozenset({
         '.pdf', '.png', '.jpg', '.jpeg', '.gif',
         '.doc', '.docx', '.xls', '.xlsx',
         '.eml', '.msg'
-    ])
+    })
     
     # ATO Configuration - Software Developer, 3 days WFH
-    work_from_home_days: int = field(default_factory=lambda: int(os.getenv("WORK_FROM_HOME_DAYS", "3")))
-    total_work_days: int = field(default_factory=lambda: int(os.getenv("TOTAL_WORK_DAYS", "5")))
-    work_use_percentage: int = field(default_factory=lambda: int(os.getenv("WORK_FROM_HOME_DAYS", "3")) * 100 // int(os.getenv("TOTAL_WORK_DAYS", "5")))
-    fixed_rate_hourly: float = field(default_factory=lambda: float(os.getenv("FIXED_RATE_HOURLY", "0.70")))
-    occupation: str = field(default_factory=lambda: os.getenv("OCCUPATION", "Web / Software Developer"))
+    work_from_home_days: int = int(_ENV.get("WORK_FROM_HOME_DAYS", "3"))
+    total_work_days: int = int(_ENV.get("TOTAL_WORK_DAYS", "5"))
+    work_use_percentage: int = field(init=False)  # Derived in __post_init__
+    fixed_rate_hourly: float = float(_ENV.get("FIXED_RATE_HOURLY", "0.70"))
+    occupation: str = _ENV.get("OCCUPATION", "Web / Software Developer")
     
     # LLM Parameters
-    temperature: float = field(default_factory=lambda: float(os.getenv("LLM_TEMPERATURE", "0.1")))
-    max_tokens: int = field(default_factory=lambda: int(os.getenv("LLM_MAX_TOKENS", "3000")))
-    timeout_seconds: int = field(default_factory=lambda: int(os.getenv("LLM_TIMEOUT_SECONDS", "120")))
-    retry_attempts: int = field(default_factory=lambda: int(os.getenv("LLM_RETRY_ATTEMPTS", "3")))
-    retry_delay_seconds: int = field(default_factory=lambda: int(os.getenv("LLM_RETRY_DELAY_SECONDS", "2")))
+    temperature: float = float(_ENV.get("LLM_TEMPERATURE", "0.1"))
+    max_tokens: int = int(_ENV.get("LLM_MAX_TOKENS", "3000"))
+    timeout_seconds: int = int(_ENV.get("LLM_TIMEOUT_SECONDS", "120"))
+    retry_attempts: int = int(_ENV.get("LLM_RETRY_ATTEMPTS", "3"))
+    retry_delay_seconds: int = int(_ENV.get("LLM_RETRY_DELAY_SECONDS", "2"))
+    max_concurrent_requests: int = int(_ENV.get("LLM_MAX_CONCURRENT_REQUESTS", "8"))
+    # Providers tried in order when api_provider gives no usable result
+    fallback_providers: Tuple[str, ...] = tuple(_ENV.get("LLM_FALLBACK_PROVIDERS", "").split(","))
     
     # OCR Configuration
-    use_easyocr: bool = True
-    use_tesseract: bool = True
-    tesseract_path: str = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-    ocr_languages: List[str] = field(default_factory=lambda: ['en'])
+    ocr: OCRConfig = field(default_factory=OCRConfig)
     
     # Processing Options
     parallel_processing: bool = False
@@ -81,147 +162,225 @@ class Config:
     log_level: str = "INFO"  # DEBUG, INFO, WARNING, ERROR
     
     # Tax Configuration (Phase 4)
-    tax_strategy: str = field(default_factory=lambda: os.getenv("TAX_STRATEGY", "ato"))
+    tax_strategy: str = _ENV.get("TAX_STRATEGY", "ato")
     tax_rules_path: Optional[Path] = None
     wfh_log_path: Optional[Path] = None
     catalog_only_mode: bool = False
     
+    # Derived paths, built on first access (slots rule out cached_property)
+    _paths: Dict[str, Path] = field(default_factory=dict, init=False)
+    # Normalised api_provider
+    _provider: Optional[Provider] = field(init=False)
+    
+    def __post_init__(self) -> None:
+        # Frozen: derived fields have to bypass the generated __setattr__
+        object.__setattr__(self, 'work_use_percentage',
+                           self.work_from_home_days * 100 // self.total_work_days)
+        object.__setattr__(self, '_provider', _parse_provider(self.api_provider))
+        fallback_providers = []
+        for provider in self.fallback_providers:
+            provider = provider.strip().lower()
+            if not provider or provider == self.api_provider.lower():
+                continue
+            if _parse_provider(provider) is None:
+                raise ValueError(f"Invalid fallback provider: {provider}. Must be 'lmstudio', 'openai', or 'openrouter'")
+            fallback_providers.append(provider)
+        object.__setattr__(self, 'fallback_providers', tuple(dict.fromkeys(fallback_providers)))
+    
+    def _derived_paths(self) -> Dict[str, Path]:
+        """Build all derived paths once; Config is frozen so they never go stale"""
+        paths = self._paths
+        if not paths:
+            # Join as strings and wrap each result once, rather than chaining
+            # Path.__truediv__ (which re-parses the growing path every step)
+            join = os.path.join
+            invoice_folder = join(self.base_path, f"FY{self.financial_year}")
+            output_folder = join(invoice_folder, "Processed")
+            paths['invoice_folder'] = Path(invoice_folder)
+            paths['output_folder'] = Path(output_folder)
+            paths['log_folder'] = Path(join(output_folder, "Logs"))
+            paths['cache_path'] = Path(join(output_folder, "cache.json"))
+            paths['failed_files_path'] = Path(join(output_folder, "failed_files.json"))
+            paths['ocr_cache_path'] = Path(join(output_folder, "ocr_cache.sqlite3"))
+        return paths
+    
     @property
     def invoice_folder(self) -> Path:
         """Get invoice folder path for current financial year"""
-        return self.base_path / f"FY{self.financial_year}"
+        return self._derived_paths()['invoice_folder']
     
     @property
     def output_folder(self) -> Path:
         """Get output folder path"""
-        return self.invoice_folder / "Processed"
+        return self._derived_paths()['output_folder']
     
     @property
     def log_folder(self) -> Path:
         """Get log folder path"""
-        return self.output_folder / "Logs"
+        return self._derived_paths()['log_folder']
     
     @property
     def cache_path(self) -> Path:
         """Get cache file path"""
-        return self.output_folder / "cache.json"
+        return self._derived_paths()['cache_path']
     
     @property
     def failed_files_path(self) -> Path:
         """Get failed files tracking path"""
-        return self.output_folder / "failed_files.json"
+        return self._derived_paths()['failed_files_path']
+    
+    @property
+    def ocr_cache_path(self) -> Path:
+        """Get OCR text cache path"""
+        return self._derived_paths()['ocr_cache_path']
     
     @property
     def vendor_overrides_path(self) -> Path:
         """Get vendor overrides configuration path"""
-        # Look for vendor_overrides.json in the invoice_cataloger directory
-        script_dir = Path(__file__).parent
-        return script_dir / "vendor_overrides.json"
+        # vendor_overrides.json lives in the invoice_cataloger directory
+        return _VENDOR_OVERRIDES_PATH
     
-    def load_vendor_overrides(self) -> dict:
-        """Load vendor override configuration"""
+    def load_vendor_overrides(self) -> Dict[str, Any]:
+        """Load vendor override configuration (cached until the file changes)"""
         try:
-            if self.vendor_overrides_path.exists():
-                with open(self.vendor_overrides_path, 'r') as f:
-                    data = json.load(f)
-                    # Filter only enabled overrides
-                    enabled_overrides = [
-                        override for override in data.get('overrides', [])
-                        if override.get('enabled', True)
-                    ]
-                    return {
-                        'overrides': enabled_overrides,
-                        'available_categories': data.get('available_categories', [])
-                    }
-            return {'overrides': [], 'available_categories': []}
+            path = self.vendor_overrides_path
+            try:
+                mtime = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                return {'overrides': [], 'available_categories': []}
+            
+            cached = _vendor_overrides_cache.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            
+            data = _read_json(path)
+            # Keep only enabled overrides, and only the fields matching needs;
+            # notes and the file's _comment/_instructions are for human editors
+            enabled_overrides = [
+                {
+                    'vendor_pattern': override.get('vendor_pattern', ''),
+                    'category': override.get('category', '')
+                }
+                for override in data.get('overrides', [])
+                if override.get('enabled', True)
+            ]
+            result = {
+                'overrides': enabled_overrides,
+                'available_categories': data.get('available_categories', [])
+            }
+            _vendor_overrides_cache[path] = (mtime, result)
+            return result
         except Exception as e:
             print(f"Warning: Could not load vendor overrides: {e}")
             return {'overrides': [], 'available_categories': []}
     
     def validate_financial_year(self) -> bool:
         """Validate financial year format (YYYY-YYYY)"""
-        if not self.financial_year or '-' not in self.financial_year:
-            return False
-        
-        try:
-            years = self.financial_year.split('-')
-            if len(years) != 2:
-                return False
-            
-            start_year = int(years[0])
-            end_year = int(years[1])
-            
-            return end_year == start_year + 1
-        except (ValueError, IndexError):
-            return False
+        match = _FY_RE.fullmatch(self.financial_year or '')
+        return bool(match) and int(match[2]) == int(match[1]) + 1
     
-    def ensure_directories(self):
+    def ensure_directories(self) -> None:
         """Create necessary directories if they don't exist"""
-        self.output_folder.mkdir(parents=True, exist_ok=True)
-        self.log_folder.mkdir(parents=True, exist_ok=True)
-    
-    def validate_api_config(self) -> tuple[bool, str]:
-        """Validate API configuration based on selected provider"""
-        provider = self.api_provider.lower()
-        
-        if provider == "openai":
-            if not self.openai_api_key:
-                return False, "OpenAI API key is required. Set OPENAI_API_KEY in .env file"
-            if not self.openai_model:
-                return False, "OpenAI model is required. Set OPENAI_MODEL in .env file"
-            return True, f"OpenAI configured with model: {self.openai_model}"
-        
-        elif provider == "openrouter":
-            if not self.openrouter_api_key:
-                return False, "OpenRouter API key is required. Set OPENROUTER_API_KEY in .env file"
-            if not self.openrouter_model:
-                return False, "OpenRouter model is required. Set OPENROUTER_MODEL in .env file"
-            return True, f"OpenRouter configured with model: {self.openrouter_model}"
-        
-        elif provider == "lmstudio":
-            if not self.lm_studio_endpoint:
-                return False, "LM Studio endpoint is required. Set LM_STUDIO_ENDPOINT in .env file"
-            return True, f"LM Studio configured at: {self.lm_studio_endpoint}"
-        
-        else:
-            return False, f"Invalid API provider: {provider}. Must be 'lmstudio', 'openai', or 'openrouter'"
-    
-    def to_dict(self) -> dict:
+        log_folder = self.log_folder
+        if log_folder in _ensured_directories:
+            return
+        # Logs sits inside the output folder, so one mkdir creates both
+        log_folder.mkdir(parents=True, exist_ok=True)
+        _ensured_directories.add(log_folder)
+    
+    def validate_api_config(self, provider: Optional[str] = None) -> tuple[bool, str]:
+        """Validate API configuration for provider (default: the selected api_provider)"""
+        parsed = self._provider if provider is None else _parse_provider(provider)
+        validator = _PROVIDER_VALIDATORS.get(parsed)
+        if validator is None:
+            name = (provider or self.api_provider).lower()
+            return False, f"Invalid API provider: {name}. Must be 'lmstudio', 'openai', or 'openrouter'"
+        return validator(self)
+    
+    def _validate_openai(self) -> tuple[bool, str]:
+        if not self.openai_api_key:
+            return False, "OpenAI API key is required. Set OPENAI_API_KEY in .env file"
+        if not self.openai_model:
+            return False, "OpenAI model is required. Set OPENAI_MODEL in .env file"
+        return True, f"OpenAI configured with model: {self.openai_model}"
+    
+    def _validate_openrouter(self) -> tuple[bool, str]:
+        if not self.openrouter_api_key:
+            return False, "OpenRouter API key is required. Set OPENROUTER_API_KEY in .env file"
+        if not self.openrouter_model:
+            return False, "OpenRouter model is required. Set OPENROUTER_MODEL in .env file"
+        return True, f"OpenRouter configured with model: {self.openrouter_model}"
+    
+    def _validate_lmstudio(self) -> tuple[bool, str]:
+        if not self.lm_studio_endpoint:
+            return False, "LM Studio endpoint is required. Set LM_STUDIO_ENDPOINT in .env file"
+        return True, f"LM Studio configured at: {self.lm_studio_endpoint}"
+    
+    def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary"""
-        return {
-            'api_provider': self.api_provider,
-            'lm_studio_endpoint': self.lm_studio_endpoint,
-            'openai_model': self.openai_model if self.api_provider == 'openai' else 'N/A',
-            'openrouter_model': self.openrouter_model if self.api_provider == 'openrouter' else 'N/A',
-            'financial_year': self.financial_year,
-            'work_use_percentage': self.work_use_percentage,
-            'occupation': self.occupation,
-            'invoice_folder': str(self.invoice_folder),
-            'output_folder': str(self.output_folder),
-            'use_custom_prompt': self.use_custom_prompt,
-        }
-    
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Config':
-        """Create config from dictionary"""
-        config = cls()
-        for key, value in data.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-        return config
-    
-    def save_to_file(self, filepath: Path):
-        """Save configuration to JSON file"""
-        with open(filepath, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
-    
-    @classmethod
-    def load_from_file(cls, filepath: Path) -> 'Config':
-        """Load configuration from JSON file"""
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        return cls.from_dict(data)
-
-
-# Global config instance
-config = Config()
+        data = {name: getattr(self, name) for name in _SERIALIZED_FIELDS}
+        # Only the active hosted provider's model is meaningful
+        data['openai_model'] = self.openai_model if self._provider is Provider.OPENAI else 'N/A'
+        data['openrouter_model'] = self.openrouter_model if self._provider is Provider.OPENROUTER else 'N/A'
+        data['invoice_folder'] = str(self.invoice_folder)
+        data['output_folder'] = str(self.output_folder)
+        return data
+
+
+# Plain fields copied verbatim by to_dict
+_SERIALIZED_FIELDS: Tuple[str, ...] = (
+    'api_provider',
+    'lm_studio_endpoint',
+    'financial_year',
+    'work_use_percentage',
+    'occupation',
+    'use_custom_prompt',
+)
+
+# Per-provider checks used by validate_api_config
+_PROVIDER_VALIDATORS: Dict[Provider, Callable[[Config], Tuple[bool, str]]] = {
+    Provider.OPENAI: Config._validate_openai,
+    Provider.OPENROUTER: Config._validate_openrouter,
+    Provider.LMSTUDIO: Config._validate_lmstudio,
+}
+
+# Constructor arguments accepted by config_from_dict (derived properties are ignored)
+_CONFIG_FIELDS: FrozenSet[str] = frozenset(f.name for f in fields(Config) if f.init)
+
+# JSON stores paths as strings and tuples as lists; coerce them back
+_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    'base_path': Path,
+    'tax_rules_path': Path,
+    'wfh_log_path': Path,
+    'file_extensions': frozenset,
+    'fallback_providers': tuple,
+    'ocr': lambda value: value if isinstance(value, OCRConfig) else OCRConfig(**value),
+}
+
+
+def config_from_dict(data: Dict[str, Any]) -> Config:
+    """Create config from dictionary"""
+    kwargs = {}
+    for key, value in data.items():
+        if key in _CONFIG_FIELDS:
+            convert = _CONVERTERS.get(key)
+            kwargs[key] = convert(value) if convert and value is not None else value
+    return Config(**kwargs)
+
+
+def save_config(cfg: Config, filepath: Path) -> None:
+    """Save configuration to JSON file"""
+    _write_json(filepath, cfg.to_dict())
+
+
+def load_config(filepath: Path) -> Config:
+    """Load configuration from JSON file"""
+    return config_from_dict(_read_json(filepath))
+
+
+def __getattr__(name: str) -> Any:
+    """Build the global config instance on first access"""
+    if name == 'config':
+        instance = globals()['config'] = Config()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
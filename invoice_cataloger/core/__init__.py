@@ -4,8 +4,8 @@ Core Module - Invoice Cataloger Core Logic
 Contains the main business logic separated from CLI concerns.
 """
 
-from .cataloger_service import CatalogerService
 from .file_processor import FileProcessor
+from .invoice_record import InvoiceRecord, INVOICE_COLUMNS
 from .prerequisite_checker import PrerequisiteChecker
 
-__all__ = ['CatalogerService', 'FileProcessor', 'PrerequisiteChecker']
+__all__ = ['FileProcessor', 'InvoiceRecord', 'INVOICE_COLUMNS', 'PrerequisiteChecker']
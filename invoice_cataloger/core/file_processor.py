@@ -1,142 +1,161 @@
 """
-File Processor - Handles individual invoice file processing
+File Processor - Handles individual file processing logic
 
 Separated from main cataloger for single responsibility.
 """
+import asyncio
+import functools
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 from config import Config
-from utils import get_logger, CacheManager, FailedFilesManager
+from utils import get_logger, CacheManager, FailedFilesManager, OCRCache
 from extractors import PDFExtractor, ImageExtractor, DocumentExtractor, EmailExtractor
-from processors import LLMProcessor, ExpenseCategorizer, DeductionCalculator
+from processors import create_llm_client, ExpenseCategorizer, DeductionCalculator
+from .invoice_record import InvoiceRecord
 
+# Words any invoice or receipt carries; text with fewer than two hits never reaches the LLM
+_INVOICE_SIGNAL = re.compile(
+    r"\b(invoice|gst|abn|receipt|subtotal|total|amount\s+due|tax)\b", re.IGNORECASE
+)
+_MIN_INVOICE_SIGNALS = 2
 
-class FileProcessor:
-    """Process individual invoice files"""
+# (key, label, critical) for _check_missing_fields; non-critical fields are only noted
+_FIELD_CHECKS = (
+    ('vendor_name', 'Vendor Name', True),
+    ('invoice_date', 'Invoice Date', True),
+    ('total', 'Total Amount', True),
+    ('invoice_number', 'Invoice Number (bonus)', False),
+)
+
+# (source key, InvoiceRecord field, default) copied from LLM data into catalog rows
+_EXTRACTED_FIELDS = (
+    ('vendor_name', 'VendorName', ''),
+    ('vendor_abn', 'VendorABN', ''),
+    ('invoice_number', 'InvoiceNumber', ''),
+    ('invoice_date', 'InvoiceDate', ''),
+    ('due_date', 'DueDate', ''),
+    ('subtotal', 'SubTotal', 0.00),
+    ('tax', 'Tax', 0.00),
+    ('total', 'TotalAmount', 0.00),
+    ('currency', 'Currency', 'AUD'),
+)
+
+# (key, default) copied from a deduction; keys match the InvoiceRecord fields.
+# RequiresDocumentation is a list and is copied separately (see _copied_fields)
+_DEDUCTION_FIELDS = (
+    ('WorkUsePercentage', 0),
+    ('DeductibleAmount', 0.00),
+    ('ClaimMethod', ''),
+    ('ClaimNotes', ''),
+    ('AtoReference', ''),
+)
+
+# Types whose extractors accept in-memory content, and the largest file read whole
+_IN_MEMORY_TYPES = frozenset({'.pdf', '.eml'})
+_MAX_IN_MEMORY_BYTES = 100 * 1024 * 1024
+
+# Word/Excel types, by the kind DocumentExtractor.extract_batch expects
+_DOCUMENT_KINDS = {'.doc': 'word', '.docx': 'word', '.xls': 'excel', '.xlsx': 'excel'}
+
+
+def _largest_first(files: List[Path]) -> List[int]:
+    """
+    Indexes of files ordered by size, largest first
     
-    def __init__(self, config: Config, 
-                 llm_processor: LLMProcessor,
-                 categorizer: ExpenseCategorizer,
-                 deduction_calculator: DeductionCalculator,
-                 cache_manager: CacheManager,
-                 failed_files_manager: FailedFilesManager):
-        self.config = config
-        self.logger = get_logger()
-        
-        # Processors
-        self.llm_processor = llm_processor
-        self.categorizer = categorizer
-        self.deduction_calculator = deduction_calculator
-        
-        # Managers
-        self.cache_manager = cache_manager
-        self.failed_files_manager = failed_files_manager
-        
-        # Initialize extractors
-        self.pdf_extractor = PDFExtractor(
-            tesseract_path=config.tesseract_path,
-            ocr_languages=config.ocr_languages
-        )
-        self.image_extractor = ImageExtractor(
-            tesseract_path=config.tesseract_path,
-            ocr_languages=config.ocr_languages
-        )
+    Starting the slowest (largest) files first lets them overlap with the
+    small ones instead of forming a long tail (longest-processing-time-first).
+    """
+    sizes = []
+    for file_path in files:
+        try:
+            sizes.append(file_path.stat().st_size)
+        except OSError:
+            sizes.append(0)
+    return sorted(range(len(files)), key=sizes.__getitem__, reverse=True)
+
+
+def _dispatch_extraction(extractors, file_path: Path,
+                         data: Optional[bytes] = None) -> Tuple[Optional[str], str]:
+    """
+    Route a file to the extractor for its type; extractors holds the *_extractor attributes
+    
+    data is the file content when it has already been read (see _IN_MEMORY_TYPES)
+    """
+    ext = file_path.suffix.lower()
+    
+    if data is not None and ext == '.pdf':
+        return extractors.pdf_extractor.extract_from_bytes(data)
+    elif data is not None and ext == '.eml':
+        return extractors.email_extractor.extract_from_eml_bytes(data)
+    elif ext == '.pdf':
+        return extractors.pdf_extractor.extract_text(file_path)
+    elif ext in ['.png', '.jpg', '.jpeg', '.gif']:
+        return extractors.image_extractor.extract_text(file_path)
+    elif ext in ['.doc', '.docx']:
+        return extractors.document_extractor.extract_from_word(file_path)
+    elif ext in ['.xls', '.xlsx']:
+        return extractors.document_extractor.extract_from_excel(file_path)
+    elif ext == '.eml':
+        return extractors.email_extractor.extract_from_eml(file_path)
+    elif ext == '.msg':
+        return extractors.email_extractor.extract_from_msg(file_path)
+    else:
+        return None, "Unsupported file type"
+
+
+class _ExtractorSet:
+    """One extractor per file family, sharing OCR settings"""
+    
+    def __init__(self, tesseract_path: Optional[str], ocr_languages, ocr_device: str = "auto",
+                 ocr_dpi: int = 200):
+        self.pdf_extractor = PDFExtractor(tesseract_path=tesseract_path,
+                                          ocr_languages=ocr_languages,
+                                          ocr_device=ocr_device,
+                                          ocr_dpi=ocr_dpi)
+        self.image_extractor = ImageExtractor(tesseract_path=tesseract_path,
+                                              ocr_languages=ocr_languages,
+                                              ocr_device=ocr_device)
         self.document_extractor = DocumentExtractor()
         self.email_extractor = EmailExtractor()
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_extractors(tesseract_path: Optional[str],
+                       ocr_languages: Tuple[str, ...],
+                       ocr_device: str = "auto",
+                       ocr_dpi: int = 200) -> _ExtractorSet:
+    """
+    Extractors for these OCR settings, built once per process
     
-    def process_file(self, file_path: Path, file_index: int, 
-                    total_files: int, reprocess: bool = False) -> Optional[Dict[str, Any]]:
-        """
-        Process a single invoice file
-        
-        Args:
-            file_path: Path to the file to process
-            file_index: Current file index (for progress tracking)
-            total_files: Total number of files to process
-            reprocess: If True, ignore cache and reprocess
-        
-        Returns:
-            Dictionary with processed invoice data or None
-        """
-        self.logger.progress(file_index, total_files, f"Processing: {file_path.name}")
-        
-        # Calculate file hash
-        file_hash = CacheManager.calculate_file_hash(file_path)
-        if not file_hash:
-            self.logger.error("Could not calculate file hash")
-            return None
-        
-        # Check cache (skip if reprocess mode)
-        if not reprocess:
-            cached_result = self._check_cache(file_path, file_hash)
-            if cached_result:
-                return cached_result
-        
-        # Check if file has failed too many times
-        if self._should_skip_failed_file(file_path, file_hash):
-            return self._create_failed_entry(
-                file_path, file_hash,
-                "Skipped - Too many failures",
-                "Skipped (Max retries exceeded)"
-            )
-        
-        # Process the file
-        try:
-            return self._process_file_content(file_path, file_hash)
-        except Exception as e:
-            self.logger.error(f"Error processing file: {e}")
-            return self._handle_processing_error(file_path, file_hash, str(e))
-    
-    def _check_cache(self, file_path: Path, file_hash: str) -> Optional[Dict[str, Any]]:
-        """Check if file is already in cache"""
-        cached_entry = self.cache_manager.find_by_hash(file_hash)
-        if cached_entry:
-            self.logger.warning("DUPLICATE FOUND: File already processed (cached)")
-            self.logger.info(f"Original: {cached_entry['FileName']} | Processed: {cached_entry['ProcessedDate']}")
-            
-            return {
-                'FileName': file_path.name,
-                'FileType': file_path.suffix.lower(),
-                'FilePath': str(file_path),
-                'OriginalPath': str(file_path),
-                'ProcessedDateTime': datetime.now(),
-                'VendorName': cached_entry['ExtractedData'].get('vendor_name', ''),
-                'VendorABN': cached_entry['ExtractedData'].get('vendor_abn', ''),
-                'InvoiceNumber': cached_entry['ExtractedData'].get('invoice_number', ''),
-                'InvoiceDate': cached_entry['ExtractedData'].get('invoice_date', ''),
-                'DueDate': cached_entry['ExtractedData'].get('due_date', ''),
-                'SubTotal': cached_entry['ExtractedData'].get('subtotal', 0.00),
-                'Tax': cached_entry['ExtractedData'].get('tax', 0.00),
-                'TotalAmount': cached_entry['ExtractedData'].get('total', 0.00),
-                'Currency': cached_entry['ExtractedData'].get('currency', 'AUD'),
-                'Category': cached_entry['Category'],
-                'WorkUsePercentage': cached_entry['Deduction'].get('WorkUsePercentage', 0),
-                'DeductibleAmount': cached_entry['Deduction'].get('DeductibleAmount', 0.00),
-                'ClaimMethod': cached_entry['Deduction'].get('ClaimMethod', ''),
-                'ClaimNotes': cached_entry['Deduction'].get('ClaimNotes', ''),
-                'AtoReference': cached_entry['Deduction'].get('AtoReference', ''),
-                'RequiresDocumentation': cached_entry['Deduction'].get('RequiresDocumentation', []),
-                'ProcessingStatus': 'Cached (Duplicate)',
-                'FileHash': file_hash,
-                'MovedTo': 'N/A - Duplicate',
-                'NeedsMan<create_file>
-<path>invoice_cataloger/core/file_processor.py</path>
-<content>
-"""
-File Processor - Handles individual file processing logic
+    Every FileProcessor in the process reuses them, so OCR readers that the
+    extractors load lazily (EasyOCR models especially) are loaded only once.
+    """
+    return _ExtractorSet(tesseract_path, ocr_languages, ocr_device, ocr_dpi)
 
-Separated from main cataloger for single responsibility.
-"""
-from pathlib import Path
-from typing import Dict, Any, Optional, List
-from datetime import datetime
 
-from config import Config
-from utils import get_logger, CacheManager, FailedFilesManager
-from extractors import PDFExtractor, ImageExtractor, DocumentExtractor, EmailExtractor
-from processors import LLMProcessor, ExpenseCategorizer, DeductionCalculator
+# Set once per worker process by _init_worker so OCR engines load a single time
+_worker_extractors: Optional[_ExtractorSet] = None
+
+
+def _init_worker(tesseract_path: Optional[str], ocr_languages, ocr_device: str = "auto",
+                 ocr_dpi: int = 200) -> None:
+    """Process pool initializer - build the extractors for this worker"""
+    global _worker_extractors
+    _worker_extractors = _shared_extractors(tesseract_path, tuple(ocr_languages), ocr_device, ocr_dpi)
+
+
+def _extract_in_worker(file_path: Path) -> Tuple[Optional[str], str]:
+    """Extract one file inside a pool worker; errors come back as the method string"""
+    try:
+        return _dispatch_extraction(_worker_extractors, file_path)
+    except Exception as e:
+        return None, f"Extraction error: {e}"
 
 
 class FileProcessor:
@@ -146,38 +165,16 @@ class FileProcessor:
         self.config = config
         self.logger = get_logger()
         
-        # Initialize extractors
-        self.pdf_extractor = PDFExtractor(
-            tesseract_path=config.tesseract_path,
-            ocr_languages=config.ocr_languages
-        )
-        self.image_extractor = ImageExtractor(
-            tesseract_path=config.tesseract_path,
-            ocr_languages=config.ocr_languages
-        )
-        self.document_extractor = DocumentExtractor()
-        self.email_extractor = EmailExtractor()
+        # Initialize extractors (shared by every FileProcessor in the process)
+        extractors = _shared_extractors(config.ocr.tesseract_path, tuple(config.ocr.languages),
+                                        config.ocr.device, config.ocr.dpi)
+        self.pdf_extractor = extractors.pdf_extractor
+        self.image_extractor = extractors.image_extractor
+        self.document_extractor = extractors.document_extractor
+        self.email_extractor = extractors.email_extractor
         
         # Initialize processors
-        self.llm_processor = LLMProcessor(
-            api_provider=config.api_provider,
-            endpoint=config.lm_studio_endpoint,
-            model=config.lm_studio_model,
-            openai_api_key=config.openai_api_key,
-            openai_model=config.openai_model,
-            openai_api_base=config.openai_api_base,
-            openrouter_api_key=config.openrouter_api_key,
-            openrouter_model=config.openrouter_model,
-            openrouter_api_base=config.openrouter_api_base,
-            openrouter_app_name=config.openrouter_app_name,
-            use_custom_prompt=config.use_custom_prompt,
-            custom_extraction_prompt=config.custom_extraction_prompt,
-            temperature=config.temperature,
-            max_tokens=config.max_tokens,
-            timeout=config.timeout_seconds,
-            retry_attempts=config.retry_attempts,
-            retry_delay=config.retry_delay_seconds
-        )
+        self.llm_processor = create_llm_client(config)
         
         # Load vendor overrides and initialize categorizer
         vendor_overrides_data = config.load_vendor_overrides()
@@ -192,28 +189,136 @@ class FileProcessor:
         # Initialize managers
         self.cache_manager = CacheManager(config.cache_path)
         self.failed_files_manager = FailedFilesManager(config.failed_files_path)
+        self.ocr_cache = OCRCache(config.ocr_cache_path)
+        
+        # Row timestamp shared by everything processed within the same second
+        self._now_cache: Optional[datetime] = None
+        self._now_checked = 0.0
     
-    def extract_text(self, file_path: Path) -> tuple[Optional[str], str]:
-        """Extract text from file based on type"""
-        ext = file_path.suffix.lower()
-        
-        if ext == '.pdf':
-            return self.pdf_extractor.extract_text(file_path)
-        elif ext in ['.png', '.jpg', '.jpeg', '.gif']:
-            return self.image_extractor.extract_text(file_path)
-        elif ext in ['.doc', '.docx']:
-            return self.document_extractor.extract_from_word(file_path)
-        elif ext in ['.xls', '.xlsx']:
-            return self.document_extractor.extract_from_excel(file_path)
-        elif ext == '.eml':
-            return self.email_extractor.extract_from_eml(file_path)
-        elif ext == '.msg':
-            return self.email_extractor.extract_from_msg(file_path)
-        else:
-            return None, "Unsupported file type"
+    def extract_text(self, file_path: Path,
+                     data: Optional[bytes] = None) -> tuple[Optional[str], str]:
+        """Extract text from file based on type, from data when already read"""
+        return _dispatch_extraction(self, file_path, data)
+    
+    def _extract_text_cached(self, file_path: Path, file_hash: str, reprocess: bool,
+                             data: Optional[bytes] = None) -> Tuple[Optional[str], str]:
+        """extract_text, reusing OCR text from an earlier run of the same file"""
+        cached = None if reprocess else self._cached_ocr_text(file_hash)
+        if cached is not None:
+            return cached
+        
+        text, method = self.extract_text(file_path, data)
+        self.ocr_cache.put_if_ocr(file_hash, text, method)
+        return text, method
+    
+    def _cached_ocr_text(self, file_hash: str) -> Optional[Tuple[str, str]]:
+        """(text, method) from the OCR cache, or None"""
+        cached = self.ocr_cache.lookup(file_hash)
+        if cached is not None:
+            self.logger.debug("Reusing OCR text from an earlier run")
+        return cached
+    
+    def _extract_or_error(self, file_path: Path) -> Tuple[Optional[str], str]:
+        """extract_text, with an exception reported as the method string"""
+        try:
+            return self.extract_text(file_path)
+        except Exception as e:
+            return None, f"Extraction error: {e}"
+    
+    def extract_text_many(self, files: List[Path]) -> List[Tuple[Optional[str], str]]:
+        """
+        Extract text from several files across a pool of worker processes
+        
+        OCR itself releases the GIL, but PyMuPDF parsing and page rendering
+        hold it (and _FITZ_LOCK serialises them), so threads would only
+        overlap the OCR. Worker processes run whole extractions in parallel,
+        one per two cores, with Tesseract single-threaded (see ocr_engine).
+        Each worker builds its extractors once in _init_worker. Word and
+        Excel files skip the pool and use DocumentExtractor.extract_batch.
+        
+        Returns:
+            (text, method) per file, in input order; a failed extraction gives
+            (None, "Extraction error: ...")
+        """
+        results: List[Tuple[Optional[str], str]] = [(None, "")] * len(files)
+        
+        # Word and Excel files are mostly file I/O, so they go to threads here
+        # instead of worker processes
+        pending = []
+        documents = {'word': [], 'excel': []}
+        for index, file_path in enumerate(files):
+            kind = _DOCUMENT_KINDS.get(file_path.suffix.lower())
+            if kind:
+                documents[kind].append(index)
+            else:
+                pending.append(index)
+        
+        for kind, indexes in documents.items():
+            if not indexes:
+                continue
+            try:
+                batch = self.document_extractor.extract_batch([files[i] for i in indexes], kind)
+                for index in indexes:
+                    results[index] = batch[files[index]]
+            except Exception as e:
+                for index in indexes:
+                    results[index] = (None, f"Extraction error: {e}")
+        
+        workers = min(len(pending), max(1, (os.cpu_count() or 1) // 2))
+        if workers <= 1:
+            # Too few cores for worker processes; threads still overlap the
+            # OCR (which releases the GIL) of several files
+            threads = min(len(pending), 8, os.cpu_count() or 1)
+            if threads <= 1:
+                for index in pending:
+                    results[index] = self._extract_or_error(files[index])
+                return results
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                for index, result in zip(pending, pool.map(self._extract_or_error,
+                                                           [files[i] for i in pending])):
+                    results[index] = result
+            return results
+        
+        self.logger.debug(f"Extracting {len(pending)} file(s) with {workers} worker processes")
+        pending_files = [files[i] for i in pending]
+        order = [pending[i] for i in _largest_first(pending_files)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.config.ocr.tesseract_path, self.config.ocr.languages,
+                      self.config.ocr.device, self.config.ocr.dpi)
+        ) as pool:
+            for index, result in zip(order, pool.map(_extract_in_worker,
+                                                     [files[i] for i in order])):
+                results[index] = result
+        return results
+    
+    @staticmethod
+    def _destination_path(folder: Path, file_path: Path,
+                          file_hash: Optional[str] = None) -> Path:
+        """
+        Pick a free name in folder for file_path
+        
+        A clash on the plain name falls back to stem_<hash8>, which is unique
+        per content, so only identical copies ever reach the counter probe.
+        """
+        dest_path = folder / file_path.name
+        if not dest_path.exists():
+            return dest_path
+        
+        if file_hash:
+            dest_path = folder / f"{file_path.stem}_{file_hash[:8]}{file_path.suffix}"
+            if not dest_path.exists():
+                return dest_path
+        
+        counter = 1
+        while dest_path.exists():
+            dest_path = folder / f"{file_path.stem}_{counter}{file_path.suffix}"
+            counter += 1
+        return dest_path
     
     def move_processed_file(self, file_path: Path, category: str,
-                           invoice_date: str) -> Path:
+                           invoice_date: str, file_hash: Optional[str] = None) -> Path:
         """Move processed file to organized folder structure"""
         if not self.config.move_processed_files:
             return file_path
@@ -229,36 +334,20 @@ class FileProcessor:
             dest_folder.mkdir(parents=True, exist_ok=True)
             
             # Move file
-            dest_path = dest_folder / file_path.name
-            
-            # Handle duplicate filenames
-            counter = 1
-            while dest_path.exists():
-                stem = file_path.stem
-                dest_path = dest_folder / f"{stem}_{counter}{file_path.suffix}"
-                counter += 1
-            
+            dest_path = self._destination_path(dest_folder, file_path, file_hash)
             file_path.rename(dest_path)
             return dest_path
         except Exception as e:
             self.logger.error(f"Error moving file: {e}")
             return file_path
     
-    def move_non_invoice(self, file_path: Path) -> Path:
+    def move_non_invoice(self, file_path: Path, file_hash: Optional[str] = None) -> Path:
         """Move non-invoice file to Non-Invoice folder"""
         try:
             non_invoice_folder = self.config.output_folder / "Non-Invoice"
             non_invoice_folder.mkdir(parents=True, exist_ok=True)
             
-            dest_path = non_invoice_folder / file_path.name
-            
-            # Handle duplicate filenames
-            counter = 1
-            while dest_path.exists():
-                stem = file_path.stem
-                dest_path = non_invoice_folder / f"{stem}_{counter}{file_path.suffix}"
-                counter += 1
-            
+            dest_path = self._destination_path(non_invoice_folder, file_path, file_hash)
             file_path.rename(dest_path)
             self.logger.info(f"Moved non-invoice to: {dest_path}")
             return dest_path
@@ -267,263 +356,589 @@ class FileProcessor:
             return file_path
     
     def process_file(self, file_path: Path, file_index: int,
-                    total_files: int, reprocess: bool = False) -> Optional[Dict[str, Any]]:
+                    total_files: int, reprocess: bool = False) -> Optional[InvoiceRecord]:
         """Process a single invoice file"""
         self.logger.progress(file_index, total_files, f"Processing: {file_path.name}")
         
-        # Calculate file hash
-        file_hash = CacheManager.calculate_file_hash(file_path)
-        if not file_hash:
-            self.logger.error("Could not calculate file hash")
-            return None
+        data = self._read_for_extraction(file_path)
+        file_hash, failed_entry, result = self._prepare_file(file_path, reprocess, data)
+        if result is not None or not file_hash:
+            return result
         
-        # Check cache (skip if reprocess mode)
-        cached_entry = None if reprocess else self.cache_manager.find_by_hash(file_hash)
-        if cached_entry:
-            self.logger.warning("DUPLICATE FOUND: File already processed (cached)")
-            self.logger.info(f"Original: {cached_entry['FileName']} | Processed: {cached_entry['ProcessedDate']}")
+        try:
+            # Extract text
+            text, method = self._extract_text_cached(file_path, file_hash, reprocess, data)
             
-            return self._create_cached_entry(file_path, file_hash, cached_entry)
-        
-        # Check if file has failed too many times
-        failed_entry = self.failed_files_manager.find_by_path(str(file_path))
-        if failed_entry and failed_entry['AttemptCount'] >= self.config.max_retry_attempts:
-            self.logger.warning(f"SKIPPED: File has failed {failed_entry['AttemptCount']} times")
+            result = self._screen_text(file_path, file_hash, failed_entry, text, method)
+            if result is not None:
+                return result
             
-            return self._create_failed_entry(file_path, file_hash,
-                                            "Skipped - Too many failures",
-                                            "Skipped (Max retries exceeded)")
+            # Extract data using LLM, unless identical text was extracted before
+            text_hash, extracted_data = self._find_cached_extraction(text, reprocess)
+            if extracted_data is None:
+                extracted_data = self.llm_processor.extract_invoice_data(text, file_path.name)
+            
+            return self._finish_file(file_path, file_hash, failed_entry, extracted_data, text_hash)
+            
+        except Exception as e:
+            return self._handle_processing_error(file_path, file_hash, failed_entry, e)
+    
+    async def process_file_async(self, file_path: Path, file_index: int,
+                                 total_files: int, reprocess: bool = False) -> Optional[InvoiceRecord]:
+        """
+        Process a single invoice file without blocking the event loop
         
-        try:
-            # Extract text
-            text, method = self.extract_text(file_path)
+        Reading and text extraction run in a worker thread and the LLM
+        request is awaited; cache, failed-file and move bookkeeping stay on
+        the event loop thread, so the managers are never touched concurrently.
+        """
+        result, job = await self._extract_stage(file_path, file_index, total_files, reprocess)
+        if job is None:
+            return result
+        return await self._llm_stage(job)
+    
+    async def process_files_async(self, files: List[Path],
+                                  reprocess: bool = False) -> List[Optional[InvoiceRecord]]:
+        """
+        Process a batch of files as a two-stage pipeline
+        
+        config.max_workers extraction workers feed a bounded queue drained by
+        config.max_concurrent_requests LLM workers, so OCR of later files
+        overlaps the LLM requests of earlier ones while only a few extracted
+        texts wait in memory. LLM workers also do the categorize/move/cache
+        step, which is short and must stay on the event loop thread. Larger
+        files are extracted first; results are returned in the same order as
+        files.
+        """
+        total_files = len(files)
+        results: List[Optional[InvoiceRecord]] = [None] * total_files
+        extract_workers = max(1, self.config.max_workers)
+        llm_workers = max(1, self.config.max_concurrent_requests)
+        
+        pending: asyncio.Queue = asyncio.Queue()
+        for index in _largest_first(files):
+            pending.put_nowait(index)
+        extracted: asyncio.Queue = asyncio.Queue(maxsize=2 * llm_workers)
+        
+        # A later copy of a file (same hash) waits for the copy in flight and
+        # then re-checks the cache it filled, so it is settled as a duplicate
+        # instead of being extracted, sent to the LLM and cataloged again.
+        # file_hash -> indices waiting on the copy in flight
+        file_waiters: Dict[str, List[int]] = {}
+        owners: Dict[int, str] = {}
+        waiting = set()
+        
+        def claim(index: int, file_hash: str) -> bool:
+            """Take file_hash for index, or queue index behind the copy that has it"""
+            waiters = file_waiters.get(file_hash)
+            if waiters is not None:
+                waiters.append(index)
+                waiting.add(index)
+                return False
+            file_waiters[file_hash] = []
+            owners[index] = file_hash
+            return True
+        
+        async def extract(index: int) -> Optional[Dict[str, Any]]:
+            """Extract stage for one file; the job, or None once settled or waiting"""
+            result, job = await self._extract_stage(files[index], index + 1, total_files,
+                                                    reprocess, functools.partial(claim, index))
+            if job is None and index not in waiting:
+                await settle(index, result)
+            return job
+        
+        async def settle(index: int, result: Optional[InvoiceRecord]):
+            results[index] = result
+            for waiter in file_waiters.pop(owners.pop(index, None), ()):
+                waiting.discard(waiter)
+                job = await extract(waiter)
+                if job is not None:
+                    await settle(waiter, await self._llm_stage(job))
+        
+        async def extract_worker():
+            while not pending.empty():
+                index = pending.get_nowait()
+                job = await extract(index)
+                if job is not None:
+                    await extracted.put((index, job))
+        
+        async def llm_worker():
+            while (item := await extracted.get()) is not None:
+                index, job = item
+                await settle(index, await self._llm_stage(job))
+        
+        async with asyncio.TaskGroup() as llm_group:
+            for _ in range(llm_workers):
+                llm_group.create_task(llm_worker())
             
-            if not text or len(text.strip()) < 10:
-                self.logger.warning(f"No text extracted using {method}")
-                
-                attempt_count = failed_entry['AttemptCount'] + 1 if failed_entry else 1
-                self.failed_files_manager.add_failure(
-                    str(file_path), file_path.name,
-                    f"No text content extracted ({method})",
-                    attempt_count
-                )
-                
-                return self._create_failed_entry(file_path, file_hash,
-                                                "No text content extracted",
-                                                "Failed (No text)")
+            async with asyncio.TaskGroup() as extract_group:
+                for _ in range(extract_workers):
+                    extract_group.create_task(extract_worker())
             
-            self.logger.debug(f"Text extracted using {method} ({len(text)} chars)")
+            # Extraction is done - one stop marker per LLM worker
+            for _ in range(llm_workers):
+                await extracted.put(None)
+        
+        return results
+    
+    async def _extract_stage(self, file_path: Path, file_index: int, total_files: int,
+                             reprocess: bool, claim: Optional[Callable[[str], bool]] = None
+                             ) -> Tuple[Optional[InvoiceRecord], Optional[Dict[str, Any]]]:
+        """
+        Everything before the LLM call for one file
+        
+        claim(file_hash), when given, is asked after the cache checks whether
+        this file may go on to extraction; if not the stage returns (None, None).
+        
+        Returns:
+            (result, job) - result when the file is already settled, otherwise
+            a job for _llm_stage
+        """
+        self.logger.progress(file_index, total_files, f"Processing: {file_path.name}")
+        
+        data = await asyncio.to_thread(self._read_for_extraction, file_path)
+        file_hash, failed_entry, result = self._prepare_file(file_path, reprocess, data)
+        if result is not None or not file_hash:
+            return result, None
+        if claim is not None and not claim(file_hash):
+            return None, None
+        
+        try:
+            text, method = await asyncio.to_thread(self._extract_text_cached, file_path,
+                                                   file_hash, reprocess, data)
             
-            # Check if file is a non-invoice (logo, signature, etc.)
-            is_non_invoice, non_invoice_reason = self._is_non_invoice(None, text)
-            if is_non_invoice:
-                self.logger.warning(f"NON-INVOICE DETECTED: {non_invoice_reason}")
-                
-                # Move to Non-Invoice folder
-                moved_path = self.move_non_invoice(file_path)
-                
-                return self._create_non_invoice_entry(file_path, file_hash, moved_path, non_invoice_reason)
+            result = self._screen_text(file_path, file_hash, failed_entry, text, method)
+            if result is not None:
+                return result, None
             
-            # Extract data using LLM
-            extracted_data = self.llm_processor.extract_invoice_data(text, file_path.name)
+            text_hash, extracted_data = self._find_cached_extraction(text, reprocess)
+            return None, {
+                'file_path': file_path,
+                'file_hash': file_hash,
+                'failed_entry': failed_entry,
+                'text': text,
+                'text_hash': text_hash,
+                'extracted_data': extracted_data
+            }
             
-            if not extracted_data:
-                self.logger.warning("Failed to extract data with LLM")
-                
-                attempt_count = failed_entry['AttemptCount'] + 1 if failed_entry else 1
-                self.failed_files_manager.add_failure(
-                    str(file_path), file_path.name,
-                    "AI extraction failed",
-                    attempt_count
+        except Exception as e:
+            return self._handle_processing_error(file_path, file_hash, failed_entry, e), None
+    
+    async def _llm_stage(self, job: Dict[str, Any]) -> InvoiceRecord:
+        """Extract data using LLM (unless the text cache already had it) and finish the file"""
+        extracted_data = job['extracted_data']
+        if extracted_data is None:
+            try:
+                extracted_data = await self.llm_processor.extract_invoice_data_async(
+                    job['text'], job['file_path'].name
                 )
-                
-                return self._create_failed_entry(file_path, file_hash,
-                                                "AI extraction failed",
-                                                "Failed (AI extraction)")
+            except Exception as e:
+                return self._handle_processing_error(job['file_path'], job['file_hash'],
+                                                     job['failed_entry'], e)
+        
+        return self._finish_job(job, extracted_data)
+    
+    def process_files(self, files: List[Path],
+                      reprocess: bool = False) -> List[Optional[InvoiceRecord]]:
+        """Process a batch of files concurrently (blocking wrapper)"""
+        return asyncio.run(self.process_files_async(files, reprocess))
+    
+    def process_files_batch(self, files: List[Path],
+                            reprocess: bool = False) -> List[Optional[InvoiceRecord]]:
+        """
+        Process a batch with one OpenAI Batch API job for all LLM extractions
+        
+        Meant for large unattended runs: every file is hashed and its text
+        extracted first (across worker processes, see extract_text_many),
+        then all texts go out in a single batch job (about half the cost of
+        per-file requests) and results are finalized when the job completes.
+        Falls back to concurrent per-file requests if the provider does not
+        support batches.
+        """
+        total_files = len(files)
+        results: List[Optional[InvoiceRecord]] = [None] * total_files
+        pending: Dict[str, Dict[str, Any]] = {}
+        
+        # Hash and cache checks first so only new files reach extraction. Only
+        # the first copy of each file goes on; later copies are settled from
+        # its cache entry at the end (see _settle_copies)
+        staged = []
+        first_copies: Dict[str, Path] = {}
+        copies = []
+        for i, file_path in enumerate(files, 1):
+            self.logger.progress(i, total_files, f"Checking: {file_path.name}")
+            file_hash, failed_entry, result = self._prepare_file(file_path, reprocess)
+            if result is not None or not file_hash:
+                results[i - 1] = result
+            elif file_hash in first_copies:
+                copies.append((i - 1, file_path, file_hash, first_copies[file_hash]))
+            else:
+                first_copies[file_hash] = file_path
+                staged.append((i - 1, file_path, file_hash, failed_entry))
+        
+        # Files OCRed on an earlier run reuse that text; the rest are extracted together
+        extracted = [None if reprocess else self._cached_ocr_text(file_hash)
+                     for _, _, file_hash, _ in staged]
+        missing = [i for i, result in enumerate(extracted) if result is None]
+        for i, result in zip(missing, self.extract_text_many([staged[i][1] for i in missing])):
+            extracted[i] = result
+            self.ocr_cache.put_if_ocr(staged[i][2], *result)
+        
+        for (index, file_path, file_hash, failed_entry), (text, method) in zip(staged, extracted):
+            try:
+                result = self._screen_text(file_path, file_hash, failed_entry, text, method)
+            except Exception as e:
+                result = self._handle_processing_error(file_path, file_hash, failed_entry, e)
             
-            # Check for missing critical fields
-            needs_manual_review, missing_fields = self._check_missing_fields(extracted_data)
+            if result is not None:
+                results[index] = result
+                continue
             
-            # Categorize expense
-            category = self.categorizer.categorize(
-                extracted_data.get('vendor_name', ''),
-                extracted_data.get('description', ''),
-                extracted_data.get('line_items', [])
+            job = {
+                'file_path': file_path,
+                'file_hash': file_hash,
+                'failed_entry': failed_entry,
+                'text': text
+            }
+            job['text_hash'], extracted_data = self._find_cached_extraction(text, reprocess)
+            if extracted_data is not None:
+                results[index] = self._finish_job(job, extracted_data)
+            else:
+                pending[str(index)] = job
+        
+        if not pending:
+            self._settle_copies(copies, results)
+            return results
+        
+        try:
+            batch_id = self.llm_processor.submit_batch(
+                [(custom_id, job['text']) for custom_id, job in pending.items()]
             )
-            
-            # Calculate deduction
-            deduction = self.deduction_calculator.calculate_deduction(
-                extracted_data, category
+        except Exception as e:
+            self.logger.error(f"Could not submit LLM batch: {e}")
+            batch_id = None
+        
+        if batch_id:
+            self.logger.info(f"Submitted {len(pending)} file(s) as LLM batch {batch_id}")
+            try:
+                batch_results = self.llm_processor.await_batch(batch_id)
+            except Exception as e:
+                # Files without a result are recorded as failures for retry
+                self.logger.error(f"Error waiting for LLM batch {batch_id}: {e}")
+                batch_results = {}
+        else:
+            self.logger.warning("Batch API unavailable for this provider - extracting per file")
+            batch_results = dict(zip(pending, self.llm_processor.extract_invoice_data_batch(
+                [(job['file_path'].name, job['text']) for job in pending.values()],
+                self.config.max_concurrent_requests
+            )))
+        
+        for custom_id, job in pending.items():
+            results[int(custom_id)] = self._finish_job(
+                job, batch_results.get(custom_id)
             )
+        
+        self._settle_copies(copies, results)
+        return results
+    
+    def _settle_copies(self, copies: List[Tuple[int, Path, str, Path]],
+                       results: List[Optional[InvoiceRecord]]):
+        """
+        Settle later copies of a file held back by process_files_batch
+        
+        Each becomes a duplicate of the cache entry its first copy left, or a
+        failure if the first copy was not cataloged (a later run retries it).
+        """
+        for index, file_path, file_hash, first_path in copies:
+            cached_entry = self.cache_manager.find_by_hash(file_hash)
+            if cached_entry:
+                results[index] = self._create_cached_entry(file_path, file_hash, cached_entry)
+            else:
+                results[index] = self._create_failed_entry(
+                    file_path, file_hash,
+                    f"Same file as {first_path.name}, which was not cataloged",
+                    "Failed (Duplicate of failed file)"
+                )
+    
+    def _finish_job(self, job: Dict[str, Any],
+                    extracted_data: Optional[Dict[str, Any]]) -> InvoiceRecord:
+        """Finish a file staged by process_files_batch or _extract_stage with its LLM result"""
+        try:
+            return self._finish_file(job['file_path'], job['file_hash'],
+                                     job['failed_entry'], extracted_data, job['text_hash'])
+        except Exception as e:
+            return self._handle_processing_error(job['file_path'], job['file_hash'],
+                                                 job['failed_entry'], e)
+    
+    @staticmethod
+    def _read_for_extraction(file_path: Path) -> Optional[bytes]:
+        """
+        Read a file whole when its extractor can work from memory
+        
+        The same bytes are then hashed and extracted, so a cache miss reads the
+        file once instead of twice. Other types and files over
+        _MAX_IN_MEMORY_BYTES return None and keep the streaming path.
+        """
+        if file_path.suffix.lower() not in _IN_MEMORY_TYPES:
+            return None
+        try:
+            if file_path.stat().st_size > _MAX_IN_MEMORY_BYTES:
+                return None
+            return file_path.read_bytes()
+        except OSError:
+            # Let the path-based hash report the problem
+            return None
+    
+    def _prepare_file(self, file_path: Path, reprocess: bool, data: Optional[bytes] = None
+                      ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[InvoiceRecord]]:
+        """
+        Hash the file and apply the cache and retry-limit checks
+        
+        Returns:
+            (file_hash, failed_entry, result) - a non-None result, or a
+            missing hash, means processing stops here
+        """
+        # Calculate file hash
+        if data is not None:
+            file_hash = CacheManager.calculate_bytes_hash(data)
+        else:
+            file_hash = CacheManager.calculate_file_hash(file_path)
+        if not file_hash:
+            self.logger.error("Could not calculate file hash")
+            return None, None, None
+        
+        # Check cache (skip if reprocess mode)
+        cached_entry = None if reprocess else self.cache_manager.find_by_hash(file_hash)
+        if cached_entry:
+            self.logger.warning("DUPLICATE FOUND: File already processed (cached)")
+            self.logger.info(f"Original: {cached_entry['FileName']} | Processed: {cached_entry['ProcessedDate']}")
             
-            # Log if manual review needed
-            if needs_manual_review:
-                self.logger.warning(f"NEEDS MANUAL REVIEW: Missing fields: {', '.join(missing_fields)}")
-            
-            # Move file
-            moved_path = self.move_processed_file(
-                file_path, category, extracted_data.get('invoice_date', '')
-            )
+            return file_hash, None, self._create_cached_entry(file_path, file_hash, cached_entry)
+        
+        # Check if file has failed too many times
+        failed_entry = (None if self.failed_files_manager.is_empty
+                        else self.failed_files_manager.find_by_path(str(file_path)))
+        if failed_entry and failed_entry['AttemptCount'] >= self.config.max_retry_attempts:
+            self.logger.warning(f"SKIPPED: File has failed {failed_entry['AttemptCount']} times")
             
-            # Add to cache
-            self.cache_manager.add_entry(
-                file_path.name, file_hash, extracted_data, category, deduction
+            return file_hash, failed_entry, self._create_failed_entry(
+                file_path, file_hash,
+                "Skipped - Too many failures",
+                "Skipped (Max retries exceeded)"
             )
+        
+        return file_hash, failed_entry, None
+    
+    def _screen_text(self, file_path: Path, file_hash: str,
+                     failed_entry: Optional[Dict[str, Any]],
+                     text: Optional[str], method: str) -> Optional[InvoiceRecord]:
+        """Reject files with no usable text or that are not invoices; None to continue"""
+        if not text or len(text.strip()) < 10:
+            self.logger.warning(f"No text extracted using {method}")
             
-            # Remove from failed files if it was there
-            if failed_entry:
-                self.failed_files_manager.remove_failure(str(file_path))
-                self.logger.info("Removed from failed files list (successful retry)")
+            self._record_failure(file_path, failed_entry,
+                                 f"No text content extracted ({method})")
             
-            self.logger.success(f"Extracted: {extracted_data.get('vendor_name', 'Unknown')} - {category} - ${extracted_data.get('total', 0)}")
+            return self._create_failed_entry(file_path, file_hash,
+                                            "No text content extracted",
+                                            "Failed (No text)")
+        
+        self.logger.debug(f"Text extracted using {method} ({len(text)} chars)")
+        
+        # Check if file is a non-invoice (logo, signature, etc.)
+        is_non_invoice, non_invoice_reason = self._is_non_invoice(None, text)
+        if is_non_invoice:
+            self.logger.warning(f"NON-INVOICE DETECTED: {non_invoice_reason}")
             
-            return self._create_success_entry(file_path, file_hash, moved_path,
-                                             extracted_data, category, deduction,
-                                             needs_manual_review, missing_fields)
+            # Move to Non-Invoice folder
+            moved_path = self.move_non_invoice(file_path, file_hash)
             
-        except Exception as e:
-            self.logger.error(f"Error processing file: {e}")
+            return self._create_non_invoice_entry(file_path, file_hash, moved_path, non_invoice_reason)
+        
+        return None
+    
+    def _find_cached_extraction(self, text: str, reprocess: bool
+                                ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Look up LLM data already extracted from identical text
+        
+        Catches re-saved or renamed copies whose file hash differs but whose
+        text does not. Returns (text_hash, extracted_data or None).
+        """
+        text_hash = CacheManager.calculate_text_hash(text)
+        if reprocess:
+            return text_hash, None
+        
+        cached_entry = self.cache_manager.find_by_text_hash(text_hash)
+        if cached_entry is None:
+            return text_hash, None
+        
+        self.logger.info(f"Same text as {cached_entry['FileName']} - reusing its extracted data")
+        return text_hash, cached_entry['ExtractedData']
+    
+    def _finish_file(self, file_path: Path, file_hash: str,
+                     failed_entry: Optional[Dict[str, Any]],
+                     extracted_data: Optional[Dict[str, Any]],
+                     text_hash: Optional[str] = None) -> InvoiceRecord:
+        """Categorize, calculate deduction, move and cache a file after LLM extraction"""
+        if not extracted_data:
+            self.logger.warning("Failed to extract data with LLM")
             
-            attempt_count = failed_entry['AttemptCount'] + 1 if failed_entry else 1
-            self.failed_files_manager.add_failure(
-                str(file_path), file_path.name,
-                f"Processing error: {str(e)}",
-                attempt_count
-            )
+            self._record_failure(file_path, failed_entry, "AI extraction failed")
             
             return self._create_failed_entry(file_path, file_hash,
-                                            f"Processing error: {str(e)}",
-                                            "Failed (Error)")
+                                            "AI extraction failed",
+                                            "Failed (AI extraction)")
+        
+        # Check for missing critical fields
+        needs_manual_review, missing_fields = self._check_missing_fields(extracted_data)
+        
+        # Categorize expense
+        category = self.categorizer.categorize(
+            extracted_data.get('vendor_name', ''),
+            extracted_data.get('description', ''),
+            extracted_data.get('line_items', [])
+        )
+        
+        # Calculate deduction
+        deduction = self.deduction_calculator.calculate_deduction(
+            extracted_data, category
+        )
+        
+        # Log if manual review needed
+        if needs_manual_review:
+            self.logger.warning(f"NEEDS MANUAL REVIEW: Missing fields: {', '.join(missing_fields)}")
+        
+        # Move file
+        moved_path = self.move_processed_file(
+            file_path, category, extracted_data.get('invoice_date', ''), file_hash
+        )
+        
+        # Add to cache
+        self.cache_manager.add_entry(
+            file_path.name, file_hash, extracted_data, category, deduction, text_hash
+        )
+        
+        # Remove from failed files if it was there
+        if failed_entry:
+            self.failed_files_manager.remove_failure(str(file_path))
+            self.logger.info("Removed from failed files list (successful retry)")
+        
+        self.logger.success(f"Extracted: {extracted_data.get('vendor_name', 'Unknown')} - {category} - ${extracted_data.get('total', 0)}")
+        
+        return self._create_success_entry(file_path, file_hash, moved_path,
+                                         extracted_data, category, deduction,
+                                         needs_manual_review, missing_fields)
+    
+    def _handle_processing_error(self, file_path: Path, file_hash: str,
+                                 failed_entry: Optional[Dict[str, Any]],
+                                 error: Exception) -> InvoiceRecord:
+        """Record an unexpected processing error as a failure"""
+        self.logger.error(f"Error processing file: {error}")
+        
+        self._record_failure(file_path, failed_entry, f"Processing error: {str(error)}")
+        
+        return self._create_failed_entry(file_path, file_hash,
+                                        f"Processing error: {str(error)}",
+                                        "Failed (Error)")
+    
+    def _record_failure(self, file_path: Path, failed_entry: Optional[Dict[str, Any]],
+                        reason: str):
+        """Add or bump the failed-files entry for a file"""
+        attempt_count = failed_entry['AttemptCount'] + 1 if failed_entry else 1
+        self.failed_files_manager.add_failure(
+            str(file_path), file_path.name, reason, attempt_count
+        )
+    
+    def _now(self) -> datetime:
+        """Current time for ProcessedDateTime, refreshed at most once a second"""
+        checked = time.monotonic()
+        if self._now_cache is None or checked - self._now_checked >= 1.0:
+            self._now_cache = datetime.now()
+            self._now_checked = checked
+        return self._now_cache
+    
+    @staticmethod
+    def _copied_fields(extracted_data: Dict[str, Any],
+                       deduction: Dict[str, Any]) -> Dict[str, Any]:
+        """InvoiceRecord fields taken over from LLM data and a deduction"""
+        fields = {field: extracted_data.get(key, default)
+                  for key, field, default in _EXTRACTED_FIELDS}
+        for key, default in _DEDUCTION_FIELDS:
+            fields[key] = deduction.get(key, default)
+        # A list of its own per record, like the field's default_factory
+        fields['RequiresDocumentation'] = list(deduction.get('RequiresDocumentation', ()))
+        return fields
     
     def _create_cached_entry(self, file_path: Path, file_hash: str,
-                           cached_entry: Dict[str, Any]) -> Dict[str, Any]:
+                           cached_entry: Dict[str, Any]) -> InvoiceRecord:
         """Create entry for cached (duplicate) file"""
-        return {
-            'FileName': file_path.name,
-            'FileType': file_path.suffix.lower(),
-            'FilePath': str(file_path),
-            'OriginalPath': str(file_path),
-            'ProcessedDateTime': datetime.now(),
-            'VendorName': cached_entry['ExtractedData'].get('vendor_name', ''),
-            'VendorABN': cached_entry['ExtractedData'].get('vendor_abn', ''),
-            'InvoiceNumber': cached_entry['ExtractedData'].get('invoice_number', ''),
-            'InvoiceDate': cached_entry['ExtractedData'].get('invoice_date', ''),
-            'DueDate': cached_entry['ExtractedData'].get('due_date', ''),
-            'SubTotal': cached_entry['ExtractedData'].get('subtotal', 0.00),
-            'Tax': cached_entry['ExtractedData'].get('tax', 0.00),
-            'TotalAmount': cached_entry['ExtractedData'].get('total', 0.00),
-            'Currency': cached_entry['ExtractedData'].get('currency', 'AUD'),
-            'Category': cached_entry['Category'],
-            'WorkUsePercentage': cached_entry['Deduction'].get('WorkUsePercentage', 0),
-            'DeductibleAmount': cached_entry['Deduction'].get('DeductibleAmount', 0.00),
-            'ClaimMethod': cached_entry['Deduction'].get('ClaimMethod', ''),
-            'ClaimNotes': cached_entry['Deduction'].get('ClaimNotes', ''),
-            'AtoReference': cached_entry['Deduction'].get('AtoReference', ''),
-            'RequiresDocumentation': cached_entry['Deduction'].get('RequiresDocumentation', []),
-            'ProcessingStatus': 'Cached (Duplicate)',
-            'FileHash': file_hash,
-            'MovedTo': 'N/A - Duplicate',
-            'NeedsManualReview': False,
-            'MissingFields': []
-        }
+        return InvoiceRecord(
+            FileName=file_path.name,
+            FileType=file_path.suffix.lower(),
+            FilePath=str(file_path),
+            OriginalPath=str(file_path),
+            ProcessedDateTime=self._now(),
+            Category=cached_entry['Category'],
+            ProcessingStatus='Cached (Duplicate)',
+            FileHash=file_hash,
+            MovedTo='N/A - Duplicate',
+            **self._copied_fields(cached_entry['ExtractedData'], cached_entry['Deduction'])
+        )
     
     def _create_non_invoice_entry(self, file_path: Path, file_hash: str,
-                                moved_path: Path, reason: str) -> Dict[str, Any]:
+                                moved_path: Path, reason: str) -> InvoiceRecord:
         """Create entry for non-invoice file"""
-        return {
-            'FileName': file_path.name,
-            'FileType': file_path.suffix.lower(),
-            'FilePath': str(moved_path),
-            'OriginalPath': str(file_path),
-            'ProcessedDateTime': datetime.now(),
-            'VendorName': 'N/A',
-            'VendorABN': '',
-            'InvoiceNumber': '',
-            'InvoiceDate': '',
-            'DueDate': '',
-            'SubTotal': 0.00,
-            'Tax': 0.00,
-            'TotalAmount': 0.00,
-            'Currency': 'AUD',
-            'Category': 'Non-Invoice',
-            'WorkUsePercentage': 0,
-            'DeductibleAmount': 0.00,
-            'ClaimMethod': 'Not Applicable',
-            'ClaimNotes': reason,
-            'AtoReference': 'N/A',
-            'RequiresDocumentation': [],
-            'ProcessingStatus': 'Non-Invoice',
-            'FileHash': file_hash,
-            'MovedTo': str(moved_path),
-            'NeedsManualReview': False,
-            'MissingFields': []
-        }
+        return InvoiceRecord(
+            FileName=file_path.name,
+            FileType=file_path.suffix.lower(),
+            FilePath=str(moved_path),
+            OriginalPath=str(file_path),
+            ProcessedDateTime=self._now(),
+            Category='Non-Invoice',
+            ClaimNotes=reason,
+            ProcessingStatus='Non-Invoice',
+            FileHash=file_hash,
+            MovedTo=str(moved_path)
+        )
     
     def _create_success_entry(self, file_path: Path, file_hash: str, moved_path: Path,
                             extracted_data: Dict[str, Any], category: str,
                             deduction: Dict[str, Any], needs_manual_review: bool,
-                            missing_fields: List[str]) -> Dict[str, Any]:
+                            missing_fields: List[str]) -> InvoiceRecord:
         """Create entry for successfully processed file"""
-        return {
-            'FileName': file_path.name,
-            'FileType': file_path.suffix.lower(),
-            'FilePath': str(moved_path),
-            'OriginalPath': str(file_path),
-            'ProcessedDateTime': datetime.now(),
-            'VendorName': extracted_data.get('vendor_name', ''),
-            'VendorABN': extracted_data.get('vendor_abn', ''),
-            'InvoiceNumber': extracted_data.get('invoice_number', ''),
-            'InvoiceDate': extracted_data.get('invoice_date', ''),
-            'DueDate': extracted_data.get('due_date', ''),
-            'SubTotal': extracted_data.get('subtotal', 0.00),
-            'Tax': extracted_data.get('tax', 0.00),
-            'TotalAmount': extracted_data.get('total', 0.00),
-            'Currency': extracted_data.get('currency', 'AUD'),
-            'Category': category,
-            'WorkUsePercentage': deduction['WorkUsePercentage'],
-            'DeductibleAmount': deduction['DeductibleAmount'],
-            'ClaimMethod': deduction['ClaimMethod'],
-            'ClaimNotes': deduction['ClaimNotes'],
-            'AtoReference': deduction['AtoReference'],
-            'RequiresDocumentation': deduction['RequiresDocumentation'],
-            'ProcessingStatus': 'Success',
-            'FileHash': file_hash,
-            'MovedTo': str(moved_path),
-            'NeedsManualReview': needs_manual_review,
-            'MissingFields': missing_fields
-        }
+        return InvoiceRecord(
+            FileName=file_path.name,
+            FileType=file_path.suffix.lower(),
+            FilePath=str(moved_path),
+            OriginalPath=str(file_path),
+            ProcessedDateTime=self._now(),
+            Category=category,
+            ProcessingStatus='Success',
+            FileHash=file_hash,
+            MovedTo=str(moved_path),
+            NeedsManualReview=needs_manual_review,
+            MissingFields=missing_fields,
+            **self._copied_fields(extracted_data, deduction)
+        )
     
     def _create_failed_entry(self, file_path: Path, file_hash: str,
-                            error_reason: str, status: str) -> Dict[str, Any]:
+                            error_reason: str, status: str) -> InvoiceRecord:
         """Create failed entry placeholder"""
-        return {
-            'FileName': file_path.name,
-            'FileType': file_path.suffix.lower(),
-            'FilePath': str(file_path),
-            'OriginalPath': str(file_path),
-            'ProcessedDateTime': datetime.now(),
-            'VendorName': 'N/A',
-            'VendorABN': '',
-            'InvoiceNumber': '',
-            'InvoiceDate': '',
-            'DueDate': '',
-            'SubTotal': 0.00,
-            'Tax': 0.00,
-            'TotalAmount': 0.00,
-            'Currency': 'AUD',
-            'Category': 'Non-Invoice/Other',
-            'WorkUsePercentage': 0,
-            'DeductibleAmount': 0.00,
-            'ClaimMethod': 'Not Applicable',
-            'ClaimNotes': error_reason,
-            'AtoReference': 'N/A',
-            'RequiresDocumentation': ['Manual review required'],
-            'ProcessingStatus': status,
-            'FileHash': file_hash,
-            'MovedTo': 'N/A - Not moved',
-            'NeedsManualReview': True,
-            'MissingFields': []
-        }
+        return InvoiceRecord(
+            FileName=file_path.name,
+            FileType=file_path.suffix.lower(),
+            FilePath=str(file_path),
+            OriginalPath=str(file_path),
+            ProcessedDateTime=self._now(),
+            Category='Non-Invoice/Other',
+            ClaimNotes=error_reason,
+            RequiresDocumentation=['Manual review required'],
+            ProcessingStatus=status,
+            FileHash=file_hash,
+            MovedTo='N/A - Not moved',
+            NeedsManualReview=True
+        )
     
     def _is_non_invoice(self, extracted_data: Optional[Dict[str, Any]], text: str) -> tuple[bool, str]:
         """
@@ -536,7 +951,14 @@ class FileProcessor:
         if not extracted_data:
             if len(text.strip()) < 50:
                 return True, "Too little text content (likely logo/signature)"
-            return False, ""
+            
+            # Stop scanning as soon as enough invoice keywords have been seen
+            hits = 0
+            for _ in _INVOICE_SIGNAL.finditer(text):
+                hits += 1
+                if hits >= _MIN_INVOICE_SIGNALS:
+                    return False, ""
+            return True, "No invoice keywords in text (likely non-invoice document)"
         
         # Check for critical missing fields
         vendor = extracted_data.get('vendor_name', '').strip()
@@ -556,21 +978,17 @@ class FileProcessor:
             (needs_review, list_of_missing_fields)
         """
         missing_fields = []
+        needs_review = False
         
-        # Critical fields
-        if not extracted_data.get('vendor_name', '').strip():
-            missing_fields.append('Vendor Name')
-        
-        if not extracted_data.get('invoice_date', '').strip():
-            missing_fields.append('Invoice Date')
-        
-        if extracted_data.get('total', 0.0) == 0.0:
-            missing_fields.append('Total Amount')
-        
-        # Bonus field (not critical but noted)
-        if not extracted_data.get('invoice_number', '').strip():
-            missing_fields.append('Invoice Number (bonus)')
-        
-        needs_review = len([f for f in missing_fields if '(bonus)' not in f]) > 0
+        for key, label, critical in _FIELD_CHECKS:
+            value = extracted_data.get(key)
+            # Blank strings, missing values and a zero amount all count as missing
+            if isinstance(value, str):
+                missing = not value.strip()
+            else:
+                missing = value is None or value == 0
+            if missing:
+                missing_fields.append(label)
+                needs_review = needs_review or critical
         
         return needs_review, missing_fields
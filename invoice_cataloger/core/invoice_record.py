@@ -0,0 +1,51 @@
+"""
+Invoice Record - One row of the processed invoice catalog
+
+Slotted so a large run does not carry a per-file __dict__.
+"""
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+@dataclass(slots=True)
+class InvoiceRecord:
+    """Catalog entry produced by FileProcessor for each file"""
+    FileName: str = ''
+    FileType: str = ''
+    FilePath: str = ''
+    OriginalPath: str = ''
+    ProcessedDateTime: datetime = field(default_factory=datetime.now)
+    VendorName: str = 'N/A'
+    VendorABN: str = ''
+    InvoiceNumber: str = ''
+    InvoiceDate: str = ''
+    DueDate: str = ''
+    SubTotal: float = 0.00
+    Tax: float = 0.00
+    TotalAmount: float = 0.00
+    Currency: str = 'AUD'
+    Category: str = ''
+    WorkUsePercentage: int = 0
+    DeductibleAmount: float = 0.00
+    ClaimMethod: str = 'Not Applicable'
+    ClaimNotes: str = ''
+    AtoReference: str = 'N/A'
+    RequiresDocumentation: List[str] = field(default_factory=list)
+    ProcessingStatus: str = ''
+    FileHash: str = ''
+    MovedTo: str = ''
+    NeedsManualReview: bool = False
+    MissingFields: List[str] = field(default_factory=list)
+
+    # dict-style lookup, so exporters written against dict rows keep working
+    # (no __getitem__, so a record is never mistaken for a sequence)
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict copy in column order"""
+        return {name: getattr(self, name) for name in INVOICE_COLUMNS}
+
+
+INVOICE_COLUMNS = tuple(f.name for f in fields(InvoiceRecord))
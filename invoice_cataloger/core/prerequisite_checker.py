@@ -3,15 +3,31 @@ Prerequisite Checker - Validates system requirements and configuration
 
 Separated from main cataloger for single responsibility.
 """
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Dict, Optional, Set, Tuple
 
 from config import Config
 from utils import get_logger
-from extractors import PDFExtractor
+from extractors import PDFExtractor, DocumentExtractor
 from processors import LLMProcessor
 
 
+# How many invoice files to sample when deciding which extractors to check
+_FILE_TYPE_SAMPLE = 1000
+# PDFExtractor's dependency report covers the OCR engines images use as well
+_PDF_OCR_TYPES = frozenset({'.pdf', '.png', '.jpg', '.jpeg', '.gif'})
+_DOCUMENT_TYPES = frozenset({'.doc', '.docx', '.xls', '.xlsx'})
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_test_connection(provider: str, key: Tuple[Tuple[str, Any], ...]) -> Tuple[bool, str]:
+    """LLMProcessor.test_connection memoized on provider and its settings"""
+    return LLMProcessor.test_connection(provider, **dict(key))
+
+
 class PrerequisiteChecker:
     """Check if all prerequisites are met before processing"""
     
@@ -30,12 +46,26 @@ class PrerequisiteChecker:
         self.logger.info(f"Processing Financial Year: FY{self.config.financial_year}")
         self.logger.info(f"API Provider: {self.config.api_provider.upper()}")
         
-        # Run all checks
-        checks = [
-            self._check_financial_year(),
-            self._check_invoice_folder(),
-            self._check_output_folders(),
-            self._check_api_config(),
+        # Every folder below is named after the financial year, so stop here
+        if not self._check_financial_year():
+            return False
+        
+        # The API probe is the slow check and needs nothing from the local
+        # ones, so it runs in the background meanwhile. Its result lands in the
+        # connection cache and _check_api_connection reports it in order
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            provider = self.config.api_provider
+            settings = self._connection_settings(provider)
+            if settings is not None:
+                executor.submit(_cached_test_connection, provider, self._connection_key(settings))
+            
+            checks = [
+                self._check_invoice_folder(),
+                self._check_output_folders(),
+                self._check_api_config()
+            ]
+        
+        checks += [
             self._check_api_connection(),
             self._check_extraction_dependencies()
         ]
@@ -97,13 +127,49 @@ class PrerequisiteChecker:
             self.logger.error(f"Unknown API provider: {provider}")
             return False
     
+    @staticmethod
+    def invalidate_connection_cache():
+        """Forget earlier connection results so the next check probes again"""
+        _cached_test_connection.cache_clear()
+    
+    def _connection_settings(self, provider: str) -> Optional[Dict[str, Any]]:
+        """LLMProcessor.test_connection arguments for a provider, None if unknown"""
+        if provider == "lmstudio":
+            return {
+                'endpoint': self.config.lm_studio_endpoint,
+                'models_endpoint': self.config.lm_studio_models_endpoint
+            }
+        elif provider == "openai":
+            return {
+                'api_key': self.config.openai_api_key,
+                'model': self.config.openai_model,
+                'api_base': self.config.openai_api_base
+            }
+        elif provider == "openrouter":
+            return {
+                'api_key': self.config.openrouter_api_key,
+                'model': self.config.openrouter_model,
+                'api_base': self.config.openrouter_api_base,
+                'app_name': self.config.openrouter_app_name
+            }
+        return None
+    
+    @staticmethod
+    def _connection_key(settings: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+        """Hashable cache key for a set of connection settings"""
+        return tuple(sorted(settings.items()))
+    
+    def _test_connection(self, provider: str) -> Tuple[bool, str]:
+        """Probe the provider once per set of settings; failures are not remembered"""
+        settings = self._connection_settings(provider)
+        success, message = _cached_test_connection(provider, self._connection_key(settings))
+        if not success:
+            self.invalidate_connection_cache()
+        return success, message
+    
     def _test_lmstudio_connection(self) -> bool:
         """Test LM Studio connection"""
-        success, message = LLMProcessor.test_connection(
-            "lmstudio",
-            endpoint=self.config.lm_studio_endpoint,
-            models_endpoint=self.config.lm_studio_models_endpoint
-        )
+        success, message = self._test_connection("lmstudio")
         
         if not success:
             self.logger.error(message)
@@ -118,12 +184,7 @@ class PrerequisiteChecker:
     
     def _test_openai_connection(self) -> bool:
         """Test OpenAI connection"""
-        success, message = LLMProcessor.test_connection(
-            "openai",
-            api_key=self.config.openai_api_key,
-            model=self.config.openai_model,
-            api_base=self.config.openai_api_base
-        )
+        success, message = self._test_connection("openai")
         
         if not success:
             self.logger.error(message)
@@ -138,13 +199,7 @@ class PrerequisiteChecker:
     
     def _test_openrouter_connection(self) -> bool:
         """Test OpenRouter connection"""
-        success, message = LLMProcessor.test_connection(
-            "openrouter",
-            api_key=self.config.openrouter_api_key,
-            model=self.config.openrouter_model,
-            api_base=self.config.openrouter_api_base,
-            app_name=self.config.openrouter_app_name
-        )
+        success, message = self._test_connection("openrouter")
         
         if not success:
             self.logger.error(message)
@@ -165,18 +220,37 @@ class PrerequisiteChecker:
         else:
             self.logger.info("Using default optimized extraction prompt")
         
-        # Check PDF dependencies
-        pdf_ok, pdf_missing = PDFExtractor.check_dependencies()
-        if not pdf_ok:
-            self.logger.warning("Missing PDF dependencies:")
-            for dep in pdf_missing:
-                self.logger.warning(f"  - {dep}")
+        # Only check extractors for file types that are actually present
+        file_types = self._detect_file_types()
+        
+        if file_types & _PDF_OCR_TYPES:
+            # Check PDF and OCR dependencies
+            pdf_ok, pdf_missing = PDFExtractor.check_dependencies()
+            if not pdf_ok:
+                self.logger.warning("Missing PDF dependencies:")
+                for dep in pdf_missing:
+                    self.logger.warning(f"  - {dep}")
+            
+            # Show available extraction methods
+            self.logger.info("\nAvailable extraction methods:")
+            pdf_methods = PDFExtractor.get_available_methods()
+            for method, available in pdf_methods.items():
+                status = "✓" if available else "✗"
+                self.logger.info(f"  {status} {method}")
         
-        # Show available extraction methods
-        self.logger.info("\nAvailable extraction methods:")
-        pdf_methods = PDFExtractor.get_available_methods()
-        for method, available in pdf_methods.items():
-            status = "✓" if available else "✗"
-            self.logger.info(f"  {status} {method}")
+        if file_types & _DOCUMENT_TYPES:
+            self.logger.info("\nAvailable Word/Excel extraction methods:")
+            for method, available in DocumentExtractor.get_available_methods().items():
+                status = "✓" if available else "✗"
+                self.logger.info(f"  {status} {method}")
         
         return True  # Non-critical, so always return True
+    
+    def _detect_file_types(self) -> Set[str]:
+        """Extensions found among the first supported files in the invoice folder"""
+        extensions = self.config.file_extensions
+        files = (
+            path for path in self.config.invoice_folder.rglob('*')
+            if path.suffix.lower() in extensions and path.is_file()
+        )
+        return {path.suffix.lower() for path in itertools.islice(files, _FILE_TYPE_SAMPLE)}
@@ -1,5 +1,12 @@
 """Exporters package for Invoice Cataloger"""
-from .excel_exporter import ExcelExporter
 from .csv_exporter import CSVExporter
 
 __all__ = ['ExcelExporter', 'CSVExporter']
+
+
+def __getattr__(name):
+    # ExcelExporter pulls in xlsxwriter; load it only when Excel output is wanted
+    if name == 'ExcelExporter':
+        from .excel_exporter import ExcelExporter
+        return ExcelExporter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,9 +2,15 @@
 CSV Export for Invoice Catalog
 """
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
 import csv
+import io
+
+from .summary import aggregate_by_category
+
+# Buffer size for catalog writes
+_WRITE_BUFFER_SIZE = 1 << 20
 
 
 class CSVExporter:
@@ -51,99 +57,101 @@ class CSVExporter:
             'NeedsManualReview', 'MissingFields'
         ]
         
-        with open(catalog_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for inv in processed_invoices:
-                row = {
-                    'ProcessDate': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'ProcessingStatus': inv.get('ProcessingStatus', 'Unknown'),
-                    'FileName': inv.get('FileName', ''),
-                    'FileType': inv.get('FileType', ''),
-                    'FileHash': inv.get('FileHash', ''),
-                    'VendorName': inv.get('VendorName', ''),
-                    'VendorABN': inv.get('VendorABN', ''),
-                    'InvoiceNumber': inv.get('InvoiceNumber', ''),
-                    'InvoiceDate': inv.get('InvoiceDate', ''),
-                    'DueDate': inv.get('DueDate', ''),
-                    'Category': inv.get('Category', ''),
-                    'Currency': inv.get('Currency', 'AUD'),
-                    'SubTotal': inv.get('SubTotal', 0.00),
-                    'Tax': inv.get('Tax', 0.00),
-                    'InvoiceTotal': inv.get('TotalAmount', 0.00),
-                    'WorkUsePercentage': inv.get('WorkUsePercentage', 0),
-                    'DeductibleAmount': inv.get('DeductibleAmount', 0.00),
-                    'ClaimMethod': inv.get('ClaimMethod', ''),
-                    'ClaimNotes': inv.get('ClaimNotes', ''),
-                    'ATOReference': inv.get('AtoReference', ''),
-                    'RequiredDocumentation': '; '.join(inv.get('RequiresDocumentation', [])),
-                    'OriginalPath': inv.get('OriginalPath', inv.get('FilePath', '')),
-                    'MovedTo': inv.get('MovedTo', ''),
-                    'NeedsManualReview': 'Yes' if inv.get('NeedsManualReview', False) else 'No',
-                    'MissingFields': '; '.join(inv.get('MissingFields', []))
-                }
-                writer.writerow(row)
+        # One process date for the whole export, and a 1 MiB write buffer so
+        # rows reach the disk in large chunks
+        process_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        with open(catalog_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as raw, \
+                io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(self._iter_catalog_rows(processed_invoices, process_date))
         
         return catalog_path
     
+    @staticmethod
+    def _iter_catalog_rows(processed_invoices: List[Dict[str, Any]],
+                           process_date: str) -> Iterator[tuple]:
+        """Yield one catalog CSV row per invoice, in fieldnames order"""
+        join = '; '.join
+        for inv in processed_invoices:
+            get = inv.get
+            yield (
+                process_date,
+                get('ProcessingStatus', 'Unknown'),
+                get('FileName', ''),
+                get('FileType', ''),
+                get('FileHash', ''),
+                get('VendorName', ''),
+                get('VendorABN', ''),
+                get('InvoiceNumber', ''),
+                get('InvoiceDate', ''),
+                get('DueDate', ''),
+                get('Category', ''),
+                get('Currency', 'AUD'),
+                get('SubTotal', 0.00),
+                get('Tax', 0.00),
+                get('TotalAmount', 0.00),
+                get('WorkUsePercentage', 0),
+                get('DeductibleAmount', 0.00),
+                get('ClaimMethod', ''),
+                get('ClaimNotes', ''),
+                get('AtoReference', ''),
+                join(get('RequiresDocumentation') or ()),
+                get('OriginalPath', get('FilePath', '')),
+                get('MovedTo', ''),
+                'Yes' if get('NeedsManualReview', False) else 'No',
+                join(get('MissingFields') or ())
+            )
+    
     def _export_summary(self, processed_invoices: List[Dict[str, Any]], 
                        timestamp: str) -> Path:
         """Export summary CSV"""
         summary_path = self.output_folder / f"Deduction_Summary_{timestamp}.csv"
         
-        # Group by category
-        category_totals = {}
-        for inv in processed_invoices:
-            category = inv.get('Category', 'Other')
-            if category not in category_totals:
-                category_totals[category] = {
-                    'count': 0,
-                    'total_invoiced': 0.00,
-                    'total_deductible': 0.00
-                }
-            
-            category_totals[category]['count'] += 1
-            category_totals[category]['total_invoiced'] += float(inv.get('TotalAmount', 0))
-            category_totals[category]['total_deductible'] += float(inv.get('DeductibleAmount', 0))
-        
         # Write summary
         fieldnames = ['Category', 'InvoiceCount', 'TotalInvoiced', 'TotalDeductible', 'AverageDeduction']
         
         with open(summary_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            # Sort by total deductible
-            sorted_categories = sorted(
-                category_totals.items(),
-                key=lambda x: x[1]['total_deductible'],
-                reverse=True
-            )
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
             
-            for category, totals in sorted_categories:
-                avg_deduction = totals['total_deductible'] / totals['count'] if totals['count'] > 0 else 0
+            for category, count, total_invoiced, total_deductible in aggregate_by_category(processed_invoices):
+                avg_deduction = total_deductible / count if count > 0 else 0
                 
-                writer.writerow({
-                    'Category': category,
-                    'InvoiceCount': totals['count'],
-                    'TotalInvoiced': round(totals['total_invoiced'], 2),
-                    'TotalDeductible': round(totals['total_deductible'], 2),
-                    'AverageDeduction': round(avg_deduction, 2)
-                })
+                writer.writerow((
+                    category,
+                    count,
+                    round(total_invoiced, 2),
+                    round(total_deductible, 2),
+                    round(avg_deduction, 2)
+                ))
         
         return summary_path
     
     def _export_manual_review(self, processed_invoices: List[Dict[str, Any]], 
                               timestamp: str) -> Optional[Path]:
         """Export manual review required CSV"""
-        # Filter invoices needing manual review
-        manual_review_invoices = [
-            inv for inv in processed_invoices 
+        # Filter and build rows in one pass; peek at the first row so no file
+        # is created when nothing needs review
+        join = '; '.join
+        rows = (
+            (
+                inv.get('FileName', ''),
+                inv.get('VendorName', 'N/A'),
+                inv.get('InvoiceDate', ''),
+                inv.get('TotalAmount', 0.00),
+                inv.get('Category', ''),
+                join(inv.get('MissingFields') or ()),
+                inv.get('FilePath', ''),
+                inv.get('ProcessingStatus', 'Unknown')
+            )
+            for inv in processed_invoices
             if inv.get('NeedsManualReview', False)
-        ]
+        )
         
-        if not manual_review_invoices:
+        first_row = next(rows, None)
+        if first_row is None:
             return None
         
         manual_review_path = self.output_folder / f"Manual_Review_Required_{timestamp}.csv"
@@ -154,19 +162,9 @@ class CSVExporter:
         ]
         
         with open(manual_review_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for inv in manual_review_invoices:
-                writer.writerow({
-                    'FileName': inv.get('FileName', ''),
-                    'VendorName': inv.get('VendorName', 'N/A'),
-                    'InvoiceDate': inv.get('InvoiceDate', ''),
-                    'TotalAmount': inv.get('TotalAmount', 0.00),
-                    'Category': inv.get('Category', ''),
-                    'MissingFields': '; '.join(inv.get('MissingFields', [])),
-                    'FilePath': inv.get('FilePath', ''),
-                    'ProcessingStatus': inv.get('ProcessingStatus', 'Unknown')
-                })
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerow(first_row)
+            writer.writerows(rows)
         
         return manual_review_path
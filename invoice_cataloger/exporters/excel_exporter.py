@@ -2,9 +2,28 @@
 Excel Export with Formatting for Invoice Catalog
 """
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-import pandas as pd
+import math
+
+import xlsxwriter
+
+from .summary import DEFAULT_CATEGORY, totals_by_category
+
+
+def _money(value: Any) -> Optional[float]:
+    """Cell value for an amount; anything non-numeric is left blank"""
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(amount) else amount
+
+
+# Row highlight on the Invoices sheet, worked out once per invoice
+_ROW_PLAIN = 0
+_ROW_FAILED = 1
+_ROW_CACHED = 2
 
 
 class ExcelExporter:
@@ -29,115 +48,142 @@ class ExcelExporter:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         excel_path = self.output_folder / f"Invoice_Catalog_{timestamp}.xlsx"
         
-        # Create Excel writer
-        with pd.ExcelWriter(excel_path, engine='xlsxwriter') as writer:
-            workbook = writer.book
-            
-            # Define formats
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#D3D3D3',
-                'border': 1
-            })
+        # constant_memory flushes each row to disk once the next one starts, so
+        # every sheet is written strictly top to bottom
+        with xlsxwriter.Workbook(excel_path, {'constant_memory': True,
+                                              'strings_to_numbers': False}) as workbook:
+            # Define every format once, shared by all sheets
+            formats = {
+                'header': workbook.add_format({
+                    'bold': True,
+                    'bg_color': '#D3D3D3',
+                    'border': 1
+                }),
+                'currency': workbook.add_format({
+                    'num_format': '$#,##0.00'
+                }),
+                'title': workbook.add_format({
+                    'bold': True,
+                    'font_size': 14
+                }),
+                'failed': workbook.add_format({'bg_color': '#FFE4B5'}),  # Orange
+                'cached': workbook.add_format({'bg_color': '#ADD8E6'}),  # Light Blue
+            }
             
-            currency_format = workbook.add_format({
-                'num_format': '$#,##0.00'
-            })
+            # One pass over the invoices feeds all three sheets
+            summary, invoice_rows, failed_rows = self._partition_invoices(processed_invoices)
             
             # Create Summary Sheet
-            self._create_summary_sheet(writer, processed_invoices, config, 
-                                      header_format, currency_format)
+            self._create_summary_sheet(workbook, summary, config, formats)
             
             # Create Invoices Sheet
-            self._create_invoices_sheet(writer, processed_invoices, 
-                                       header_format, currency_format)
+            self._create_invoices_sheet(workbook, invoice_rows, formats)
             
             # Create Failed Files Sheet (if any)
-            failed_invoices = [inv for inv in processed_invoices 
-                             if inv.get('ProcessingStatus', '').startswith('Failed') 
-                             or inv.get('ProcessingStatus', '').startswith('Skipped')]
-            
-            if failed_invoices:
-                self._create_failed_sheet(writer, failed_invoices, header_format)
+            if failed_rows:
+                self._create_failed_sheet(workbook, failed_rows, formats)
         
         return excel_path
     
-    def _create_summary_sheet(self, writer, processed_invoices: List[Dict[str, Any]],
-                             config: Dict[str, Any], header_format, currency_format):
-        """Create summary sheet with totals by category"""
-        # Prepare summary data
-        df = pd.DataFrame(processed_invoices)
-        
-        # Group by category
-        summary = df.groupby('Category').agg({
-            'FileName': 'count',
-            'TotalAmount': 'sum',
-            'DeductibleAmount': 'sum'
-        }).reset_index()
-        
-        summary.columns = ['Category', 'Invoice Count', 'Total Invoiced', 'Total Deductible']
-        summary = summary.sort_values('Total Deductible', ascending=False)
+    @staticmethod
+    def _partition_invoices(processed_invoices: List[Dict[str, Any]]
+                            ) -> Tuple[List[Tuple], List[Tuple], List[Tuple]]:
+        """
+        Build the rows for every sheet in a single pass
         
-        # Add totals row
-        totals = pd.DataFrame([{
-            'Category': 'TOTAL',
-            'Invoice Count': summary['Invoice Count'].sum(),
-            'Total Invoiced': summary['Total Invoiced'].sum(),
-            'Total Deductible': summary['Total Deductible'].sum()
-        }])
+        Category ids and amounts are collected on the way and summed by
+        totals_by_category, the same grouping as the CSV summary.
         
-        summary = pd.concat([summary, totals], ignore_index=True)
+        Returns:
+            Tuple of (category summary rows, (row kind, invoice row) pairs,
+            failed file rows)
+        """
+        category_ids: Dict[str, int] = {}
+        ids, invoiced, deductibles = [], [], []
+        invoice_rows = []
+        failed_rows = []
         
-        # Write to Excel
-        summary.to_excel(writer, sheet_name='Summary', index=False, startrow=5)
+        for inv in processed_invoices:
+            inv_get = inv.get
+            status = inv_get('ProcessingStatus', 'Unknown')
+            category = inv_get('Category', '')
+            total = _money(inv_get('TotalAmount', 0.00))
+            deductible = _money(inv_get('DeductibleAmount', 0.00))
+            
+            ids.append(category_ids.setdefault(inv_get('Category', DEFAULT_CATEGORY),
+                                               len(category_ids)))
+            invoiced.append(total or 0.00)
+            deductibles.append(deductible or 0.00)
+            
+            if 'Failed' in status or 'Skipped' in status:
+                row_kind = _ROW_FAILED
+            elif 'Cached' in status:
+                row_kind = _ROW_CACHED
+            else:
+                row_kind = _ROW_PLAIN
+            
+            invoice_rows.append((row_kind, (
+                status,
+                inv_get('FileName', ''),
+                inv_get('InvoiceDate', ''),
+                inv_get('VendorName', ''),
+                category,
+                total,
+                deductible,
+                inv_get('ClaimMethod', ''),
+                inv_get('MovedTo', '')
+            )))
+            
+            if status.startswith(('Failed', 'Skipped')):
+                failed_rows.append((
+                    status,
+                    inv_get('FileName', ''),
+                    category,
+                    inv_get('ClaimNotes', ''),
+                    inv_get('FileHash', ''),
+                    inv_get('OriginalPath', inv_get('FilePath', ''))
+                ))
+        
+        summary = totals_by_category(category_ids, ids, invoiced, deductibles)
+        return summary, invoice_rows, failed_rows
+    
+    def _create_summary_sheet(self, workbook, summary: List[Tuple],
+                             config: Dict[str, Any], formats: Dict[str, Any]):
+        """Create summary sheet with totals by category"""
+        worksheet = workbook.add_worksheet('Summary')
         
-        # Get worksheet
-        worksheet = writer.sheets['Summary']
+        # Format columns
+        worksheet.set_column('A:A', 30)
+        worksheet.set_column('B:B', 15)
+        worksheet.set_column('C:D', 18, formats['currency'])
         
         # Add title and config info
-        title_format = writer.book.add_format({
-            'bold': True,
-            'font_size': 14
-        })
-        
-        worksheet.write('A1', 'ATO WORK EXPENSE DEDUCTION SUMMARY', title_format)
+        worksheet.write('A1', 'ATO WORK EXPENSE DEDUCTION SUMMARY', formats['title'])
         worksheet.write('A3', f"Employee: {config.get('occupation', 'N/A')}")
         worksheet.write('B3', f"Work Days WFH: {config.get('work_from_home_days', 0)}/{config.get('total_work_days', 0)}")
         worksheet.write('A4', f"Financial Year: {config.get('financial_year', 'N/A')}")
         worksheet.write('B4', f"Work Use %: {config.get('work_use_percentage', 0)}%")
         
-        # Format columns
-        worksheet.set_column('A:A', 30)
-        worksheet.set_column('B:B', 15)
-        worksheet.set_column('C:D', 18, currency_format)
-        
-        # Apply header format
-        for col_num, value in enumerate(summary.columns.values):
-            worksheet.write(5, col_num, value, header_format)
+        # Header, one row per category, then the totals row
+        worksheet.write_row(5, 0, (
+            'Category', 'Invoice Count', 'Total Invoiced', 'Total Deductible'
+        ), formats['header'])
+        
+        total_count, total_invoiced, total_deductible = 0, 0.00, 0.00
+        for row_num, row in enumerate(summary, start=6):
+            worksheet.write_row(row_num, 0, row)
+            total_count += row[1]
+            total_invoiced += row[2]
+            total_deductible += row[3]
+        
+        worksheet.write_row(6 + len(summary), 0, (
+            'TOTAL', total_count, total_invoiced, total_deductible
+        ))
     
-    def _create_invoices_sheet(self, writer, processed_invoices: List[Dict[str, Any]],
-                               header_format, currency_format):
+    def _create_invoices_sheet(self, workbook, invoice_rows: List[Tuple],
+                               formats: Dict[str, Any]):
         """Create detailed invoices sheet"""
-        # Prepare data
-        invoices_data = []
-        for inv in processed_invoices:
-            invoices_data.append({
-                'Status': inv.get('ProcessingStatus', 'Unknown'),
-                'File': inv.get('FileName', ''),
-                'Date': inv.get('InvoiceDate', ''),
-                'Vendor': inv.get('VendorName', ''),
-                'Category': inv.get('Category', ''),
-                'Amount': inv.get('TotalAmount', 0.00),
-                'Deductible': inv.get('DeductibleAmount', 0.00),
-                'Method': inv.get('ClaimMethod', ''),
-                'Moved To': inv.get('MovedTo', '')
-            })
-        
-        df = pd.DataFrame(invoices_data)
-        df.to_excel(writer, sheet_name='Invoices', index=False)
-        
-        # Get worksheet
-        worksheet = writer.sheets['Invoices']
+        worksheet = workbook.add_worksheet('Invoices')
         
         # Format columns
         worksheet.set_column('A:A', 15)  # Status
@@ -145,46 +191,33 @@ class ExcelExporter:
         worksheet.set_column('C:C', 12)  # Date
         worksheet.set_column('D:D', 25)  # Vendor
         worksheet.set_column('E:E', 25)  # Category
-        worksheet.set_column('F:F', 12, currency_format)  # Amount
-        worksheet.set_column('G:G', 12, currency_format)  # Deductible
+        worksheet.set_column('F:F', 12, formats['currency'])  # Amount
+        worksheet.set_column('G:G', 12, formats['currency'])  # Deductible
         worksheet.set_column('H:H', 35)  # Method
         worksheet.set_column('I:I', 50)  # Moved To
         
-        # Apply header format
-        for col_num, value in enumerate(df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
+        worksheet.write_row(0, 0, (
+            'Status', 'File', 'Date', 'Vendor', 'Category',
+            'Amount', 'Deductible', 'Method', 'Moved To'
+        ), formats['header'])
         
-        # Color code rows based on status
-        failed_format = writer.book.add_format({'bg_color': '#FFE4B5'})  # Orange
-        cached_format = writer.book.add_format({'bg_color': '#ADD8E6'})  # Light Blue
+        # Color code rows based on status. The row format has to be set before
+        # the row is written, as constant_memory has flushed it by the next row
+        failed_format = formats['failed']
+        cached_format = formats['cached']
         
-        for row_num, inv in enumerate(processed_invoices, start=1):
-            status = inv.get('ProcessingStatus', '')
-            if 'Failed' in status or 'Skipped' in status:
+        for row_num, (row_kind, row) in enumerate(invoice_rows, start=1):
+            if row_kind == _ROW_FAILED:
                 worksheet.set_row(row_num, None, failed_format)
-            elif 'Cached' in status:
+            elif row_kind == _ROW_CACHED:
                 worksheet.set_row(row_num, None, cached_format)
+            
+            worksheet.write_row(row_num, 0, row)
     
-    def _create_failed_sheet(self, writer, failed_invoices: List[Dict[str, Any]],
-                            header_format):
+    def _create_failed_sheet(self, workbook, failed_rows: List[Tuple],
+                            formats: Dict[str, Any]):
         """Create failed files sheet"""
-        # Prepare data
-        failed_data = []
-        for inv in failed_invoices:
-            failed_data.append({
-                'Status': inv.get('ProcessingStatus', 'Unknown'),
-                'File': inv.get('FileName', ''),
-                'Category': inv.get('Category', ''),
-                'Error/Reason': inv.get('ClaimNotes', ''),
-                'File Hash': inv.get('FileHash', ''),
-                'Original Path': inv.get('OriginalPath', inv.get('FilePath', ''))
-            })
-        
-        df = pd.DataFrame(failed_data)
-        df.to_excel(writer, sheet_name='Failed Files', index=False)
-        
-        # Get worksheet
-        worksheet = writer.sheets['Failed Files']
+        worksheet = workbook.add_worksheet('Failed Files')
         
         # Format columns
         worksheet.set_column('A:A', 15)  # Status
@@ -194,6 +227,9 @@ class ExcelExporter:
         worksheet.set_column('E:E', 35)  # File Hash
         worksheet.set_column('F:F', 60)  # Original Path
         
-        # Apply header format
-        for col_num, value in enumerate(df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
+        worksheet.write_row(0, 0, (
+            'Status', 'File', 'Category', 'Error/Reason', 'File Hash', 'Original Path'
+        ), formats['header'])
+        
+        for row_num, row in enumerate(failed_rows, start=1):
+            worksheet.write_row(row_num, 0, row)
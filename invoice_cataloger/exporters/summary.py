@@ -0,0 +1,93 @@
+"""
+Category Totals shared by the CSV and Excel summaries
+"""
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Category that invoices without one are totalled under
+DEFAULT_CATEGORY = 'Other'
+
+
+def _amount(value: Any) -> float:
+    """Amount as a float; anything non-numeric counts as zero"""
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return 0.00
+    return 0.00 if math.isnan(amount) else amount
+
+
+def aggregate_by_category(processed_invoices: List[Dict[str, Any]]) -> List[Tuple[str, int, float, float]]:
+    """
+    Total invoices per category
+
+    Categories are mapped to integer ids and the amounts packed into NumPy
+    arrays, so the per-category sums are a bincount rather than Python adds.
+
+    Args:
+        processed_invoices: List of processed invoice data
+
+    Returns:
+        (category, count, total_invoiced, total_deductible) tuples, largest
+        deductible total first
+    """
+    category_ids: Dict[str, int] = {}
+    ids = np.fromiter(
+        (category_ids.setdefault(inv.get('Category', DEFAULT_CATEGORY), len(category_ids))
+         for inv in processed_invoices),
+        dtype=np.intp, count=len(processed_invoices)
+    )
+    invoiced = np.fromiter(
+        (_amount(inv.get('TotalAmount', 0)) for inv in processed_invoices),
+        dtype=np.float64, count=len(processed_invoices)
+    )
+    deductible = np.fromiter(
+        (_amount(inv.get('DeductibleAmount', 0)) for inv in processed_invoices),
+        dtype=np.float64, count=len(processed_invoices)
+    )
+    return totals_by_category(category_ids, ids, invoiced, deductible)
+
+
+def totals_by_category(category_ids: Dict[str, int], ids: Sequence[int],
+                       invoiced: Sequence[float], deductible: Sequence[float]
+                       ) -> List[Tuple[str, int, float, float]]:
+    """
+    Sum per-invoice amounts by category id with bincount
+
+    For callers that already walk the invoices (the Excel export) and
+    collect the ids and amounts on the way.
+
+    Args:
+        category_ids: {category: id}, ids numbered from 0
+        ids: Category id of each invoice
+        invoiced: Invoiced amount of each invoice
+        deductible: Deductible amount of each invoice
+
+    Returns:
+        Rows as from aggregate_by_category
+    """
+    size = len(category_ids)
+    ids = np.asarray(ids, dtype=np.intp)
+    counts = np.bincount(ids, minlength=size).tolist()
+    invoiced_totals = np.bincount(ids, weights=np.asarray(invoiced, dtype=np.float64),
+                                  minlength=size).tolist()
+    deductible_totals = np.bincount(ids, weights=np.asarray(deductible, dtype=np.float64),
+                                    minlength=size).tolist()
+
+    totals = {
+        category: [counts[i], invoiced_totals[i], deductible_totals[i]]
+        for category, i in category_ids.items()
+    }
+    return category_rows(totals)
+
+
+def category_rows(totals: Dict[str, List]) -> List[Tuple[str, int, float, float]]:
+    """Turn {category: [count, invoiced, deductible]} into rows, largest deductible first"""
+    return sorted(
+        ((category, count, invoiced, deductible)
+         for category, (count, invoiced, deductible) in totals.items()),
+        key=lambda row: row[3],
+        reverse=True
+    )
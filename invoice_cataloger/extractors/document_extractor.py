@@ -1,8 +1,12 @@
 """
 Document Text Extraction for Word and Excel files
 """
+import multiprocessing.util
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
     from docx import Document
@@ -17,6 +21,7 @@ except ImportError:
     OPENPYXL_AVAILABLE = False
 
 try:
+    import pythoncom
     import win32com.client
     WIN32COM_AVAILABLE = True
 except ImportError:
@@ -26,6 +31,20 @@ except ImportError:
 class DocumentExtractor:
     """Extract text from Word and Excel documents"""
     
+    # Office applications are started once and reused for every file. COM
+    # needs CoInitialize on the calling thread and its objects belong to the
+    # thread that created them, so every COM call runs on one worker thread
+    # (see run_com); _com_apps is only touched there
+    _com_apps: Dict[str, Any] = {}
+    _com_jobs: "queue.SimpleQueue" = queue.SimpleQueue()
+    _com_thread: Optional[threading.Thread] = None
+    _com_lock = threading.Lock()
+    
+    # Invoices sit near the top of a sheet and the LLM prompt is truncated
+    # anyway, so stop reading huge workbooks early
+    MAX_ROWS_PER_SHEET = 2000
+    MAX_TEXT_CHARS = 50_000
+    
     def extract_from_word(self, doc_path: Path) -> Tuple[Optional[str], str]:
         """
         Extract text from Word document (.doc, .docx)
@@ -46,7 +65,7 @@ class DocumentExtractor:
         
         # Fallback to COM (Windows only, works for both .doc and .docx)
         if WIN32COM_AVAILABLE:
-            text, success = self._extract_word_with_com(doc_path)
+            text, success = self.run_com(self._extract_word_with_com, doc_path)
             if success:
                 return text, "Word COM"
         
@@ -72,23 +91,62 @@ class DocumentExtractor:
         
         # Fallback to COM (Windows only, works for both .xls and .xlsx)
         if WIN32COM_AVAILABLE:
-            text, success = self._extract_excel_with_com(excel_path)
+            text, success = self.run_com(self._extract_excel_with_com, excel_path)
             if success:
                 return text, "Excel COM"
         
         return None, "No Excel extraction method available"
     
+    def extract_batch(self, paths: List[Path], kind: str) -> Dict[Path, Tuple[Optional[str], str]]:
+        """
+        Extract several Word ("word") or Excel ("excel") files at once
+        
+        .docx/.xlsx files are read with python-docx/openpyxl on a small thread
+        pool so their disk reads overlap. Everything else - legacy .doc/.xls
+        and files the library could not read - then goes through the normal
+        extract_from_word/extract_from_excel chain one at a time, since the
+        COM fallback runs on a single thread anyway.
+        
+        Returns:
+            {path: (extracted_text, method_used)} for every path
+        """
+        if kind == "word":
+            native_suffix, native_available = '.docx', DOCX_AVAILABLE
+            native, native_method = self._extract_docx_with_python_docx, "python-docx"
+            extract = self.extract_from_word
+        else:
+            native_suffix, native_available = '.xlsx', OPENPYXL_AVAILABLE
+            native, native_method = self._extract_xlsx_with_openpyxl, "openpyxl"
+            extract = self.extract_from_excel
+        
+        paths = [Path(path) for path in paths]
+        results: Dict[Path, Tuple[Optional[str], str]] = {}
+        
+        pooled = [path for path in paths if path.suffix.lower() == native_suffix] if native_available else []
+        if pooled:
+            with ThreadPoolExecutor(max_workers=min(8, len(pooled))) as pool:
+                for path, (text, success) in zip(pooled, pool.map(native, pooled)):
+                    if success:
+                        results[path] = (text, native_method)
+        
+        for path in paths:
+            if path not in results:
+                results[path] = extract(path)
+        
+        return results
+    
     def _extract_docx_with_python_docx(self, doc_path: Path) -> Tuple[Optional[str], bool]:
         """Extract text from .docx using python-docx"""
         try:
             doc = Document(doc_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+            parts = [paragraph.text for paragraph in doc.paragraphs]
             
             # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += "\n" + cell.text
+            parts.extend(cell.text
+                         for table in doc.tables
+                         for row in table.rows
+                         for cell in row.cells)
+            text = "\n".join(parts)
             
             if text and len(text.strip()) > 10:
                 return text, True
@@ -100,36 +158,40 @@ class DocumentExtractor:
     def _extract_word_with_com(self, doc_path: Path) -> Tuple[Optional[str], bool]:
         """Extract text from Word document using COM"""
         try:
-            word = win32com.client.Dispatch("Word.Application")
-            word.Visible = False
-            word.DisplayAlerts = 0
+            word = self._get_com_app("Word.Application", display_alerts=0)
             
             doc = word.Documents.Open(str(doc_path.absolute()), ReadOnly=True)
             text = doc.Content.Text
             
             doc.Close(False)
-            word.Quit()
             
             if text and len(text.strip()) > 10:
                 return text, True
             
             return None, False
         except Exception:
+            # The application may have been closed or hung; start a new one next time
+            self._drop_com_app("Word.Application")
             return None, False
     
     def _extract_xlsx_with_openpyxl(self, excel_path: Path) -> Tuple[Optional[str], bool]:
         """Extract text from .xlsx using openpyxl"""
         try:
             workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
-            text = ""
+            lines = []
+            length = 0
             
             for sheet in workbook.worksheets:
-                for row in sheet.iter_rows(values_only=True):
-                    row_text = " ".join([str(cell) if cell is not None else "" for cell in row])
+                if length > self.MAX_TEXT_CHARS:
+                    break
+                for row in sheet.iter_rows(max_row=self.MAX_ROWS_PER_SHEET, values_only=True):
+                    row_text = " ".join(str(cell) for cell in row if cell is not None)
                     if row_text.strip():
-                        text += row_text + "\n"
+                        lines.append(row_text)
+                        length += len(row_text) + 1
             
             workbook.close()
+            text = "\n".join(lines)
             
             if text and len(text.strip()) > 10:
                 return text, True
@@ -141,32 +203,90 @@ class DocumentExtractor:
     def _extract_excel_with_com(self, excel_path: Path) -> Tuple[Optional[str], bool]:
         """Extract text from Excel document using COM"""
         try:
-            excel = win32com.client.Dispatch("Excel.Application")
-            excel.Visible = False
-            excel.DisplayAlerts = False
+            excel = self._get_com_app("Excel.Application", display_alerts=False)
             
             workbook = excel.Workbooks.Open(str(excel_path.absolute()), ReadOnly=True)
-            text = ""
+            lines = []
             
             for worksheet in workbook.Worksheets:
                 used_range = worksheet.UsedRange
                 if used_range:
                     for row in used_range.Rows:
-                        for cell in row.Cells:
-                            if cell.Text:
-                                text += str(cell.Text) + " "
-                        text += "\n"
+                        lines.append(" ".join(str(cell.Text) for cell in row.Cells if cell.Text))
             
             workbook.Close(False)
-            excel.Quit()
+            text = "\n".join(lines)
             
             if text and len(text.strip()) > 10:
                 return text, True
             
             return None, False
         except Exception:
+            self._drop_com_app("Excel.Application")
             return None, False
     
+    @classmethod
+    def run_com(cls, func: Callable, *args) -> Any:
+        """Run func(*args) on the COM thread, starting it on first use"""
+        with cls._com_lock:
+            if cls._com_thread is None:
+                # Daemon, so it is still alive for the exit-time shutdown_com
+                cls._com_thread = threading.Thread(target=cls._run_com_jobs,
+                                                   name="com-worker", daemon=True)
+                cls._com_thread.start()
+        future = Future()
+        cls._com_jobs.put((future, func, args))
+        return future.result()
+    
+    @classmethod
+    def _run_com_jobs(cls):
+        """COM thread main loop"""
+        pythoncom.CoInitialize()
+        try:
+            while True:
+                future, func, args = cls._com_jobs.get()
+                try:
+                    future.set_result(func(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            pythoncom.CoUninitialize()
+    
+    @classmethod
+    def _get_com_app(cls, prog_id: str, display_alerts: Any) -> Any:
+        """The hidden Office application, started on first use (COM thread only)"""
+        app = cls._com_apps.get(prog_id)
+        if app is None:
+            app = win32com.client.Dispatch(prog_id)
+            app.Visible = False
+            app.DisplayAlerts = display_alerts
+            cls._com_apps[prog_id] = app
+        return app
+    
+    @classmethod
+    def _drop_com_app(cls, prog_id: str):
+        """Quit and forget an application (COM thread only)"""
+        app = cls._com_apps.pop(prog_id, None)
+        if app is None:
+            return
+        try:
+            app.Quit()
+        except Exception:
+            pass
+    
+    @classmethod
+    def _quit_com_apps(cls):
+        """Quit every application (COM thread only)"""
+        for prog_id in list(cls._com_apps):
+            cls._drop_com_app(prog_id)
+    
+    @classmethod
+    def shutdown_com(cls):
+        """Quit every Office application started by this process"""
+        if cls._com_thread is not None:
+            # Quit from the thread that created them
+            cls.run_com(cls._quit_com_apps)
+    
     @staticmethod
     def get_available_methods() -> dict:
         """Get information about available extraction methods"""
@@ -175,3 +295,9 @@ class DocumentExtractor:
             'openpyxl': OPENPYXL_AVAILABLE,
             'Win32COM': WIN32COM_AVAILABLE,
         }
+
+
+# multiprocessing runs these finalizers at exit in the main process and in
+# pool workers alike (plain atexit handlers are skipped in workers)
+if WIN32COM_AVAILABLE:
+    multiprocessing.util.Finalize(None, DocumentExtractor.shutdown_com, exitpriority=0)
@@ -6,6 +6,8 @@ from typing import Optional, Tuple
 import email
 from email import policy
 
+from .document_extractor import DocumentExtractor
+
 try:
     import extract_msg
     EXTRACT_MSG_AVAILABLE = True
@@ -37,46 +39,66 @@ class EmailExtractor:
         try:
             with open(eml_path, 'rb') as f:
                 msg = email.message_from_binary_file(f, policy=policy.default)
-            
-            text = ""
-            
+        except Exception as e:
+            return None, f"Error: {str(e)}"
+        
+        return self._extract_from_message(msg)
+    
+    def extract_from_eml_bytes(self, data: bytes) -> Tuple[Optional[str], str]:
+        """
+        Extract text from .eml content already read into memory
+        
+        Returns:
+            Tuple[Optional[str], str]: (extracted_text, method_used)
+        """
+        try:
+            msg = email.message_from_bytes(data, policy=policy.default)
+        except Exception as e:
+            return None, f"Error: {str(e)}"
+        
+        return self._extract_from_message(msg)
+    
+    def _extract_from_message(self, msg) -> Tuple[Optional[str], str]:
+        """Build the text for a parsed email message"""
+        try:
             # Extract headers
-            text += f"From: {msg.get('From', 'Unknown')}\n"
-            text += f"To: {msg.get('To', 'Unknown')}\n"
-            text += f"Subject: {msg.get('Subject', 'No Subject')}\n"
-            text += f"Date: {msg.get('Date', 'Unknown')}\n\n"
-            
-            # Extract body
-            if msg.is_multipart():
-                for part in msg.walk():
-                    content_type = part.get_content_type()
-                    if content_type == 'text/plain':
-                        body = part.get_payload(decode=True)
-                        if body:
-                            text += body.decode('utf-8', errors='ignore')
-                    elif content_type == 'text/html':
-                        # Fallback to HTML if no plain text
-                        if 'text/plain' not in text:
-                            body = part.get_payload(decode=True)
-                            if body:
-                                text += body.decode('utf-8', errors='ignore')
-            else:
-                body = msg.get_payload(decode=True)
-                if body:
-                    text += body.decode('utf-8', errors='ignore')
-            
-            # List attachments
+            parts = [
+                f"From: {msg.get('From', 'Unknown')}\n",
+                f"To: {msg.get('To', 'Unknown')}\n",
+                f"Subject: {msg.get('Subject', 'No Subject')}\n",
+                f"Date: {msg.get('Date', 'Unknown')}\n\n",
+            ]
+            
+            # One walk finds the body and lists attachments. Only the first
+            # plain text part is decoded; HTML is the fallback when there is none
+            plain_part = html_part = None
             attachments = []
             for part in msg.walk():
+                if part.is_multipart():
+                    continue
                 if part.get_content_disposition() == 'attachment':
                     filename = part.get_filename()
                     if filename:
                         attachments.append(filename)
+                    continue
+                if plain_part is not None:
+                    # Body found; the rest of the walk only collects attachment names
+                    continue
+                content_type = part.get_content_type()
+                if content_type == 'text/plain':
+                    plain_part = part
+                elif content_type == 'text/html' and html_part is None:
+                    html_part = part
+            
+            body_part = plain_part if plain_part is not None else html_part
+            if body_part is not None:
+                parts.append(self._decode_part(body_part))
             
             if attachments:
-                text += f"\n\nAttachments:\n"
-                for attachment in attachments:
-                    text += f"- {attachment}\n"
+                parts.append("\n\nAttachments:\n")
+                parts.extend(f"- {attachment}\n" for attachment in attachments)
+            
+            text = "".join(parts)
             
             if text and len(text.strip()) > 20:
                 return text, "Python email library"
@@ -85,6 +107,18 @@ class EmailExtractor:
         except Exception as e:
             return None, f"Error: {str(e)}"
     
+    @staticmethod
+    def _decode_part(part) -> str:
+        """Decode a body part with its declared charset (UTF-8 if none or unknown)"""
+        body = part.get_payload(decode=True)
+        if not body:
+            return ""
+        charset = part.get_content_charset() or 'utf-8'
+        try:
+            return body.decode(charset, errors='replace')
+        except LookupError:
+            return body.decode('utf-8', errors='replace')
+    
     def extract_from_msg(self, msg_path: Path) -> Tuple[Optional[str], str]:
         """
         Extract text from .msg file (Outlook)
@@ -105,7 +139,7 @@ class EmailExtractor:
         
         # Fallback to COM (Windows only)
         if WIN32COM_AVAILABLE:
-            text, success = self._extract_msg_with_com(msg_path)
+            text, success = DocumentExtractor.run_com(self._extract_msg_with_com, msg_path)
             if success:
                 return text, "Outlook COM"
         
@@ -116,20 +150,22 @@ class EmailExtractor:
         try:
             msg = extract_msg.Message(msg_path)
             
-            text = ""
-            text += f"From: {msg.sender or 'Unknown'}\n"
-            text += f"To: {msg.to or 'Unknown'}\n"
-            text += f"Subject: {msg.subject or 'No Subject'}\n"
-            text += f"Date: {msg.date or 'Unknown'}\n\n"
-            text += msg.body or ""
+            parts = [
+                f"From: {msg.sender or 'Unknown'}\n",
+                f"To: {msg.to or 'Unknown'}\n",
+                f"Subject: {msg.subject or 'No Subject'}\n",
+                f"Date: {msg.date or 'Unknown'}\n\n",
+                msg.body or "",
+            ]
             
             # List attachments
             if msg.attachments:
-                text += f"\n\nAttachments:\n"
-                for attachment in msg.attachments:
-                    text += f"- {attachment.longFilename or attachment.shortFilename}\n"
+                parts.append("\n\nAttachments:\n")
+                parts.extend(f"- {attachment.longFilename or attachment.shortFilename}\n"
+                             for attachment in msg.attachments)
             
             msg.close()
+            text = "".join(parts)
             
             if text and len(text.strip()) > 20:
                 return text, True
@@ -139,23 +175,25 @@ class EmailExtractor:
             return None, False
     
     def _extract_msg_with_com(self, msg_path: Path) -> Tuple[Optional[str], bool]:
-        """Extract text from .msg using Outlook COM"""
+        """Extract text from .msg using Outlook COM (runs on the COM thread)"""
         try:
             outlook = win32com.client.Dispatch("Outlook.Application")
             msg = outlook.Session.OpenSharedItem(str(msg_path.absolute()))
             
-            text = ""
-            text += f"From: {msg.SenderName} <{msg.SenderEmailAddress}>\n"
-            text += f"To: {msg.To}\n"
-            text += f"Subject: {msg.Subject}\n"
-            text += f"Date: {msg.ReceivedTime}\n\n"
-            text += msg.Body
+            parts = [
+                f"From: {msg.SenderName} <{msg.SenderEmailAddress}>\n",
+                f"To: {msg.To}\n",
+                f"Subject: {msg.Subject}\n",
+                f"Date: {msg.ReceivedTime}\n\n",
+                msg.Body,
+            ]
             
             # List attachments
             if msg.Attachments.Count > 0:
-                text += f"\n\nAttachments:\n"
-                for attachment in msg.Attachments:
-                    text += f"- {attachment.FileName}\n"
+                parts.append("\n\nAttachments:\n")
+                parts.extend(f"- {attachment.FileName}\n" for attachment in msg.Attachments)
+            
+            text = "".join(parts)
             
             if text and len(text.strip()) > 20:
                 return text, True
@@ -1,8 +1,10 @@
 """
 Image Text Extraction using OCR
 """
+import importlib.util
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
+import numpy as np
 from PIL import Image
 import io
 
@@ -12,27 +14,31 @@ try:
 except ImportError:
     PYTESSERACT_AVAILABLE = False
 
-try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
-except ImportError:
-    EASYOCR_AVAILABLE = False
+# EasyOCR (which pulls in torch) and OpenCV are slow to import, so only
+# their presence is checked here; they are imported when first used
+EASYOCR_AVAILABLE = importlib.util.find_spec("easyocr") is not None
+CV2_AVAILABLE = importlib.util.find_spec("cv2") is not None
 
-try:
-    import cv2
-    import numpy as np
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
+from .ocr_engine import TESSEROCR_AVAILABLE, get_easyocr_service, tesseract_ocr
 
 
 class ImageExtractor:
     """Extract text from images using OCR"""
     
-    def __init__(self, tesseract_path: Optional[str] = None, ocr_languages: list = None):
+    # Grayscale scans whose Laplacian variance is below this are clean enough
+    # that Otsu thresholding alone suffices, so the slow denoise is skipped
+    DENOISE_MIN_LAPLACIAN_VAR = 500.0
+    
+    # Older versions saved the preprocessed image next to the original under
+    # this prefix and never removed it; folder scans skip these leftovers
+    LEGACY_TEMP_PREFIX = "temp_preprocessed_"
+    
+    def __init__(self, tesseract_path: Optional[str] = None, ocr_languages: list = None,
+                 ocr_device: str = "auto"):
         self.tesseract_path = tesseract_path
-        self.ocr_languages = ocr_languages or ['en']
-        self.easyocr_reader = None
+        self.ocr_languages = list(ocr_languages) if ocr_languages else ['en']
+        self.ocr_device = ocr_device  # "auto", "cpu", "cuda" or "mps"; see ocr_engine.resolve_ocr_device
+        self.easyocr_service = None
         
         # Configure Tesseract path if provided
         if tesseract_path and PYTESSERACT_AVAILABLE:
@@ -50,29 +56,37 @@ class ImageExtractor:
         if not image_path.exists():
             return None, "File not found"
         
-        # Try to preprocess image for better OCR
-        preprocessed_image = self._preprocess_image(image_path)
-        
         # Stage 1: EasyOCR (deep learning, better accuracy)
         if EASYOCR_AVAILABLE:
             text, success = self._extract_with_easyocr(image_path)
             if success:
                 return text, "EasyOCR"
         
-        # Stage 2: Tesseract OCR
-        if PYTESSERACT_AVAILABLE:
-            text, success = self._extract_with_tesseract(preprocessed_image or image_path)
+        # Stage 2: Tesseract OCR, on a preprocessed copy when OpenCV is available
+        if TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE:
+            preprocessed_image = self._preprocess_image(image_path)
+            if preprocessed_image is None:
+                preprocessed_image = image_path
+            text, success = self._extract_with_tesseract(preprocessed_image)
             if success:
                 return text, "Tesseract OCR"
         
         return None, "No OCR engine available"
     
-    def _preprocess_image(self, image_path: Path) -> Optional[Path]:
-        """Preprocess image for better OCR results"""
+    def _preprocess_image(self, image_path: Path) -> Optional["np.ndarray"]:
+        """
+        Preprocess image for better OCR results
+        
+        Returns:
+            The binarised image as an array (kept in memory, never written
+            to disk), or None if OpenCV is unavailable or the image unreadable
+        """
         if not CV2_AVAILABLE:
             return None
         
         try:
+            import cv2
+            
             # Read image
             img = cv2.imread(str(image_path))
             
@@ -82,26 +96,28 @@ class ImageExtractor:
             # Apply thresholding to get binary image
             _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
             
-            # Denoise
-            denoised = cv2.fastNlMeansDenoising(binary, None, 10, 7, 21)
-            
-            # Save preprocessed image
-            temp_path = image_path.parent / f"temp_preprocessed_{image_path.name}"
-            cv2.imwrite(str(temp_path), denoised)
-            
-            return temp_path
+            # Denoise, unless the scan is already clean. A float32 Laplacian and
+            # meanStdDev keep the noise check to one half-size buffer, where
+            # float64 plus ndarray.var() allocated several full-page temporaries
+            _, stddev = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_32F))
+            if stddev[0][0] ** 2 < self.DENOISE_MIN_LAPLACIAN_VAR:
+                return binary
+            return cv2.fastNlMeansDenoising(binary, None, 10, 7, 21)
         except Exception:
             return None
     
     def _extract_with_easyocr(self, image_path: Path) -> Tuple[Optional[str], bool]:
         """Extract text using EasyOCR"""
         try:
-            # Initialize EasyOCR reader (lazy loading)
-            if self.easyocr_reader is None:
-                self.easyocr_reader = easyocr.Reader(self.ocr_languages, gpu=False)
+            # EasyOCR batching service, shared across extractors and loaded on
+            # first use; only its thread may drive the reader
+            if self.easyocr_service is None:
+                self.easyocr_service = get_easyocr_service(self.ocr_languages, self.ocr_device)
             
-            # Perform OCR
-            results = self.easyocr_reader.readtext(str(image_path), detail=0)
+            # Perform OCR on an RGB array, the page format PDFExtractor submits
+            with Image.open(image_path) as image:
+                page = np.asarray(image.convert('RGB'))
+            results = self.easyocr_service.readtext([page])[0]
             text = " ".join(results)
             
             # Check if meaningful text was extracted
@@ -112,17 +128,18 @@ class ImageExtractor:
         except Exception:
             return None, False
     
-    def _extract_with_tesseract(self, image_path: Path) -> Tuple[Optional[str], bool]:
-        """Extract text using Tesseract OCR"""
+    def _extract_with_tesseract(self, image: Union[Path, "np.ndarray"]) -> Tuple[Optional[str], bool]:
+        """Extract text using Tesseract OCR, from an image file or a preprocessed array"""
         try:
-            # Open image
-            image = Image.open(image_path)
+            # Open image; a preprocessed array is passed to both bindings as-is
+            if isinstance(image, Path):
+                image = Image.open(image)
             
-            # Perform OCR
-            text = pytesseract.image_to_string(
-                image,
-                lang='+'.join(self.ocr_languages)
-            )
+            # Perform OCR (in-process libtesseract when available)
+            lang = '+'.join(self.ocr_languages)
+            text = tesseract_ocr(image, self.tesseract_path, lang)
+            if text is None:
+                text = pytesseract.image_to_string(image, lang=lang)
             
             # Check if meaningful text was extracted
             if text and len(text.strip()) > 20:
@@ -138,5 +155,6 @@ class ImageExtractor:
         return {
             'EasyOCR': EASYOCR_AVAILABLE,
             'Tesseract': PYTESSERACT_AVAILABLE,
+            'tesserocr': TESSEROCR_AVAILABLE,
             'OpenCV': CV2_AVAILABLE,
         }
@@ -0,0 +1,267 @@
+"""
+Shared OCR Engine Handles
+Keeps in-process Tesseract APIs and one EasyOCR reader (with its page
+batching service) per language set for the whole run, and picks the device
+EasyOCR runs on
+"""
+import atexit
+import functools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, Dict, List, Set, Tuple
+
+# The pipelines OCR several files or pages at once (extract threads, worker
+# processes, the page pool below), and Tesseract's own OpenMP threads gain
+# little beyond two, so it runs single-threaded. Set before tesserocr loads
+# libtesseract; the tesseract processes pytesseract starts inherit it. A
+# value already in the environment wins
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+
+# EasyOCR needs roughly this much free GPU memory; with less it runs on the CPU
+_MIN_GPU_FREE_BYTES = int(1.5 * 1024 ** 3)
+
+# (tessdata_dir, lang) -> idle APIs. Each call borrows its own API, so
+# threads OCR in parallel (tesserocr releases the GIL while recognising)
+_tesseract_idle: Dict[Tuple[Optional[str], str], List] = {}
+_tesseract_all: List = []
+_tesseract_failed: Set[Tuple[Optional[str], str]] = set()
+_tesseract_apis_lock = threading.Lock()
+
+# Pages from every PDF share one pool, so concurrent documents together
+# use at most one OCR thread per core
+_tesseract_page_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                          thread_name_prefix="tesseract-page")
+
+# Serialises EasyOCR model loads so two threads never build the same reader
+_easyocr_readers_lock = threading.Lock()
+
+
+def _tessdata_dir(tesseract_path: Optional[str]) -> Optional[str]:
+    """Locate the tessdata folder that ships next to the tesseract binary"""
+    if not tesseract_path:
+        return None
+    tessdata = Path(tesseract_path).parent / "tessdata"
+    return str(tessdata) if tessdata.is_dir() else None
+
+
+def _acquire_tesseract_api(key: Tuple[Optional[str], str]):
+    """Borrow an idle API for a language set, initialising a new one if none is free"""
+    with _tesseract_apis_lock:
+        if key in _tesseract_failed:
+            return None
+        idle = _tesseract_idle.setdefault(key, [])
+        if idle:
+            return idle.pop()
+
+    # Initialisation takes a while, so it runs outside the lock
+    try:
+        if key[0]:
+            api = tesserocr.PyTessBaseAPI(path=key[0], lang=key[1])
+        else:
+            api = tesserocr.PyTessBaseAPI(lang=key[1])
+    except Exception:
+        with _tesseract_apis_lock:
+            _tesseract_failed.add(key)
+        return None
+
+    with _tesseract_apis_lock:
+        _tesseract_all.append(api)
+    return api
+
+
+def _release_tesseract_api(key: Tuple[Optional[str], str], api) -> None:
+    """Return a borrowed API for the next call to reuse"""
+    with _tesseract_apis_lock:
+        _tesseract_idle[key].append(api)
+
+
+def tesseract_ocr(image, tesseract_path: Optional[str], lang: str) -> Optional[str]:
+    """
+    OCR a PIL image or a uint8 pixel array with a preloaded libtesseract API
+
+    Arrays (H x W grayscale or H x W x C) are handed over with SetImageBytes;
+    SetImage would first re-encode a PIL image to an in-memory bitmap.
+
+    Safe to call from several threads at once; each concurrent call gets its
+    own API, and APIs are kept for reuse rather than reinitialised.
+
+    Returns:
+        Extracted text, or None when tesserocr is unavailable so callers can
+        fall back to pytesseract
+    """
+    if not TESSEROCR_AVAILABLE:
+        return None
+
+    key = (_tessdata_dir(tesseract_path), lang)
+    api = _acquire_tesseract_api(key)
+    if api is None:
+        return None
+
+    # A PyTessBaseAPI holds per-image state, so SetImage/GetUTF8Text stay on one borrower
+    try:
+        if hasattr(image, 'shape'):
+            height, width = image.shape[:2]
+            channels = image.shape[2] if image.ndim == 3 else 1
+            api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+        else:
+            api.SetImage(image)
+        return api.GetUTF8Text()
+    finally:
+        _release_tesseract_api(key, api)
+
+
+def tesseract_ocr_pages(pages: List[Any], tesseract_path: Optional[str],
+                        lang: str) -> List[Optional[str]]:
+    """tesseract_ocr for several pages, run in parallel on the shared page pool"""
+    return list(_tesseract_page_pool.map(
+        lambda page: tesseract_ocr(page, tesseract_path, lang), pages
+    ))
+
+
+def resolve_ocr_device(device: str = "auto") -> str:
+    """
+    Device for EasyOCR: "cpu", "cuda" or "mps"
+
+    "auto" picks CUDA, then Apple MPS, then the CPU. torch is imported here
+    rather than at module load, since only EasyOCR needs it. A CUDA device
+    with less than 1.5 GB free falls back to the CPU.
+    """
+    if device == "cpu":
+        return "cpu"
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+
+    try:
+        if device in ("auto", "cuda") and torch.cuda.is_available():
+            free, _ = torch.cuda.mem_get_info()
+            if free >= _MIN_GPU_FREE_BYTES:
+                return "cuda"
+        if device in ("auto", "mps") and torch.backends.mps.is_available():
+            return "mps"
+    except Exception:
+        pass
+    return "cpu"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_easyocr_reader(languages: Tuple[str, ...], device: str):
+    """Build an EasyOCR reader; cached, since each one loads ~100MB of model weights"""
+    import easyocr
+    return easyocr.Reader(list(languages), gpu=False if device == "cpu" else device,
+                          cudnn_benchmark=True)
+
+
+def get_easyocr_reader(languages, device: str = "auto"):
+    """
+    EasyOCR reader shared by every extractor in the process
+
+    Keyed by language set and resolved device, so the PDF and image
+    extractors (and every FileProcessor) load the models a single time.
+    """
+    key = (tuple(languages), resolve_ocr_device(device))
+    with _easyocr_readers_lock:
+        return _load_easyocr_reader(*key)
+
+
+class BatchedOCRService:
+    """
+    Batches EasyOCR pages across documents
+
+    Extractors running on several threads submit their page arrays here; one
+    background thread gathers them for up to flush_ms (or until batch_size
+    pages are waiting) and runs a single readtext_batched call per page
+    size. The GPU then sees a few large batches instead of many small ones,
+    and only this thread drives the reader.
+    """
+
+    def __init__(self, reader, batch_size: int = 16, flush_ms: float = 50):
+        self.reader = reader
+        self.batch_size = batch_size
+        self.flush_seconds = flush_ms / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="easyocr-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, image) -> Future:
+        """Queue one page (H x W x 3 uint8 array); the future gives its text fragments"""
+        future: Future = Future()
+        self._queue.put((future, image))
+        return future
+
+    def readtext(self, images: List[Any]) -> List[List[str]]:
+        """Text fragments for each page, waiting for the batches they end up in"""
+        futures = [self.submit(image) for image in images]
+        return [future.result() for future in futures]
+
+    def _run(self):
+        """Collect a batch, run it, repeat"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch: List[Tuple[Future, Any]]):
+        """OCR a batch, one readtext_batched call per page size so nothing is stretched"""
+        by_shape: Dict[Tuple[int, int], List[Tuple[Future, Any]]] = {}
+        for future, image in batch:
+            if future.set_running_or_notify_cancel():
+                by_shape.setdefault(image.shape[:2], []).append((future, image))
+
+        for (height, width), items in by_shape.items():
+            try:
+                results = self.reader.readtext_batched(
+                    [image for _, image in items], n_width=width, n_height=height,
+                    batch_size=len(items), detail=0
+                )
+            except Exception as e:
+                for future, _ in items:
+                    future.set_exception(e)
+                continue
+            for (future, _), result in zip(items, results):
+                future.set_result(result)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_easyocr_service(languages: Tuple[str, ...], device: str) -> BatchedOCRService:
+    """One batching service per reader"""
+    return BatchedOCRService(_load_easyocr_reader(languages, device))
+
+
+def get_easyocr_service(languages, device: str = "auto") -> BatchedOCRService:
+    """Batching service around the shared EasyOCR reader (see get_easyocr_reader)"""
+    key = (tuple(languages), resolve_ocr_device(device))
+    with _easyocr_readers_lock:
+        return _load_easyocr_service(*key)
+
+
+@atexit.register
+def _shutdown_tesseract_apis():
+    """Release libtesseract handles at interpreter exit"""
+    for api in _tesseract_all:
+        try:
+            api.End()
+        except Exception:
+            pass
+    _tesseract_all.clear()
+    _tesseract_idle.clear()
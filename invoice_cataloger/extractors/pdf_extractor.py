@@ -2,23 +2,26 @@
 Multi-Stage PDF Text Extraction
 Tries multiple methods for maximum reliability
 """
+import functools
+import importlib.util
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple, Union
 import io
 
+import numpy as np
+
 # PDF Libraries
 try:
     import fitz  # PyMuPDF
     PYMUPDF_AVAILABLE = True
+    # Newer releases print a pymupdf_layout suggestion on the first find_tables
+    if hasattr(fitz, "no_recommend_layout"):
+        fitz.no_recommend_layout()
 except ImportError:
     PYMUPDF_AVAILABLE = False
 
-try:
-    import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    PDFPLUMBER_AVAILABLE = False
-
 try:
     from pypdf import PdfReader
     PYPDF_AVAILABLE = True
@@ -27,9 +30,14 @@ except ImportError:
 
 # OCR Libraries
 try:
-    from pdf2image import convert_from_path
     from PIL import Image
-    PDF2IMAGE_AVAILABLE = True
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    from pdf2image import convert_from_path, convert_from_bytes
+    PDF2IMAGE_AVAILABLE = PIL_AVAILABLE
 except ImportError:
     PDF2IMAGE_AVAILABLE = False
 
@@ -39,20 +47,94 @@ try:
 except ImportError:
     PYTESSERACT_AVAILABLE = False
 
-try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
-except ImportError:
-    EASYOCR_AVAILABLE = False
+# EasyOCR pulls in torch, which takes seconds to import; text PDFs never need
+# it, so only its presence is checked here (ocr_engine imports it on first use)
+EASYOCR_AVAILABLE = importlib.util.find_spec("easyocr") is not None
+
+from .ocr_engine import TESSEROCR_AVAILABLE, get_easyocr_service, tesseract_ocr_pages
+
+# Pages are rasterised in-process by PyMuPDF; pdf2image (Poppler) is the fallback
+PAGE_RENDER_AVAILABLE = PYMUPDF_AVAILABLE or PDF2IMAGE_AVAILABLE
+
+_OCR_PAGES = 3
+
+# PyMuPDF must not be used from several threads at once, and it holds the GIL
+# anyway, so calls into it are serialised. OCR, which is the slow part and
+# releases the GIL, still overlaps across threads
+_FITZ_LOCK = threading.Lock()
+
+
+def _page_text(page) -> str:
+    """
+    A PyMuPDF page's text in reading order, with ruled tables as Markdown
+
+    Text blocks are sorted top to bottom, then left to right. find_tables
+    takes tens of milliseconds a page, so it only runs on pages with drawn
+    lines (the table rulings it looks for). Blocks inside a table are
+    replaced by its Markdown, so table text appears once. Image blocks are
+    skipped.
+    """
+    tables = page.find_tables().tables if page.get_cdrawings() else []
+    table_rects = [fitz.Rect(table.bbox) for table in tables]
+    
+    parts = [(table.bbox[1], table.bbox[0], table.to_markdown()) for table in tables]
+    for x0, y0, x1, y1, block_text, _, block_type in page.get_text("blocks"):
+        centre = fitz.Point((x0 + x1) / 2, (y0 + y1) / 2)
+        if block_type == 0 and not any(centre in rect for rect in table_rects):
+            parts.append((y0, x0, block_text))
+    parts.sort(key=lambda part: (part[0], part[1]))
+    return "".join(part[2] for part in parts)
+
+
+def _as_file(source: Union[Path, bytes]):
+    """Path as-is, or in-memory bytes wrapped for readers that expect a file"""
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _pdf_to_pages(source: Union[Path, bytes], dpi: int) -> List[np.ndarray]:
+    """
+    Render the first three pages for OCR, as RGB arrays
+
+    PyMuPDF draws the pages in-process straight into a pixel buffer; the
+    pdf2image fallback runs Poppler's pdftoppm in a subprocess per PDF.
+    """
+    if PYMUPDF_AVAILABLE:
+        # PyMuPDF is not thread-safe; see _FITZ_LOCK
+        with _FITZ_LOCK:
+            if isinstance(source, bytes):
+                doc = fitz.open(stream=source, filetype="pdf")
+            else:
+                doc = fitz.open(source)
+            
+            pages = []
+            with doc:
+                for page in doc.pages(0, min(_OCR_PAGES, doc.page_count)):
+                    pixmap = page.get_pixmap(dpi=dpi, alpha=False)
+                    pages.append(np.frombuffer(pixmap.samples, dtype=np.uint8)
+                                 .reshape(pixmap.height, pixmap.width, pixmap.n))
+        return pages
+    
+    if isinstance(source, bytes):
+        images = convert_from_bytes(source, dpi=dpi, first_page=1, last_page=_OCR_PAGES)
+    else:
+        images = convert_from_path(source, dpi=dpi, first_page=1, last_page=_OCR_PAGES)
+    # convert() copies the whole page even when it is a no-op, so only non-RGB pages go through it
+    return [np.asarray(image if image.mode == 'RGB' else image.convert('RGB')) for image in images]
 
 
 class PDFExtractor:
     """Multi-stage PDF text extraction with automatic fallback"""
     
-    def __init__(self, tesseract_path: Optional[str] = None, ocr_languages: list = None):
+    def __init__(self, tesseract_path: Optional[str] = None, ocr_languages: list = None,
+                 ocr_device: str = "auto", ocr_dpi: int = 200):
         self.tesseract_path = tesseract_path
-        self.ocr_languages = ocr_languages or ['en']
-        self.easyocr_reader = None
+        self.ocr_languages = list(ocr_languages) if ocr_languages else ['en']
+        self.ocr_device = ocr_device  # "auto", "cpu", "cuda" or "mps"; see ocr_engine.resolve_ocr_device
+        # EasyOCR's detector scales pages down to ~1280px anyway, and 200 DPI
+        # has 2.25x fewer pixels to render and copy than 300 DPI
+        self.ocr_dpi = ocr_dpi
+        self.easyocr_service = None
+        self._easyocr_warmed_up = False
         
         # Configure Tesseract path if provided
         if tesseract_path and PYTESSERACT_AVAILABLE:
@@ -70,87 +152,100 @@ class PDFExtractor:
         if not pdf_path.exists():
             return None, "File not found"
         
+        return self._extract(pdf_path)
+    
+    def extract_from_bytes(self, data: bytes) -> Tuple[Optional[str], str]:
+        """
+        Extract text from PDF content already read into memory
+        
+        Same stages as extract_text, without opening the file again.
+        
+        Returns:
+            Tuple[Optional[str], str]: (extracted_text, method_used)
+        """
+        return self._extract(data)
+    
+    def _extract(self, pdf_path: Union[Path, bytes]) -> Tuple[Optional[str], str]:
+        """Run the extraction stages on a PDF path or its bytes"""
         # Stage 1: PyMuPDF (fastest, most reliable for text PDFs)
+        opened = False
         if PYMUPDF_AVAILABLE:
             text, success = self._extract_with_pymupdf(pdf_path)
             if success:
                 return text, "PyMuPDF (native text)"
+            # An empty string means PyMuPDF read the PDF but found too little text
+            opened = text == ""
         
-        # Stage 2: pdfplumber (better for tables/structured data)
-        if PDFPLUMBER_AVAILABLE:
-            text, success = self._extract_with_pdfplumber(pdf_path)
-            if success:
-                return text, "pdfplumber (native text)"
-        
-        # Stage 3: pypdf (pure Python fallback)
-        if PYPDF_AVAILABLE:
-            text, success = self._extract_with_pypdf(pdf_path)
-            if success:
-                return text, "pypdf (native text)"
+        # The other native readers see the same text layer PyMuPDF did, so they
+        # only run when PyMuPDF is missing or could not open the file
+        if not opened:
+            # Stage 2: pypdf (pure Python fallback)
+            if PYPDF_AVAILABLE:
+                text, success = self._extract_with_pypdf(pdf_path)
+                if success:
+                    return text, "pypdf (native text)"
         
-        # Stage 4: EasyOCR (deep learning OCR, no Tesseract needed)
-        if EASYOCR_AVAILABLE and PDF2IMAGE_AVAILABLE:
+        # Stage 3: EasyOCR (deep learning OCR, no Tesseract needed)
+        if EASYOCR_AVAILABLE and PAGE_RENDER_AVAILABLE:
             text, success = self._extract_with_easyocr(pdf_path)
             if success:
                 return text, "EasyOCR"
         
-        # Stage 5: Tesseract OCR (if installed)
-        if PYTESSERACT_AVAILABLE and PDF2IMAGE_AVAILABLE:
+        # Stage 4: Tesseract OCR (if installed)
+        if (TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE) and PAGE_RENDER_AVAILABLE and PIL_AVAILABLE:
             text, success = self._extract_with_tesseract(pdf_path)
             if success:
                 return text, "Tesseract OCR"
         
         return None, "All extraction methods failed"
     
-    def _extract_with_pymupdf(self, pdf_path: Path) -> Tuple[Optional[str], bool]:
-        """Extract text using PyMuPDF (fitz)"""
-        try:
-            doc = fitz.open(pdf_path)
-            text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text += page.get_text()
-            
-            doc.close()
-            
-            # Check if meaningful text was extracted
-            if text and len(text.strip()) > 50:
-                return text, True
-            
-            return None, False
-        except Exception as e:
-            return None, False
-    
-    def _extract_with_pdfplumber(self, pdf_path: Path) -> Tuple[Optional[str], bool]:
-        """Extract text using pdfplumber"""
-        try:
-            text = ""
-            
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            
-            # Check if meaningful text was extracted
-            if text and len(text.strip()) > 50:
-                return text, True
+    def _extract_with_pymupdf(self, pdf_path: Union[Path, bytes]) -> Tuple[Optional[str], bool]:
+        """
+        Extract text using PyMuPDF (fitz)
+        
+        Text is read block by block in reading order, with ruled tables added
+        as Markdown (see _page_text). A first page with almost no text but
+        with images is taken to be a scan, and the remaining pages are not
+        read. On failure the text is ""
+        when the document was read (a scan, or too little text) and None when
+        it could not be opened or read.
+        """
+        with _FITZ_LOCK:
+            try:
+                if isinstance(pdf_path, bytes):
+                    doc = fitz.open(stream=pdf_path, filetype="pdf")
+                else:
+                    doc = fitz.open(pdf_path)
+            except Exception:
+                return None, False
             
-            return None, False
-        except Exception as e:
-            return None, False
+            try:
+                with doc:
+                    if doc.page_count == 0:
+                        return "", False
+                    
+                    first_page = doc[0]
+                    first_text = _page_text(first_page)
+                    if len(first_text.strip()) < 50 and first_page.get_images():
+                        return "", False
+                    
+                    text = first_text + "".join(_page_text(doc[i]) for i in range(1, doc.page_count))
+                
+                # Check if meaningful text was extracted
+                if text and len(text.strip()) > 50:
+                    return text, True
+                
+                return "", False
+            except Exception:
+                return None, False
     
-    def _extract_with_pypdf(self, pdf_path: Path) -> Tuple[Optional[str], bool]:
+    def _extract_with_pypdf(self, pdf_path: Union[Path, bytes]) -> Tuple[Optional[str], bool]:
         """Extract text using pypdf"""
         try:
-            reader = PdfReader(pdf_path)
-            text = ""
-            
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+            reader = PdfReader(_as_file(pdf_path))
+            text = "".join(page_text + "\n"
+                           for page_text in (page.extract_text() for page in reader.pages)
+                           if page_text)
             
             # Check if meaningful text was extracted
             if text and len(text.strip()) > 50:
@@ -160,26 +255,25 @@ class PDFExtractor:
         except Exception as e:
             return None, False
     
-    def _extract_with_easyocr(self, pdf_path: Path) -> Tuple[Optional[str], bool]:
+    def _extract_with_easyocr(self, pdf_path: Union[Path, bytes]) -> Tuple[Optional[str], bool]:
         """Extract text using EasyOCR (deep learning)"""
         try:
-            # Initialize EasyOCR reader (lazy loading)
-            if self.easyocr_reader is None:
-                self.easyocr_reader = easyocr.Reader(self.ocr_languages, gpu=False)
+            # EasyOCR reader and its batching service, shared across extractors
+            # and loaded on first use
+            if self.easyocr_service is None:
+                self.easyocr_service = get_easyocr_service(self.ocr_languages, self.ocr_device)
             
-            # Convert PDF to images
-            images = convert_from_path(pdf_path, dpi=300, first_page=1, last_page=3)
+            # Render PDF pages, handed to EasyOCR as arrays (no image files)
+            pages = _pdf_to_pages(pdf_path, self.ocr_dpi)
+            if not pages:
+                return None, False
             
-            text = ""
-            for i, image in enumerate(images):
-                # Convert PIL Image to bytes
-                img_byte_arr = io.BytesIO()
-                image.save(img_byte_arr, format='PNG')
-                img_byte_arr = img_byte_arr.getvalue()
-                
-                # Perform OCR
-                results = self.easyocr_reader.readtext(img_byte_arr, detail=0)
-                text += " ".join(results) + "\n"
+            # Pages are batched with those of other PDFs being extracted on
+            # other threads
+            height, width = pages[0].shape[:2]
+            self._warm_up_easyocr(width, height)
+            results = self.easyocr_service.readtext(pages)
+            text = "\n".join(" ".join(page_results) for page_results in results)
             
             # Check if meaningful text was extracted
             if text and len(text.strip()) > 50:
@@ -189,20 +283,42 @@ class PDFExtractor:
         except Exception as e:
             return None, False
     
-    def _extract_with_tesseract(self, pdf_path: Path) -> Tuple[Optional[str], bool]:
+    def _warm_up_easyocr(self, width: int, height: int):
+        """
+        Run one blank batch through a GPU reader before the first real page
+        
+        With cudnn_benchmark the first batch of a given shape pays for kernel
+        selection; doing it here keeps that out of the first document's timing.
+        CPU readers skip this.
+        """
+        if self._easyocr_warmed_up:
+            return
+        self._easyocr_warmed_up = True
+        if getattr(self.easyocr_service.reader, 'device', 'cpu') == 'cpu':
+            return
+        self.easyocr_service.readtext([np.zeros((height, width, 3), dtype=np.uint8)])
+    
+    def _extract_with_tesseract(self, pdf_path: Union[Path, bytes]) -> Tuple[Optional[str], bool]:
         """Extract text using Tesseract OCR"""
         try:
-            # Convert PDF to images
-            images = convert_from_path(pdf_path, dpi=300, first_page=1, last_page=3)
+            # Render PDF pages
+            pages = _pdf_to_pages(pdf_path, self.ocr_dpi)
             
-            text = ""
-            for image in images:
-                # Perform OCR
-                page_text = pytesseract.image_to_string(
-                    image,
-                    lang='+'.join(self.ocr_languages)
-                )
-                text += page_text + "\n"
+            lang = '+'.join(self.ocr_languages)
+            text = None
+            
+            # Perform OCR with in-process libtesseract when available, straight
+            # from the page arrays, pages in parallel on the shared page pool
+            # (tesserocr releases the GIL while recognising)
+            if TESSEROCR_AVAILABLE and pages:
+                page_texts = tesseract_ocr_pages(pages, self.tesseract_path, lang)
+                if None not in page_texts:
+                    text = "\n".join(page_texts)
+            
+            # Otherwise run the tesseract binary once for all pages
+            if text is None and PYTESSERACT_AVAILABLE:
+                images = [Image.fromarray(page) for page in pages]
+                text = self._tesseract_pages_in_one_call(images, lang)
             
             # Check if meaningful text was extracted
             if text and len(text.strip()) > 50:
@@ -213,36 +329,74 @@ class PDFExtractor:
             return None, False
     
     @staticmethod
-    def get_available_methods() -> dict:
-        """Get information about available extraction methods"""
-        return {
+    def _tesseract_pages_in_one_call(images: list, lang: str) -> str:
+        """
+        OCR several pages with a single tesseract invocation
+        
+        Pages are stacked into one tall image and read back through the TSV
+        (image_to_data) output, then regrouped into lines by block/paragraph/line.
+        """
+        if len(images) == 1:
+            combined = images[0]
+        else:
+            width = max(image.width for image in images)
+            height = sum(image.height for image in images)
+            combined = Image.new('RGB', (width, height), 'white')
+            offset = 0
+            for image in images:
+                combined.paste(image, (0, offset))
+                offset += image.height
+        
+        data = pytesseract.image_to_data(
+            combined,
+            lang=lang,
+            output_type=pytesseract.Output.DICT
+        )
+        
+        lines = {}
+        for block, par, line, word in zip(data['block_num'], data['par_num'],
+                                          data['line_num'], data['text']):
+            if word and word.strip():
+                lines.setdefault((block, par, line), []).append(word)
+        
+        return "\n".join(" ".join(words) for words in lines.values())
+    
+    @staticmethod
+    @functools.cache
+    def get_available_methods() -> Mapping[str, bool]:
+        """Get information about available extraction methods (a read-only, cached mapping)"""
+        return MappingProxyType({
             'PyMuPDF': PYMUPDF_AVAILABLE,
-            'pdfplumber': PDFPLUMBER_AVAILABLE,
             'pypdf': PYPDF_AVAILABLE,
             'EasyOCR': EASYOCR_AVAILABLE,
             'Tesseract': PYTESSERACT_AVAILABLE,
+            'tesserocr': TESSEROCR_AVAILABLE,
             'pdf2image': PDF2IMAGE_AVAILABLE,
-        }
+        })
     
     @staticmethod
-    def check_dependencies() -> Tuple[bool, list]:
+    @functools.cache
+    def check_dependencies() -> Tuple[bool, Tuple[str, ...]]:
         """
         Check if minimum dependencies are available
         
+        The import flags are fixed once this module is loaded, so the result
+        is computed once per process; every caller shares it, hence a tuple.
+        
         Returns:
-            Tuple[bool, list]: (all_ok, missing_dependencies)
+            Tuple[bool, Tuple[str, ...]]: (all_ok, missing_dependencies)
         """
         missing = []
         
         # At least one native PDF reader required
-        if not (PYMUPDF_AVAILABLE or PDFPLUMBER_AVAILABLE or PYPDF_AVAILABLE):
-            missing.append("PDF reader (install: pip install PyMuPDF pdfplumber pypdf)")
+        if not (PYMUPDF_AVAILABLE or PYPDF_AVAILABLE):
+            missing.append("PDF reader (install: pip install PyMuPDF pypdf)")
         
         # OCR is optional but recommended
-        if not (EASYOCR_AVAILABLE or PYTESSERACT_AVAILABLE):
+        if not (EASYOCR_AVAILABLE or PYTESSERACT_AVAILABLE or TESSEROCR_AVAILABLE):
             missing.append("OCR engine (optional, install: pip install easyocr pytesseract)")
         
-        if not PDF2IMAGE_AVAILABLE:
-            missing.append("pdf2image (optional for OCR, install: pip install pdf2image)")
+        if not PAGE_RENDER_AVAILABLE:
+            missing.append("PDF page rendering (optional for OCR, install: pip install PyMuPDF)")
         
-        return len(missing) == 0, missing
+        return len(missing) == 0, tuple(missing)
@@ -31,54 +31,56 @@ test_cases = [
     ('GitHub', 'Software & Subscriptions'),
 ]
 
-passed = 0
-failed = 0
-
-for vendor, expected in test_cases:
-    result = categorizer.categorize(vendor, '', [])
-    if result == expected:
-        print(f"  ✓ {vendor:40} -> {result}")
-        passed += 1
-    else:
-        print(f"  ✗ {vendor:40} -> {result} (expected: {expected})")
-        failed += 1
-
-print(f"\nOverride Tests: {passed}/{len(test_cases)} passed")
-
-# Test 4: Test keyword-based categorization (non-override vendors)
-print("\n[TEST 4] Testing keyword-based categorization...")
 keyword_tests = [
     ('Woolworths', 'Food & Groceries'),
     ('JB Hi-Fi', 'Electronics'),
     ('Bunnings', 'Home & Garden'),
 ]
 
-for vendor, expected in keyword_tests:
-    result = categorizer.categorize(vendor, '', [])
-    if result == expected:
-        print(f"  ✓ {vendor:40} -> {result}")
-        passed += 1
-    else:
-        print(f"  ✗ {vendor:40} -> {result} (expected: {expected})")
-        failed += 1
-
-print(f"\nKeyword Tests: {passed - len(test_cases)}/{len(keyword_tests)} passed")
-
-# Test 5: Edge cases
-print("\n[TEST 5] Testing edge cases...")
 edge_tests = [
     ('', 'Other', 'Empty string'),
     ('Unknown Vendor XYZ', 'Other', 'Unknown vendor'),
 ]
 
-for vendor, expected, desc in edge_tests:
-    result = categorizer.categorize(vendor, '', [])
-    if result == expected:
-        print(f"  ✓ {desc:40} -> {result}")
-        passed += 1
-    else:
-        print(f"  ✗ {desc:40} -> {result} (expected: {expected})")
-        failed += 1
+# Categorize every vendor in one call, then check each group's slice
+vendors = ([vendor for vendor, _ in test_cases] +
+           [vendor for vendor, _ in keyword_tests] +
+           [vendor for vendor, _, _ in edge_tests])
+results = categorizer.categorize_batch(vendors)
+override_results = results[:len(test_cases)]
+keyword_results = results[len(test_cases):len(test_cases) + len(keyword_tests)]
+edge_results = results[len(test_cases) + len(keyword_tests):]
+
+
+def check(labels, expected, results):
+    """Compare results with expectations; returns (passed, report lines)"""
+    lines = []
+    group_passed = 0
+    for label, want, result in zip(labels, expected, results):
+        if result == want:
+            lines.append(f"  ✓ {label:40} -> {result}")
+            group_passed += 1
+        else:
+            lines.append(f"  ✗ {label:40} -> {result} (expected: {want})")
+    return group_passed, lines
+
+
+override_passed, lines = check([v for v, _ in test_cases], [e for _, e in test_cases], override_results)
+print("\n".join(lines))
+print(f"\nOverride Tests: {override_passed}/{len(test_cases)} passed")
+
+# Test 4: Test keyword-based categorization (non-override vendors)
+print("\n[TEST 4] Testing keyword-based categorization...")
+keyword_passed, lines = check([v for v, _ in keyword_tests], [e for _, e in keyword_tests], keyword_results)
+print("\n".join(lines))
+print(f"\nKeyword Tests: {keyword_passed}/{len(keyword_tests)} passed")
+
+# Test 5: Edge cases
+print("\n[TEST 5] Testing edge cases...")
+edge_passed, lines = check([d for _, _, d in edge_tests], [e for _, e, _ in edge_tests], edge_results)
+print("\n".join(lines))
+
+passed = override_passed + keyword_passed + edge_passed
 
 # Final summary
 print("\n" + "=" * 80)
@@ -87,6 +89,7 @@ print("=" * 80)
 total_tests = len(test_cases) + len(keyword_tests) + len(edge_tests)
 print(f"Total: {passed}/{total_tests} tests passed")
 
+failed = total_tests - passed
 if failed == 0:
     print("\n✓✓✓ ALL TESTS PASSED! ✓✓✓")
 else:
@@ -7,6 +7,8 @@ Python implementation with robust PDF extraction
 import argparse
 import sys
 from pathlib import Path
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import cached_property
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import time
@@ -14,10 +16,11 @@ from tqdm import tqdm
 
 # Import modules
 from config import Config
-from utils import setup_logger, get_logger, CacheManager, FailedFilesManager
+from utils import setup_logger, get_logger, CacheManager, FailedFilesManager, OCRCache
 from extractors import PDFExtractor, ImageExtractor, DocumentExtractor, EmailExtractor
-from processors import LLMProcessor, ExpenseCategorizer, DeductionCalculator
+from processors import LLMProcessor, create_llm_client, ExpenseCategorizer, DeductionCalculator
 from exporters import ExcelExporter, CSVExporter
+from core.file_processor import _largest_first
 
 
 class InvoiceCataloger:
@@ -27,43 +30,17 @@ class InvoiceCataloger:
         self.config = config
         self.logger = get_logger()
         
-        # Initialize components
-        self.pdf_extractor = PDFExtractor(
-            tesseract_path=config.tesseract_path,
-            ocr_languages=config.ocr_languages
-        )
-        self.image_extractor = ImageExtractor(
-            tesseract_path=config.tesseract_path,
-            ocr_languages=config.ocr_languages
-        )
-        self.document_extractor = DocumentExtractor()
-        self.email_extractor = EmailExtractor()
+        # Per-file progress/debug logging is only worth its I/O in verbose runs
+        self._verbose = config.log_level.upper() == 'DEBUG'
         
+        # Config values read for every file, bound once
+        self._move_files = config.move_processed_files
+        self._output_folder = config.output_folder
+        self._max_retries = config.max_retry_attempts
+        
+        # Initialize components (extractors are created lazily, see below)
         # Initialize LLM processor based on API provider
-        self.llm_processor = LLMProcessor(
-            api_provider=config.api_provider,
-            # LM Studio params
-            endpoint=config.lm_studio_endpoint,
-            model=config.lm_studio_model,
-            # OpenAI params
-            openai_api_key=config.openai_api_key,
-            openai_model=config.openai_model,
-            openai_api_base=config.openai_api_base,
-            # OpenRouter params
-            openrouter_api_key=config.openrouter_api_key,
-            openrouter_model=config.openrouter_model,
-            openrouter_api_base=config.openrouter_api_base,
-            openrouter_app_name=config.openrouter_app_name,
-            # Custom prompt
-            use_custom_prompt=config.use_custom_prompt,
-            custom_extraction_prompt=config.custom_extraction_prompt,
-            # Common params
-            temperature=config.temperature,
-            max_tokens=config.max_tokens,
-            timeout=config.timeout_seconds,
-            retry_attempts=config.retry_attempts,
-            retry_delay=config.retry_delay_seconds
-        )
+        self.llm_processor = create_llm_client(config)
         
         # Load vendor overrides and initialize categorizer
         vendor_overrides_data = config.load_vendor_overrides()
@@ -77,10 +54,40 @@ class InvoiceCataloger:
         
         self.cache_manager = CacheManager(config.cache_path)
         self.failed_files_manager = FailedFilesManager(config.failed_files_path)
+        self.ocr_cache = OCRCache(config.ocr_cache_path)
         
         self.excel_exporter = ExcelExporter(config.output_folder)
         self.csv_exporter = CSVExporter(config.output_folder)
     
+    @cached_property
+    def pdf_extractor(self) -> PDFExtractor:
+        """PDF extractor, created on first use"""
+        return PDFExtractor(
+            tesseract_path=self.config.ocr.tesseract_path,
+            ocr_languages=self.config.ocr.languages,
+            ocr_device=self.config.ocr.device,
+            ocr_dpi=self.config.ocr.dpi
+        )
+    
+    @cached_property
+    def image_extractor(self) -> ImageExtractor:
+        """Image (OCR) extractor, created on first use"""
+        return ImageExtractor(
+            tesseract_path=self.config.ocr.tesseract_path,
+            ocr_languages=self.config.ocr.languages,
+            ocr_device=self.config.ocr.device
+        )
+    
+    @cached_property
+    def document_extractor(self) -> DocumentExtractor:
+        """Word/Excel extractor, created on first use"""
+        return DocumentExtractor()
+    
+    @cached_property
+    def email_extractor(self) -> EmailExtractor:
+        """Email extractor, created on first use"""
+        return EmailExtractor()
+    
     def check_prerequisites(self) -> bool:
         """Check if all prerequisites are met"""
         self.logger.section("CHECKING PREREQUISITES")
@@ -189,13 +196,20 @@ class InvoiceCataloger:
         
         return True
     
+    def _scan_folder(self, folder: Path) -> List[Path]:
+        """Walk a folder once, keeping files with a supported extension"""
+        extensions = self.config.file_extensions
+        return sorted(
+            path for path in folder.rglob('*')
+            if path.suffix.lower() in extensions and path.is_file()
+            and not path.name.startswith(ImageExtractor.LEGACY_TEMP_PREFIX)
+        )
+    
     def get_invoice_files(self, retry_failed: bool = False) -> List[Path]:
         """Get list of invoice files to process"""
         self.logger.info(f"Scanning for invoice files in: {self.config.invoice_folder}")
         
-        files = []
-        for ext in self.config.file_extensions:
-            files.extend(self.config.invoice_folder.rglob(f"*{ext}"))
+        files = self._scan_folder(self.config.invoice_folder)
         
         # Filter by retry mode
         if retry_failed:
@@ -203,7 +217,7 @@ class InvoiceCataloger:
             retry_candidates = self.failed_files_manager.get_retry_candidates(
                 self.config.max_retry_attempts
             )
-            retry_paths = [Path(entry['FilePath']) for entry in retry_candidates]
+            retry_paths = {Path(entry['FilePath']) for entry in retry_candidates}
             files = [f for f in files if f in retry_paths]
             self.logger.info(f"Found {len(files)} failed files to retry")
         
@@ -229,10 +243,28 @@ class InvoiceCataloger:
         else:
             return None, "Unsupported file type"
     
+    def _extract_text_cached(self, file_path: Path, file_hash: str,
+                             reprocess: bool) -> tuple[Optional[str], str]:
+        """
+        extract_text, reusing OCR text from an earlier run of the same file
+        
+        Text PDFs never reach OCR (PDFExtractor reads the text layer first and
+        treats a near-empty first page with images as a scan), so only scans
+        and images are worth remembering. Keyed by file hash, which lets
+        --retry-failed runs skip the OCR they already paid for.
+        """
+        cached = None if reprocess else self.ocr_cache.lookup(file_hash)
+        if cached is not None:
+            return cached
+        
+        text, method = self.extract_text(file_path)
+        self.ocr_cache.put_if_ocr(file_hash, text, method)
+        return text, method
+    
     def move_processed_file(self, file_path: Path, category: str, 
                            invoice_date: str) -> Path:
         """Move processed file to organized folder structure"""
-        if not self.config.move_processed_files:
+        if not self._move_files:
             return file_path
         
         try:
@@ -242,7 +274,7 @@ class InvoiceCataloger:
                 year_month = invoice_date[:7]  # YYYY-MM
             
             # Create destination folder
-            dest_folder = self.config.output_folder / category / year_month
+            dest_folder = self._output_folder / category / year_month
             dest_folder.mkdir(parents=True, exist_ok=True)
             
             # Move file
@@ -264,21 +296,167 @@ class InvoiceCataloger:
     def process_file(self, file_path: Path, file_index: int, 
                     total_files: int, reprocess: bool = False) -> Optional[Dict[str, Any]]:
         """Process a single invoice file"""
-        self.logger.progress(file_index, total_files, f"Processing: {file_path.name}")
+        if self._verbose:
+            self.logger.progress(file_index, total_files, f"Processing: {file_path.name}")
         
         # Calculate file hash
         file_hash = CacheManager.calculate_file_hash(file_path)
+        failed_entry, result = self._check_file(file_path, file_hash, reprocess)
+        if result is not None or not file_hash:
+            return result
+        
+        try:
+            # Extract text
+            text, method = self._extract_text_cached(file_path, file_hash, reprocess)
+            
+            result = self._screen_text(file_path, file_hash, failed_entry, text, method)
+            if result is not None:
+                return result
+            
+            # Extract data using LLM, unless identical text was extracted before
+            text_hash, extracted_data = self._find_cached_extraction(text, reprocess)
+            if extracted_data is None:
+                extracted_data = self.llm_processor.extract_invoice_data(text, file_path.name)
+            
+            return self._finish_file(file_path, file_hash, failed_entry, extracted_data, text_hash)
+            
+        except Exception as e:
+            return self._handle_processing_error(file_path, file_hash, failed_entry, e)
+    
+    def process_files(self, files: List[Path],
+                      reprocess: bool = False) -> List[Optional[Dict[str, Any]]]:
+        """
+        Process files concurrently, returning results in the same order
+        
+        Hashing and text extraction run on config.max_workers threads (OCR
+        releases the GIL) and LLM requests on config.max_concurrent_requests
+        threads, so one file's OCR overlaps other files' LLM round trips. The
+        cache/failed-file bookkeeping and file moves stay on this thread, so
+        the managers are never touched concurrently. Larger files are
+        submitted first, as in FileProcessor.process_files_async, so they do
+        not form a long tail.
+        
+        A later copy of a file (same file hash) or of its text (same text
+        hash) waits for the copy in flight and then re-checks the cache it
+        filled, so identical files cost one extraction and one LLM call.
+        """
+        total_files = len(files)
+        results: List[Optional[Dict[str, Any]]] = [None] * total_files
+        queued = object()
+        
+        # Single progress bar; per-file log lines are reserved for verbose runs
+        with tqdm(total=total_files, desc="Processing", unit="file") as progress, \
+                ThreadPoolExecutor(max_workers=max(1, self.config.max_workers)) as extract_pool, \
+                ThreadPoolExecutor(max_workers=max(1, self.config.max_concurrent_requests)) as llm_pool:
+            
+            # Future -> (stage, index, file_hash, failed_entry, text_hash)
+            pending = {}
+            # file_hash -> indices waiting on the copy in flight
+            file_waiters: Dict[str, List[int]] = {}
+            # text_hash -> (index, file_hash, failed_entry, text) waiting on its LLM call
+            text_waiters: Dict[str, List[tuple]] = {}
+            
+            def settle(index: int, file_hash: Optional[str], result: Optional[Dict[str, Any]]):
+                results[index] = result
+                progress.update()
+                for waiter in file_waiters.pop(file_hash, ()):
+                    start(waiter, file_hash)
+            
+            def start(index: int, file_hash: Optional[str]):
+                if file_hash in file_waiters:
+                    file_waiters[file_hash].append(index)
+                    return
+                
+                file_path = files[index]
+                failed_entry, result = self._check_file(file_path, file_hash, reprocess)
+                if result is not None or not file_hash:
+                    settle(index, file_hash, result)
+                    return
+                
+                file_waiters[file_hash] = []
+                future = extract_pool.submit(self._extract_text_cached, file_path,
+                                             file_hash, reprocess)
+                pending[future] = ('extract', index, file_hash, failed_entry, None)
+            
+            def request_data(index: int, file_hash: str,
+                             failed_entry: Optional[Dict[str, Any]], text: str):
+                """Finish from cached data, or queue the LLM call (returns queued)"""
+                file_path = files[index]
+                try:
+                    text_hash, extracted_data = self._find_cached_extraction(text, reprocess)
+                    if extracted_data is not None:
+                        return self._finish_file(file_path, file_hash, failed_entry,
+                                                 extracted_data, text_hash)
+                except Exception as e:
+                    return self._handle_processing_error(file_path, file_hash, failed_entry, e)
+                
+                if text_hash in text_waiters:
+                    text_waiters[text_hash].append((index, file_hash, failed_entry, text))
+                else:
+                    text_waiters[text_hash] = []
+                    llm_future = llm_pool.submit(self.llm_processor.extract_invoice_data,
+                                                 text, file_path.name)
+                    pending[llm_future] = ('llm', index, file_hash, failed_entry, text_hash)
+                return queued
+            
+            order = _largest_first(files)
+            hashes = extract_pool.map(CacheManager.calculate_file_hash, [files[i] for i in order])
+            for submitted, (index, file_hash) in enumerate(zip(order, hashes), 1):
+                if self._verbose:
+                    self.logger.progress(submitted, total_files, f"Processing: {files[index].name}")
+                start(index, file_hash)
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, index, file_hash, failed_entry, text_hash = pending.pop(future)
+                    file_path = files[index]
+                    text_copies = ()
+                    try:
+                        if stage == 'extract':
+                            text, method = future.result()
+                            result = self._screen_text(file_path, file_hash, failed_entry, text, method)
+                            if result is None:
+                                result = request_data(index, file_hash, failed_entry, text)
+                        else:
+                            text_copies = text_waiters.pop(text_hash, ())
+                            result = self._finish_file(file_path, file_hash, failed_entry,
+                                                       future.result(), text_hash)
+                    except Exception as e:
+                        result = self._handle_processing_error(file_path, file_hash, failed_entry, e)
+                    
+                    if result is not queued:
+                        settle(index, file_hash, result)
+                    
+                    # Copies of this text now find its data in the cache
+                    for copy in text_copies:
+                        copy_result = request_data(*copy)
+                        if copy_result is not queued:
+                            settle(copy[0], copy[1], copy_result)
+        
+        return results
+    
+    def _check_file(self, file_path: Path, file_hash: Optional[str], reprocess: bool
+                    ) -> tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Settle files that need no extraction
+        
+        Returns:
+            (failed_entry, result) - result is set for duplicates and files
+            over the retry limit, and None (with no result) without a hash
+        """
         if not file_hash:
             self.logger.error("Could not calculate file hash")
-            return None
+            return None, None
         
         # Check cache (skip if reprocess mode)
         cached_entry = None if reprocess else self.cache_manager.find_by_hash(file_hash)
         if cached_entry:
-            self.logger.warning("DUPLICATE FOUND: File already processed (cached)")
-            self.logger.info(f"Original: {cached_entry['FileName']} | Processed: {cached_entry['ProcessedDate']}")
+            self.logger.warning(f"DUPLICATE FOUND: {file_path.name} already processed (cached)")
+            if self._verbose:
+                self.logger.info(f"Original: {cached_entry['FileName']} | Processed: {cached_entry['ProcessedDate']}")
             
-            return {
+            return None, {
                 'FileName': file_path.name,
                 'FileType': file_path.suffix.lower(),
                 'FilePath': str(file_path),
@@ -308,123 +486,41 @@ class InvoiceCataloger:
             }
         
         # Check if file has failed too many times
-        failed_entry = self.failed_files_manager.find_by_path(str(file_path))
-        if failed_entry and failed_entry['AttemptCount'] >= self.config.max_retry_attempts:
+        failed_entry = (None if self.failed_files_manager.is_empty
+                        else self.failed_files_manager.find_by_path(str(file_path)))
+        if failed_entry and failed_entry['AttemptCount'] >= self._max_retries:
             self.logger.warning(f"SKIPPED: File has failed {failed_entry['AttemptCount']} times")
             
-            return self._create_failed_entry(file_path, file_hash, 
-                                            "Skipped - Too many failures",
-                                            "Skipped (Max retries exceeded)")
+            return failed_entry, self._create_failed_entry(file_path, file_hash, 
+                                                           "Skipped - Too many failures",
+                                                           "Skipped (Max retries exceeded)")
         
-        try:
-            # Extract text
-            text, method = self.extract_text(file_path)
+        return failed_entry, None
+    
+    def _screen_text(self, file_path: Path, file_hash: str,
+                     failed_entry: Optional[Dict[str, Any]],
+                     text: Optional[str], method: str) -> Optional[Dict[str, Any]]:
+        """Reject files with no usable text or that are not invoices; None to continue"""
+        if not text or len(text.strip()) < 10:
+            self.logger.warning(f"No text extracted using {method}")
             
-            if not text or len(text.strip()) < 10:
-                self.logger.warning(f"No text extracted using {method}")
-                
-                attempt_count = failed_entry['AttemptCount'] + 1 if failed_entry else 1
-                self.failed_files_manager.add_failure(
-                    str(file_path), file_path.name,
-                    f"No text content extracted ({method})",
-                    attempt_count
-                )
-                
-                return self._create_failed_entry(file_path, file_hash,
-                                                "No text content extracted",
-                                                "Failed (No text)")
+            self._record_failure(file_path, failed_entry,
+                                 f"No text content extracted ({method})")
             
+            return self._create_failed_entry(file_path, file_hash,
+                                            "No text content extracted",
+                                            "Failed (No text)")
+        
+        if self._verbose:
             self.logger.debug(f"Text extracted using {method} ({len(text)} chars)")
+        
+        # Check if file is a non-invoice (logo, signature, etc.)
+        is_non_invoice, non_invoice_reason = self._is_non_invoice(None, text)
+        if is_non_invoice:
+            self.logger.warning(f"NON-INVOICE DETECTED: {non_invoice_reason}")
             
-            # Check if file is a non-invoice (logo, signature, etc.)
-            is_non_invoice, non_invoice_reason = self._is_non_invoice(None, text)
-            if is_non_invoice:
-                self.logger.warning(f"NON-INVOICE DETECTED: {non_invoice_reason}")
-                
-                # Move to Non-Invoice folder
-                moved_path = self.move_non_invoice(file_path)
-                
-                return {
-                    'FileName': file_path.name,
-                    'FileType': file_path.suffix.lower(),
-                    'FilePath': str(moved_path),
-                    'OriginalPath': str(file_path),
-                    'ProcessedDateTime': datetime.now(),
-                    'VendorName': 'N/A',
-                    'VendorABN': '',
-                    'InvoiceNumber': '',
-                    'InvoiceDate': '',
-                    'DueDate': '',
-                    'SubTotal': 0.00,
-                    'Tax': 0.00,
-                    'TotalAmount': 0.00,
-                    'Currency': 'AUD',
-                    'Category': 'Non-Invoice',
-                    'WorkUsePercentage': 0,
-                    'DeductibleAmount': 0.00,
-                    'ClaimMethod': 'Not Applicable',
-                    'ClaimNotes': non_invoice_reason,
-                    'AtoReference': 'N/A',
-                    'RequiresDocumentation': [],
-                    'ProcessingStatus': 'Non-Invoice',
-                    'FileHash': file_hash,
-                    'MovedTo': str(moved_path),
-                    'NeedsManualReview': False,
-                    'MissingFields': []
-                }
-            
-            # Extract data using LLM
-            extracted_data = self.llm_processor.extract_invoice_data(text, file_path.name)
-            
-            if not extracted_data:
-                self.logger.warning("Failed to extract data with LLM")
-                
-                attempt_count = failed_entry['AttemptCount'] + 1 if failed_entry else 1
-                self.failed_files_manager.add_failure(
-                    str(file_path), file_path.name,
-                    "AI extraction failed",
-                    attempt_count
-                )
-                
-                return self._create_failed_entry(file_path, file_hash,
-                                                "AI extraction failed",
-                                                "Failed (AI extraction)")
-            
-            # Check for missing critical fields
-            needs_manual_review, missing_fields = self._check_missing_fields(extracted_data)
-            
-            # Categorize expense
-            category = self.categorizer.categorize(
-                extracted_data.get('vendor_name', ''),
-                extracted_data.get('description', ''),
-                extracted_data.get('line_items', [])
-            )
-            
-            # Calculate deduction
-            deduction = self.deduction_calculator.calculate_deduction(
-                extracted_data, category
-            )
-            
-            # Log if manual review needed
-            if needs_manual_review:
-                self.logger.warning(f"NEEDS MANUAL REVIEW: Missing fields: {', '.join(missing_fields)}")
-            
-            # Move file
-            moved_path = self.move_processed_file(
-                file_path, category, extracted_data.get('invoice_date', '')
-            )
-            
-            # Add to cache
-            self.cache_manager.add_entry(
-                file_path.name, file_hash, extracted_data, category, deduction
-            )
-            
-            # Remove from failed files if it was there
-            if failed_entry:
-                self.failed_files_manager.remove_failure(str(file_path))
-                self.logger.info("Removed from failed files list (successful retry)")
-            
-            self.logger.success(f"Extracted: {extracted_data.get('vendor_name', 'Unknown')} - {category} - ${extracted_data.get('total', 0)}")
+            # Move to Non-Invoice folder
+            moved_path = self.move_non_invoice(file_path)
             
             return {
                 'FileName': file_path.name,
@@ -432,42 +528,149 @@ class InvoiceCataloger:
                 'FilePath': str(moved_path),
                 'OriginalPath': str(file_path),
                 'ProcessedDateTime': datetime.now(),
-                'VendorName': extracted_data.get('vendor_name', ''),
-                'VendorABN': extracted_data.get('vendor_abn', ''),
-                'InvoiceNumber': extracted_data.get('invoice_number', ''),
-                'InvoiceDate': extracted_data.get('invoice_date', ''),
-                'DueDate': extracted_data.get('due_date', ''),
-                'SubTotal': extracted_data.get('subtotal', 0.00),
-                'Tax': extracted_data.get('tax', 0.00),
-                'TotalAmount': extracted_data.get('total', 0.00),
-                'Currency': extracted_data.get('currency', 'AUD'),
-                'Category': category,
-                'WorkUsePercentage': deduction['WorkUsePercentage'],
-                'DeductibleAmount': deduction['DeductibleAmount'],
-                'ClaimMethod': deduction['ClaimMethod'],
-                'ClaimNotes': deduction['ClaimNotes'],
-                'AtoReference': deduction['AtoReference'],
-                'RequiresDocumentation': deduction['RequiresDocumentation'],
-                'ProcessingStatus': 'Success',
+                'VendorName': 'N/A',
+                'VendorABN': '',
+                'InvoiceNumber': '',
+                'InvoiceDate': '',
+                'DueDate': '',
+                'SubTotal': 0.00,
+                'Tax': 0.00,
+                'TotalAmount': 0.00,
+                'Currency': 'AUD',
+                'Category': 'Non-Invoice',
+                'WorkUsePercentage': 0,
+                'DeductibleAmount': 0.00,
+                'ClaimMethod': 'Not Applicable',
+                'ClaimNotes': non_invoice_reason,
+                'AtoReference': 'N/A',
+                'RequiresDocumentation': [],
+                'ProcessingStatus': 'Non-Invoice',
                 'FileHash': file_hash,
                 'MovedTo': str(moved_path),
-                'NeedsManualReview': needs_manual_review,
-                'MissingFields': missing_fields
+                'NeedsManualReview': False,
+                'MissingFields': []
             }
+        
+        return None
+    
+    def _find_cached_extraction(self, text: str, reprocess: bool
+                                ) -> tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Look up LLM data already extracted from the same text
+        
+        Catches re-saved or renamed copies whose file hash differs but whose
+        text does not. Returns (text_hash, extracted_data or None).
+        """
+        text_hash = CacheManager.calculate_text_hash(text)
+        if reprocess:
+            return text_hash, None
+        
+        cached_entry = self.cache_manager.find_by_text_hash(text_hash)
+        if cached_entry is None:
+            return text_hash, None
+        
+        self.logger.info(f"Same text as {cached_entry['FileName']} - reusing its extracted data")
+        return text_hash, cached_entry['ExtractedData']
+    
+    def _finish_file(self, file_path: Path, file_hash: str,
+                     failed_entry: Optional[Dict[str, Any]],
+                     extracted_data: Optional[Dict[str, Any]],
+                     text_hash: Optional[str] = None) -> Dict[str, Any]:
+        """Categorize, calculate deduction, move and cache a file after LLM extraction"""
+        if not extracted_data:
+            self.logger.warning("Failed to extract data with LLM")
             
-        except Exception as e:
-            self.logger.error(f"Error processing file: {e}")
-            
-            attempt_count = failed_entry['AttemptCount'] + 1 if failed_entry else 1
-            self.failed_files_manager.add_failure(
-                str(file_path), file_path.name,
-                f"Processing error: {str(e)}",
-                attempt_count
-            )
+            self._record_failure(file_path, failed_entry, "AI extraction failed")
             
             return self._create_failed_entry(file_path, file_hash,
-                                            f"Processing error: {str(e)}",
-                                            "Failed (Error)")
+                                            "AI extraction failed",
+                                            "Failed (AI extraction)")
+        
+        # Check for missing critical fields
+        needs_manual_review, missing_fields = self._check_missing_fields(extracted_data)
+        
+        # Categorize expense
+        category = self.categorizer.categorize(
+            extracted_data.get('vendor_name', ''),
+            extracted_data.get('description', ''),
+            extracted_data.get('line_items', [])
+        )
+        
+        # Calculate deduction
+        deduction = self.deduction_calculator.calculate_deduction(
+            extracted_data, category
+        )
+        
+        # Log if manual review needed
+        if needs_manual_review:
+            self.logger.warning(f"NEEDS MANUAL REVIEW: Missing fields: {', '.join(missing_fields)}")
+        
+        # Move file
+        moved_path = self.move_processed_file(
+            file_path, category, extracted_data.get('invoice_date', '')
+        )
+        
+        # Add to cache
+        self.cache_manager.add_entry(
+            file_path.name, file_hash, extracted_data, category, deduction, text_hash
+        )
+        
+        # Remove from failed files if it was there
+        if failed_entry:
+            self.failed_files_manager.remove_failure(str(file_path))
+            self.logger.info("Removed from failed files list (successful retry)")
+        
+        if self._verbose:
+            self.logger.success(f"Extracted: {extracted_data.get('vendor_name', 'Unknown')} - {category} - ${extracted_data.get('total', 0)}")
+        
+        return {
+            'FileName': file_path.name,
+            'FileType': file_path.suffix.lower(),
+            'FilePath': str(moved_path),
+            'OriginalPath': str(file_path),
+            'ProcessedDateTime': datetime.now(),
+            'VendorName': extracted_data.get('vendor_name', ''),
+            'VendorABN': extracted_data.get('vendor_abn', ''),
+            'InvoiceNumber': extracted_data.get('invoice_number', ''),
+            'InvoiceDate': extracted_data.get('invoice_date', ''),
+            'DueDate': extracted_data.get('due_date', ''),
+            'SubTotal': extracted_data.get('subtotal', 0.00),
+            'Tax': extracted_data.get('tax', 0.00),
+            'TotalAmount': extracted_data.get('total', 0.00),
+            'Currency': extracted_data.get('currency', 'AUD'),
+            'Category': category,
+            'WorkUsePercentage': deduction['WorkUsePercentage'],
+            'DeductibleAmount': deduction['DeductibleAmount'],
+            'ClaimMethod': deduction['ClaimMethod'],
+            'ClaimNotes': deduction['ClaimNotes'],
+            'AtoReference': deduction['AtoReference'],
+            'RequiresDocumentation': deduction['RequiresDocumentation'],
+            'ProcessingStatus': 'Success',
+            'FileHash': file_hash,
+            'MovedTo': str(moved_path),
+            'NeedsManualReview': needs_manual_review,
+            'MissingFields': missing_fields
+        }
+    
+    def _handle_processing_error(self, file_path: Path, file_hash: str,
+                                 failed_entry: Optional[Dict[str, Any]],
+                                 error: Exception) -> Dict[str, Any]:
+        """Record an unexpected processing error as a failure"""
+        self.logger.error(f"Error processing file: {error}")
+        
+        self._record_failure(file_path, failed_entry, f"Processing error: {str(error)}")
+        
+        return self._create_failed_entry(file_path, file_hash,
+                                        f"Processing error: {str(error)}",
+                                        "Failed (Error)")
+    
+    def _record_failure(self, file_path: Path, failed_entry: Optional[Dict[str, Any]],
+                        reason: str):
+        """Add or bump the failed-files entry for a file"""
+        attempt_count = failed_entry['AttemptCount'] + 1 if failed_entry else 1
+        self.failed_files_manager.add_failure(
+            str(file_path), file_path.name, reason, attempt_count
+        )
     
     def _create_failed_entry(self, file_path: Path, file_hash: str,
                             error_reason: str, status: str) -> Dict[str, Any]:
@@ -554,7 +757,7 @@ class InvoiceCataloger:
     def move_non_invoice(self, file_path: Path) -> Path:
         """Move non-invoice file to Non-Invoice folder"""
         try:
-            non_invoice_folder = self.config.output_folder / "Non-Invoice"
+            non_invoice_folder = self._output_folder / "Non-Invoice"
             non_invoice_folder.mkdir(parents=True, exist_ok=True)
             
             dest_path = non_invoice_folder / file_path.name
@@ -590,9 +793,7 @@ class InvoiceCataloger:
             return 0, 0
         
         # Get all files in Non-Invoice folder
-        files = []
-        for ext in self.config.file_extensions:
-            files.extend(non_invoice_folder.rglob(f"*{ext}"))
+        files = self._scan_folder(non_invoice_folder)
         
         if not files:
             self.logger.info("No files found in Non-Invoice folder")
@@ -672,9 +873,7 @@ class InvoiceCataloger:
         if reprocess:
             self.logger.info("REPROCESS MODE: Ignoring cache for all files")
         
-        for i, file_path in enumerate(files, 1):
-            result = self.process_file(file_path, i, len(files), reprocess=reprocess)
-            
+        for result in self.process_files(files, reprocess=reprocess):
             if result:
                 processed_invoices.append(result)
                 
@@ -813,11 +1012,10 @@ def main():
     args = parser.parse_args()
     
     # Create config
-    config = Config()
-    config.financial_year = args.financial_year
+    log_level = 'DEBUG' if args.verbose else 'INFO'
+    config = Config(financial_year=args.financial_year, log_level=log_level)
     
     # Setup logger
-    log_level = 'DEBUG' if args.verbose else 'INFO'
     setup_logger(config.log_folder, log_level)
     
     # Create cataloger
@@ -1,6 +1,6 @@
 """Processors package for Invoice Cataloger"""
-from .llm_processor import LLMProcessor
+from .llm_processor import LLMProcessor, LLMClientPool, create_llm_client
 from .categorizer import ExpenseCategorizer
 from .deduction_calculator import DeductionCalculator
 
-__all__ = ['LLMProcessor', 'ExpenseCategorizer', 'DeductionCalculator']
+__all__ = ['LLMProcessor', 'LLMClientPool', 'create_llm_client', 'ExpenseCategorizer', 'DeductionCalculator']
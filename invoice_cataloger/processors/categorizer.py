@@ -1,7 +1,15 @@
 """
 Expense Categorization for ATO Compliance
 """
-from typing import Dict, Any, List, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 
 class ExpenseCategorizer:
@@ -15,6 +23,18 @@ class ExpenseCategorizer:
             vendor_overrides: List of vendor override rules
         """
         self.vendor_overrides = vendor_overrides or []
+        
+        # Lowercased (pattern, category) pairs in rule order, empty patterns dropped
+        self._override_rules: List[Tuple[str, str]] = [
+            (override.get('vendor_pattern', '').lower(), override.get('category', ''))
+            for override in self.vendor_overrides
+            if override.get('vendor_pattern')
+        ]
+        self._override_db = self._compile_overrides(self._override_rules)
+        
+        # Lowercased vendor name -> override category (None for no match);
+        # per instance, so new overrides always start with an empty cache
+        self._override_cache: Dict[str, Optional[str]] = {}
     
     # Enhanced categories with comprehensive keywords
     CATEGORIES = {
@@ -151,15 +171,27 @@ class ExpenseCategorizer:
             if isinstance(item, dict) and 'description' in item:
                 search_text += f" {item['description']}"
         
-        search_text = search_text.lower()
+        return _match_keywords(search_text.lower())
+    
+    def categorize_batch(self, vendor_names: List[str]) -> List[str]:
+        """
+        Categorize several vendors by name alone
         
-        # Search for category matches
-        for category, keywords in self.CATEGORIES.items():
-            for keyword in keywords:
-                if keyword in search_text:
-                    return category
+        Same as categorize(vendor_name, '', []) for each name, but a name
+        that repeats in the list is only categorized once.
         
-        return "Other"
+        Args:
+            vendor_names: Vendor/supplier names
+        
+        Returns:
+            Category names, in the same order
+        """
+        categories: Dict[str, str] = {}
+        for vendor_name in vendor_names:
+            if vendor_name not in categories:
+                categories[vendor_name] = self.categorize(vendor_name, '', [])
+        
+        return [categories[vendor_name] for vendor_name in vendor_names]
     
     def _check_vendor_override(self, vendor_name: str) -> Optional[str]:
         """
@@ -175,19 +207,71 @@ class ExpenseCategorizer:
             return None
         
         vendor_lower = vendor_name.lower()
+        if vendor_lower in self._override_cache:
+            return self._override_cache[vendor_lower]
         
-        # Check each override rule
-        for override in self.vendor_overrides:
-            pattern = override.get('vendor_pattern', '').lower()
-            category = override.get('category', '')
-            
-            # Case-insensitive partial match
-            if pattern and pattern in vendor_lower:
-                return category
+        match = None
+        
+        if self._override_db is not None:
+            # One pass over the name for all rules; the earliest rule wins
+            matched_ids = []
+            self._override_db.scan(
+                vendor_lower.encode('utf-8'),
+                match_event_handler=lambda rule_id, *_: matched_ids.append(rule_id)
+            )
+            if matched_ids:
+                match = self._override_rules[min(matched_ids)][1]
+        else:
+            # Case-insensitive partial match, first rule in order
+            for pattern, category in self._override_rules:
+                if pattern in vendor_lower:
+                    match = category
+                    break
         
-        return None
+        self._override_cache[vendor_lower] = match
+        return match
+    
+    @staticmethod
+    def _compile_overrides(rules: List[Tuple[str, str]]):
+        """
+        Compile the override patterns into one Hyperscan database
+        
+        Patterns are matched as literals against the lowercased vendor name.
+        Returns None (plain substring checks are used instead) when Hyperscan
+        is not installed, there are no rules, or compilation fails.
+        """
+        if not HYPERSCAN_AVAILABLE or not rules:
+            return None
+        
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[re.escape(pattern).encode('utf-8') for pattern, _ in rules],
+                ids=list(range(len(rules))),
+                elements=len(rules),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(rules)
+            )
+            return db
+        except Exception:
+            return None
     
     @staticmethod
     def get_all_categories() -> list:
         """Get list of all available categories"""
         return list(ExpenseCategorizer.CATEGORIES.keys()) + ["Other"]
+
+
+@lru_cache(maxsize=2048)
+def _match_keywords(search_text: str) -> str:
+    """
+    First category with a keyword in search_text, or "Other"
+    
+    Recurring invoices from the same vendor produce the same text, so repeats
+    skip the scan over every category keyword.
+    """
+    for category, keywords in ExpenseCategorizer.CATEGORIES.items():
+        for keyword in keywords:
+            if keyword in search_text:
+                return category
+    
+    return "Other"
@@ -2,12 +2,53 @@
 LLM Processor for Invoice Data Extraction
 Supports: LM Studio, OpenAI, and OpenRouter
 """
+import asyncio
 import json
+import logging
+import threading
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import requests
 from requests.exceptions import RequestException, Timeout
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+
+HOSTED_SYSTEM_PROMPT = "You are a professional invoice data extraction assistant. Always respond with ONLY valid JSON, no markdown formatting, no explanations."
+
+# Child of the application's logger, so its handlers pick these up
+_logger = logging.getLogger("InvoiceCataloger.llm_processor")
+
+# Keep-alive connections to LM Studio, shared by every LLMProcessor
+_lmstudio_session = requests.Session()
+
+# Hosted-API clients by connection settings, so processors with the same
+# settings share one connection pool
+_hosted_clients: Dict[tuple, OpenAI] = {}
+
+
+async def _gather_extractions(extract, items: List[Tuple[str, str]],
+                              max_concurrent: int) -> List[Optional[Dict[str, Any]]]:
+    """Run extract(invoice_text, file_name) for every item, max_concurrent at a time"""
+    limit = asyncio.Semaphore(max(1, max_concurrent))
+    
+    async def run(file_name: str, invoice_text: str) -> Optional[Dict[str, Any]]:
+        async with limit:
+            return await extract(invoice_text, file_name)
+    
+    return await asyncio.gather(*(run(file_name, invoice_text) for file_name, invoice_text in items))
+
+
+def _shared_hosted_client(client_kwargs: Dict[str, Any]) -> OpenAI:
+    """Return the OpenAI client for these settings, creating it on first use"""
+    key = (
+        client_kwargs['api_key'],
+        client_kwargs['base_url'],
+        client_kwargs['timeout'],
+        tuple(sorted(client_kwargs.get('default_headers', {}).items()))
+    )
+    client = _hosted_clients.get(key)
+    if client is None:
+        client = _hosted_clients[key] = OpenAI(**client_kwargs)
+    return client
 
 
 class LLMProcessor:
@@ -42,29 +83,67 @@ class LLMProcessor:
         self.endpoint = endpoint
         self.model = model
         
+        # Settings shared by the sync and async hosted-API clients
+        self._client_kwargs: Optional[Dict[str, Any]] = None
+        self._hosted_model: Optional[str] = None
+        
         # OpenAI configuration
         self.openai_client = None
         if self.api_provider == "openai" and openai_api_key:
-            self.openai_client = OpenAI(
-                api_key=openai_api_key,
-                base_url=openai_api_base,
-                timeout=timeout
-            )
-            self.openai_model = openai_model
+            self._client_kwargs = {
+                'api_key': openai_api_key,
+                'base_url': openai_api_base,
+                'timeout': timeout
+            }
+            self.openai_client = _shared_hosted_client(self._client_kwargs)
+            self.openai_model = self._hosted_model = openai_model
         
         # OpenRouter configuration
         self.openrouter_client = None
         if self.api_provider == "openrouter" and openrouter_api_key:
-            self.openrouter_client = OpenAI(
-                api_key=openrouter_api_key,
-                base_url=openrouter_api_base,
-                timeout=timeout,
-                default_headers={
+            self._client_kwargs = {
+                'api_key': openrouter_api_key,
+                'base_url': openrouter_api_base,
+                'timeout': timeout,
+                'default_headers': {
                     "HTTP-Referer": "https://github.com/yourusername/invoice-cataloger",
                     "X-Title": openrouter_app_name or "Invoice-Cataloger"
                 }
-            )
-            self.openrouter_model = openrouter_model
+            }
+            self.openrouter_client = _shared_hosted_client(self._client_kwargs)
+            self.openrouter_model = self._hosted_model = openrouter_model
+        
+        # AsyncOpenAI client, bound to the event loop that created it
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_client_loop = None
+    
+    @classmethod
+    def from_config(cls, config, api_provider: Optional[str] = None) -> "LLMProcessor":
+        """Processor for config's settings, using api_provider instead of config.api_provider if given"""
+        return cls(
+            api_provider=api_provider or config.api_provider,
+            # LM Studio params
+            endpoint=config.lm_studio_endpoint,
+            model=config.lm_studio_model,
+            # OpenAI params
+            openai_api_key=config.openai_api_key,
+            openai_model=config.openai_model,
+            openai_api_base=config.openai_api_base,
+            # OpenRouter params
+            openrouter_api_key=config.openrouter_api_key,
+            openrouter_model=config.openrouter_model,
+            openrouter_api_base=config.openrouter_api_base,
+            openrouter_app_name=config.openrouter_app_name,
+            # Custom prompt
+            use_custom_prompt=config.use_custom_prompt,
+            custom_extraction_prompt=config.custom_extraction_prompt,
+            # Common params
+            temperature=config.temperature,
+            max_tokens=config.max_tokens,
+            timeout=config.timeout_seconds,
+            retry_attempts=config.retry_attempts,
+            retry_delay=config.retry_delay_seconds
+        )
     
     def extract_invoice_data(self, invoice_text: str, file_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -77,15 +156,10 @@ class LLMProcessor:
         Returns:
             Dictionary with extracted invoice data or None if extraction fails
         """
-        if not invoice_text or len(invoice_text.strip()) < 10:
+        prompt = self._prepare_prompt(invoice_text)
+        if prompt is None:
             return None
         
-        # Truncate very long texts
-        if len(invoice_text) > 10000:
-            invoice_text = invoice_text[:10000]
-        
-        prompt = self._build_extraction_prompt(invoice_text)
-        
         for attempt in range(1, self.retry_attempts + 1):
             try:
                 response = self._call_llm(prompt)
@@ -105,6 +179,172 @@ class LLMProcessor:
         
         return None
     
+    async def extract_invoice_data_async(self, invoice_text: str,
+                                         file_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of extract_invoice_data
+        
+        OpenAI/OpenRouter requests go through AsyncOpenAI so many files can
+        wait on the API at once; LM Studio requests run in a worker thread.
+        
+        Args:
+            invoice_text: Raw text extracted from invoice
+            file_name: Name of the file being processed
+        
+        Returns:
+            Dictionary with extracted invoice data or None if extraction fails
+        """
+        prompt = self._prepare_prompt(invoice_text)
+        if prompt is None:
+            return None
+        
+        for attempt in range(1, self.retry_attempts + 1):
+            try:
+                response = await self._call_llm_async(prompt)
+                
+                if response:
+                    # Parse and validate response
+                    extracted_data = self._parse_response(response)
+                    if extracted_data:
+                        return extracted_data
+                
+            except Exception as e:
+                if attempt < self.retry_attempts:
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+                else:
+                    return None
+        
+        return None
+    
+    def extract_invoice_data_batch(self, items: List[Tuple[str, str]],
+                                   max_concurrent: int = 8) -> List[Optional[Dict[str, Any]]]:
+        """
+        Extract many invoices now, with up to max_concurrent requests in flight
+        
+        The requests share one async client (one connection pool), so
+        connection setup is paid once for the whole list. For jobs that can
+        wait, submit_batch is cheaper.
+        
+        Args:
+            items: (file_name, invoice_text) pairs
+            max_concurrent: Requests in flight at once
+        
+        Returns:
+            Extracted data (or None) per item, in the same order
+        """
+        return asyncio.run(_gather_extractions(self.extract_invoice_data_async, items, max_concurrent))
+    
+    def submit_batch(self, texts: List[Tuple[str, str]]) -> Optional[str]:
+        """
+        Submit many extractions as one OpenAI Batch API job
+        
+        Batch jobs are billed at about half the per-request price and do not
+        count against the interactive rate limit, but may take up to 24h.
+        
+        Args:
+            texts: (custom_id, invoice_text) pairs; custom_id is echoed back
+        
+        Returns:
+            Batch ID, or None if the provider does not support batches or
+            there is nothing to submit
+        """
+        if self.api_provider != "openai" or self.openai_client is None:
+            return None
+        
+        lines = []
+        for custom_id, invoice_text in texts:
+            prompt = self._prepare_prompt(invoice_text)
+            if prompt is None:
+                continue
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.openai_model,
+                    "messages": self._hosted_messages(prompt),
+                    "temperature": self.temperature,
+                    "max_tokens": self.max_tokens
+                }
+            }))
+        
+        if not lines:
+            return None
+        
+        batch_file = self.openai_client.files.create(
+            file=("invoice_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.openai_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    def await_batch(self, batch_id: str, poll_interval: float = 10.0,
+                    max_poll_interval: float = 300.0,
+                    max_wait: float = 24 * 60 * 60) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Wait for a batch job and parse its results
+        
+        Polls with exponential backoff from poll_interval up to
+        max_poll_interval.
+        
+        Returns:
+            custom_id -> extracted invoice data (None where that request
+            failed or returned unusable JSON); empty if the job failed,
+            expired or timed out
+        """
+        deadline = time.monotonic() + max_wait
+        delay = poll_interval
+        
+        while True:
+            batch = self.openai_client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                if not batch.output_file_id:
+                    return {}
+                break  # expired/cancelled jobs can still carry partial output
+            if time.monotonic() + delay > deadline:
+                return {}
+            time.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+        
+        if not batch.output_file_id:
+            return {}
+        
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        output = self.openai_client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            extracted_data = None
+            response = record.get('response') or {}
+            if response.get('status_code') == 200:
+                choices = response.get('body', {}).get('choices') or []
+                if choices:
+                    content = choices[0].get('message', {}).get('content')
+                    if content:
+                        extracted_data = self._parse_response(content)
+            results[record.get('custom_id')] = extracted_data
+        
+        return results
+    
+    def _prepare_prompt(self, invoice_text: str) -> Optional[str]:
+        """Build the prompt for a text, or None if there is too little text"""
+        if not invoice_text or len(invoice_text.strip()) < 10:
+            return None
+        
+        # Truncate very long texts
+        if len(invoice_text) > 10000:
+            invoice_text = invoice_text[:10000]
+        
+        return self._build_extraction_prompt(invoice_text)
+    
     def _build_extraction_prompt(self, invoice_text: str) -> str:
         """Build the extraction prompt for the LLM"""
         
@@ -179,21 +419,58 @@ JSON OUTPUT:"""
         else:
             raise ValueError(f"Unsupported API provider: {self.api_provider}")
     
+    async def _call_llm_async(self, prompt: str) -> Optional[str]:
+        """Call the configured LLM API provider without blocking the event loop"""
+        if self.api_provider in ("openai", "openrouter"):
+            response = await self._get_async_client().chat.completions.create(
+                model=self._hosted_model,
+                messages=self._hosted_messages(prompt),
+                temperature=self.temperature,
+                max_tokens=self.max_tokens
+            )
+            
+            if response.choices and len(response.choices) > 0:
+                return response.choices[0].message.content
+            
+            return None
+        elif self.api_provider == "lmstudio":
+            return await asyncio.to_thread(self._call_lmstudio, prompt)
+        else:
+            raise ValueError(f"Unsupported API provider: {self.api_provider}")
+    
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Return an AsyncOpenAI client for the running event loop"""
+        if self._client_kwargs is None:
+            raise ValueError(f"{self.api_provider} API key not configured")
+        
+        # The client's connection pool belongs to one loop; batches started
+        # with asyncio.run() each get a fresh loop, so rebuild on change
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = AsyncOpenAI(**self._client_kwargs)
+            self._async_client_loop = loop
+        return self._async_client
+    
+    @staticmethod
+    def _hosted_messages(prompt: str) -> List[Dict[str, str]]:
+        """Chat messages for OpenAI-compatible hosted providers"""
+        return [
+            {
+                "role": "system",
+                "content": HOSTED_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
     def _call_openai(self, prompt: str) -> Optional[str]:
         """Call OpenAI API using official SDK"""
         try:
             response = self.openai_client.chat.completions.create(
                 model=self.openai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional invoice data extraction assistant. Always respond with ONLY valid JSON, no markdown formatting, no explanations."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=self._hosted_messages(prompt),
                 temperature=self.temperature,
                 max_tokens=self.max_tokens
             )
@@ -211,16 +488,7 @@ JSON OUTPUT:"""
         try:
             response = self.openrouter_client.chat.completions.create(
                 model=self.openrouter_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional invoice data extraction assistant. Always respond with ONLY valid JSON, no markdown formatting, no explanations."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=self._hosted_messages(prompt),
                 temperature=self.temperature,
                 max_tokens=self.max_tokens
             )
@@ -251,7 +519,7 @@ JSON OUTPUT:"""
         }
         
         try:
-            response = requests.post(
+            response = _lmstudio_session.post(
                 self.endpoint,
                 json=payload,
                 timeout=self.timeout,
@@ -395,3 +663,96 @@ JSON OUTPUT:"""
         
         else:
             return False, f"Unknown API provider: {api_provider}"
+
+
+class LLMClientPool:
+    """
+    Several LLMProcessors used as one, with failover
+    
+    Each extraction goes to the primary processor first; when it gives no
+    usable result (its retries are exhausted or the JSON is unusable) the
+    next processor is tried, in order. Every processor allows at most
+    max_concurrent requests at a time, so a fallback provider is not flooded
+    when the primary goes down mid-run. Requests are not spread round-robin:
+    providers run different models, and a file's result should not depend on
+    which one happened to be free.
+    """
+    
+    def __init__(self, processors: List[LLMProcessor], max_concurrent: int = 8):
+        self.processors = processors
+        self.max_concurrent = max(1, max_concurrent)
+        self._limits = [threading.BoundedSemaphore(self.max_concurrent) for _ in processors]
+        
+        # asyncio semaphores, bound to the event loop that created them
+        self._async_limits: List[asyncio.Semaphore] = []
+        self._async_limits_loop = None
+    
+    @property
+    def api_provider(self) -> str:
+        return self.processors[0].api_provider
+    
+    def extract_invoice_data(self, invoice_text: str, file_name: str) -> Optional[Dict[str, Any]]:
+        """extract_invoice_data on each processor in turn until one succeeds"""
+        for processor, limit in zip(self.processors, self._limits):
+            with limit:
+                extracted_data = processor.extract_invoice_data(invoice_text, file_name)
+            if extracted_data:
+                return extracted_data
+        
+        return None
+    
+    async def extract_invoice_data_async(self, invoice_text: str,
+                                         file_name: str) -> Optional[Dict[str, Any]]:
+        """Async variant of extract_invoice_data"""
+        for processor, limit in zip(self.processors, self._get_async_limits()):
+            async with limit:
+                extracted_data = await processor.extract_invoice_data_async(invoice_text, file_name)
+            if extracted_data:
+                return extracted_data
+        
+        return None
+    
+    def extract_invoice_data_batch(self, items: List[Tuple[str, str]],
+                                   max_concurrent: int = 8) -> List[Optional[Dict[str, Any]]]:
+        """Extract many invoices concurrently (see LLMProcessor.extract_invoice_data_batch)"""
+        return asyncio.run(_gather_extractions(self.extract_invoice_data_async, items, max_concurrent))
+    
+    def submit_batch(self, texts: List[Tuple[str, str]]) -> Optional[str]:
+        """Batch jobs go to the primary processor only (see LLMProcessor.submit_batch)"""
+        return self.processors[0].submit_batch(texts)
+    
+    def await_batch(self, batch_id: str, **kwargs) -> Dict[str, Optional[Dict[str, Any]]]:
+        return self.processors[0].await_batch(batch_id, **kwargs)
+    
+    def _get_async_limits(self) -> List[asyncio.Semaphore]:
+        """Per-processor semaphores for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._async_limits_loop is not loop:
+            self._async_limits = [asyncio.Semaphore(self.max_concurrent) for _ in self.processors]
+            self._async_limits_loop = loop
+        return self._async_limits
+
+
+def create_llm_client(config):
+    """
+    LLM client for config: a plain LLMProcessor, or an LLMClientPool when
+    config.fallback_providers lists providers to fail over to. Fallbacks
+    that fail validate_api_config are skipped with a warning.
+    """
+    processor = LLMProcessor.from_config(config)
+    
+    fallback_providers = []
+    for provider in config.fallback_providers:
+        valid, message = config.validate_api_config(provider)
+        if valid:
+            fallback_providers.append(provider)
+        else:
+            _logger.warning(f"Skipping fallback provider {provider}: {message}")
+    if not fallback_providers:
+        return processor
+    
+    processors = [processor] + [
+        LLMProcessor.from_config(config, api_provider=provider)
+        for provider in fallback_providers
+    ]
+    return LLMClientPool(processors, config.max_concurrent_requests)
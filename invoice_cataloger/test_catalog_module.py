@@ -24,8 +24,7 @@ class CatalogModuleTester:
     """Comprehensive tester for catalog module"""
     
     def __init__(self):
-        self.config = Config()
-        self.config.financial_year = "2024-2025"
+        self.config = Config(financial_year="2024-2025")
         setup_logger(self.config.log_folder, 'DEBUG')
         self.logger = get_logger()
         
@@ -540,6 +539,71 @@ class CatalogModuleTester:
         except Exception as e:
             self.log_test("No tax calculations", False, str(e))
     
+    def test_13_process_files_duplicates(self):
+        """Test 13: Identical files in one batch cost a single LLM call"""
+        self.logger.section("TEST 13: DUPLICATES IN ONE BATCH")
+        
+        import asyncio
+        import tempfile
+        from invoice_cataloger import InvoiceCataloger as CLICataloger
+        from core import FileProcessor
+        
+        message = (
+            "From: billing@example.com\nTo: me@example.com\n"
+            "Subject: Tax Invoice INV-1001\n\n"
+            "Tax Invoice INV-1001 from Example Hosting Pty Ltd. "
+            "Total amount due: $110.00 including GST of $10.00.\n"
+        )
+        extracted_data = {'vendor_name': 'Example Hosting', 'invoice_number': 'INV-1001',
+                          'invoice_date': '2024-08-01', 'total': 110.00, 'tax': 10.00,
+                          'description': 'Web hosting'}
+        
+        def check(name, make, process, status_of):
+            """Run two identical .eml files through one pipeline with a stub LLM"""
+            try:
+                with tempfile.TemporaryDirectory() as tmp:
+                    config = Config(base_path=Path(tmp), financial_year="2024-2025",
+                                    move_processed_files=False)
+                    config.ensure_directories()
+                    pipeline = make(config)
+                    
+                    files = []
+                    for file_name in ("invoice_a.eml", "invoice_b.eml"):
+                        path = Path(tmp) / file_name
+                        path.write_text(message)
+                        files.append(path)
+                    
+                    calls = []
+                    def stub_llm(text, file_name):
+                        calls.append(file_name)
+                        return dict(extracted_data)
+                    async def stub_llm_async(text, file_name):
+                        return stub_llm(text, file_name)
+                    pipeline.llm_processor.extract_invoice_data = stub_llm
+                    pipeline.llm_processor.extract_invoice_data_async = stub_llm_async
+                    
+                    statuses = [status_of(result) for result in process(pipeline, files)]
+                    
+                    self.log_test(f"{name}: second copy settled as duplicate",
+                                 statuses == ['Success', 'Cached (Duplicate)'],
+                                 f"Statuses: {statuses}")
+                    self.log_test(f"{name}: duplicates sent to the LLM once", len(calls) == 1,
+                                 f"LLM calls: {len(calls)}")
+                    
+                    pipeline.ocr_cache.close()
+            except Exception as e:
+                self.log_test(f"{name}: duplicates in one batch", False, str(e))
+        
+        check("InvoiceCataloger.process_files", CLICataloger,
+              lambda cataloger, files: cataloger.process_files(files),
+              lambda result: result['ProcessingStatus'])
+        check("FileProcessor.process_files", FileProcessor,
+              lambda processor, files: processor.process_files(files),
+              lambda result: result.ProcessingStatus)
+        check("FileProcessor.process_files_batch", FileProcessor,
+              lambda processor, files: processor.process_files_batch(files),
+              lambda result: result.ProcessingStatus)
+    
     def run_all_tests(self):
         """Run all tests"""
         self.logger.section("CATALOG MODULE COMPREHENSIVE TEST SUITE")
@@ -559,6 +623,7 @@ class CatalogModuleTester:
         self.test_10_loader_summary()
         self.test_11_solid_principles()
         self.test_12_no_tax_calculations()
+        self.test_13_process_files_duplicates()
         
         # Print summary
         self.logger.section("TEST SUMMARY")
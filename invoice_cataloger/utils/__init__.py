@@ -1,5 +1,6 @@
 """Utils package for Invoice Cataloger"""
 from .logger import setup_logger, get_logger, InvoiceLogger
-from .cache_manager import CacheManager, FailedFilesManager
+from .cache_manager import CacheManager, FailedFilesManager, OCRCache
 
-__all__ = ['setup_logger', 'get_logger', 'InvoiceLogger', 'CacheManager', 'FailedFilesManager']
+__all__ = ['setup_logger', 'get_logger', 'InvoiceLogger', 'CacheManager', 'FailedFilesManager',
+           'OCRCache']
@@ -4,8 +4,12 @@ Handles duplicate detection and processed file tracking
 """
 import json
 import hashlib
+import sqlite3
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from datetime import datetime
 
 
@@ -15,6 +19,8 @@ class CacheManager:
     def __init__(self, cache_path: Path):
         self.cache_path = Path(cache_path)
         self.cache: List[Dict[str, Any]] = []
+        self._by_hash: Dict[str, Dict[str, Any]] = {}
+        self._by_text_hash: Dict[str, Dict[str, Any]] = {}
         self.load()
     
     def load(self):
@@ -28,6 +34,16 @@ class CacheManager:
                 self.cache = []
         else:
             self.cache = []
+        self._index()
+    
+    def _index(self):
+        """Rebuild the hash indexes; the first entry for a hash wins, as in a list scan"""
+        self._by_hash = {}
+        self._by_text_hash = {}
+        for entry in self.cache:
+            self._by_hash.setdefault(entry.get('FileHash'), entry)
+            if entry.get('TextHash'):
+                self._by_text_hash.setdefault(entry['TextHash'], entry)
     
     def save(self):
         """Save cache to file"""
@@ -40,14 +56,15 @@ class CacheManager:
     
     def find_by_hash(self, file_hash: str) -> Optional[Dict[str, Any]]:
         """Find cached entry by file hash"""
-        for entry in self.cache:
-            if entry.get('FileHash') == file_hash:
-                return entry
-        return None
+        return self._by_hash.get(file_hash)
+    
+    def find_by_text_hash(self, text_hash: str) -> Optional[Dict[str, Any]]:
+        """Find cached entry whose extracted text had this hash"""
+        return self._by_text_hash.get(text_hash)
     
     def add_entry(self, file_name: str, file_hash: str, extracted_data: Dict[str, Any],
-                  category: str, deduction: Dict[str, Any]):
-        """Add new entry to cache"""
+                  category: str, deduction: Dict[str, Any], text_hash: Optional[str] = None):
+        """Add new entry to cache (text_hash lets identical text skip the LLM later)"""
         entry = {
             'FileName': file_name,
             'FileHash': file_hash,
@@ -56,7 +73,11 @@ class CacheManager:
             'Category': category,
             'Deduction': deduction
         }
+        if text_hash:
+            entry['TextHash'] = text_hash
+            self._by_text_hash.setdefault(text_hash, entry)
         self.cache.append(entry)
+        self._by_hash.setdefault(file_hash, entry)
     
     def get_stats(self) -> Dict[str, int]:
         """Get cache statistics"""
@@ -70,16 +91,48 @@ class CacheManager:
     
     @staticmethod
     def calculate_file_hash(file_path: Path) -> Optional[str]:
-        """Calculate MD5 hash of file"""
+        """Calculate MD5 hash of file (memoized until the file changes)"""
         try:
-            md5_hash = hashlib.md5()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    md5_hash.update(chunk)
-            return md5_hash.hexdigest()
+            stat = Path(file_path).stat()
+            return _hash_file(str(file_path), stat.st_mtime_ns, stat.st_size)
         except Exception as e:
             print(f"Error calculating hash: {e}")
             return None
+    
+    @staticmethod
+    def calculate_text_hash(text: str) -> str:
+        """
+        SHA-256 of extracted text, the key for reusing LLM results
+        
+        Runs of whitespace count as one space, so a re-exported copy whose
+        text only wraps or spaces differently still matches. Anything that
+        changes a word or a figure gives a new hash: near-identical monthly
+        invoices differ exactly in their dates and amounts.
+        """
+        return hashlib.sha256(" ".join(text.split()).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def calculate_bytes_hash(data: bytes) -> str:
+        """MD5 of file contents already read into memory (same value as calculate_file_hash)"""
+        return hashlib.md5(data).hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def _hash_file(file_path: str, mtime_ns: int, size: int) -> str:
+    """
+    MD5 of a file's contents
+    
+    mtime_ns and size are only part of the cache key, so a modified file is
+    hashed again. Errors propagate and are therefore never cached.
+    """
+    with open(file_path, 'rb') as f:
+        # file_digest (3.11+) reads into a reusable buffer and hashes in C
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'md5').hexdigest()
+        md5_hash = hashlib.md5()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            md5_hash.update(chunk)
+        return md5_hash.hexdigest()
 
 
 class FailedFilesManager:
@@ -88,6 +141,7 @@ class FailedFilesManager:
     def __init__(self, failed_files_path: Path):
         self.failed_files_path = Path(failed_files_path)
         self.failed_files: List[Dict[str, Any]] = []
+        self._by_path: Dict[str, Dict[str, Any]] = {}
         self.load()
     
     def load(self):
@@ -101,6 +155,7 @@ class FailedFilesManager:
                 self.failed_files = []
         else:
             self.failed_files = []
+        self._by_path = {entry.get('FilePath'): entry for entry in self.failed_files}
     
     def save(self):
         """Save failed files list to file"""
@@ -111,20 +166,23 @@ class FailedFilesManager:
         except Exception as e:
             print(f"Error saving failed files: {e}")
     
+    @property
+    def is_empty(self) -> bool:
+        """True when no failures are being tracked"""
+        return not self.failed_files
+    
     def find_by_path(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Find failed file entry by path"""
-        for entry in self.failed_files:
-            if entry.get('FilePath') == file_path:
-                return entry
-        return None
+        return self._by_path.get(file_path)
     
     def add_failure(self, file_path: str, file_name: str, error_reason: str, attempt_count: int = 1):
         """Add or update failed file entry"""
         existing = self.find_by_path(file_path)
+        attempted_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         if existing:
             existing['AttemptCount'] = attempt_count
-            existing['LastAttempt'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            existing['LastAttempt'] = attempted_at
             existing['ErrorReason'] = error_reason
         else:
             entry = {
@@ -132,13 +190,16 @@ class FailedFilesManager:
                 'FileName': file_name,
                 'ErrorReason': error_reason,
                 'AttemptCount': attempt_count,
-                'FirstAttempt': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'LastAttempt': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'FirstAttempt': attempted_at,
+                'LastAttempt': attempted_at
             }
             self.failed_files.append(entry)
+            self._by_path[file_path] = entry
     
     def remove_failure(self, file_path: str):
         """Remove file from failed list (successful retry)"""
+        if self._by_path.pop(file_path, None) is None:
+            return
         self.failed_files = [
             entry for entry in self.failed_files
             if entry.get('FilePath') != file_path
@@ -161,3 +222,89 @@ class FailedFilesManager:
                 if entry.get('AttemptCount', 0) >= 3
             ])
         }
+
+
+class OCRCache:
+    """
+    OCR text kept between runs, keyed by file hash
+    
+    OCR takes seconds per scan while the file hash is already computed for
+    the duplicate check, so re-running over the same inbox (failed-file
+    retries especially) reuses the text instead of OCRing again. Stored in
+    SQLite so a lookup does not load every cached text; the database is only
+    created once there is something to store.
+    """
+    
+    # Methods reported by the OCR stages; only their text is worth keeping,
+    # since native text is cheap to extract again
+    OCR_METHODS = frozenset({"EasyOCR", "Tesseract OCR"})
+    
+    def __init__(self, cache_path: Path):
+        self.cache_path = Path(cache_path)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        """Open the database on first use; None if it does not exist and create is False"""
+        if self._connection is None:
+            if not create and not self.cache_path.exists():
+                return None
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Extraction runs on worker threads, so access is serialised by _lock instead
+            connection = sqlite3.connect(self.cache_path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_text ("
+                "file_hash TEXT PRIMARY KEY, text TEXT NOT NULL, "
+                "method TEXT NOT NULL, cached_at REAL NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+    
+    def get(self, file_hash: str) -> Optional[Tuple[str, str]]:
+        """(text, method) OCRed earlier from a file with this hash, or None"""
+        try:
+            with self._lock:
+                connection = self._connect(create=False)
+                if connection is None:
+                    return None
+                row = connection.execute(
+                    "SELECT text, method FROM ocr_text WHERE file_hash = ?", (file_hash,)
+                ).fetchone()
+            return (row[0], row[1]) if row else None
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read OCR cache: {e}")
+            return None
+    
+    def put(self, file_hash: str, text: str, method: str):
+        """Store the OCR text for a file hash"""
+        try:
+            with self._lock:
+                connection = self._connect(create=True)
+                connection.execute(
+                    "INSERT OR REPLACE INTO ocr_text VALUES (?, ?, ?, ?)",
+                    (file_hash, text, method, time.time())
+                )
+                connection.commit()
+        except sqlite3.Error as e:
+            print(f"Error saving OCR cache: {e}")
+    
+    def lookup(self, file_hash: str) -> Optional[Tuple[str, str]]:
+        """get, with the method marked "(cached)" for reporting"""
+        cached = self.get(file_hash)
+        if cached is None:
+            return None
+        text, method = cached
+        return text, f"{method} (cached)"
+    
+    def put_if_ocr(self, file_hash: str, text: Optional[str], method: str):
+        """put, but only non-empty text from one of OCR_METHODS"""
+        if text and method in self.OCR_METHODS:
+            self.put(file_hash, text, method)
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None